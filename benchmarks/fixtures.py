@@ -0,0 +1,122 @@
+import json
+import math
+import os
+from datetime import datetime, timedelta
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from pricer.constants import COIN_GECKO_IDS
+from pricer.implied_volatility import black76
+from pricer.utils import year_fraction
+
+FIXTURES_DIRECTORY = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+class StubResponse:
+    """The parts of requests.Response used by the pricer."""
+
+    def __init__(self, payload, status_code=200):
+        self.status_code = status_code
+        self._payload = payload
+        self.text = json.dumps(payload)
+
+    def json(self):
+        return self._payload
+
+
+class FixtureTransport:
+    """Offline stand-in for HttpTransport answering Deribit and CoinGecko requests from fixtures.
+
+    fixtures maps each underlying to {"book_summary": [...], "order_books": {name: book},
+    "index_price": float}, the format written by record_fixtures.py. The book summary only lists
+    instruments whose order book was recorded, so interpolation never picks an unrecorded neighbour.
+    """
+
+    def __init__(self, fixtures):
+        self.fixtures = fixtures
+        self.order_books = {name: book for fixture in fixtures.values() for name, book in fixture["order_books"].items()}
+        self.book_summaries = {underlying: recorded_summary(fixture) for underlying, fixture in fixtures.items()}
+        self.coin_ids = {coin_id: underlying for underlying, coin_id in COIN_GECKO_IDS.items()}
+        self.requests = 0
+
+    def get(self, url, params=None):
+        self.requests += 1
+        parsed = urlparse(url)
+        query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        query.update(params or {})
+        endpoint = parsed.path.rsplit("/", 1)[-1]
+
+        if endpoint == "get_book_summary_by_currency" and query.get("currency") in self.fixtures:
+            return StubResponse({"result": self.book_summaries[query["currency"]]})
+        if endpoint == "get_order_book" and query.get("instrument_name") in self.order_books:
+            return StubResponse({"result": self.order_books[query["instrument_name"]]})
+        if endpoint == "get_index":
+            underlying = query.get("currency", "").split("_")[0]
+            if underlying in self.fixtures:
+                return StubResponse({"result": {"last_price": self.fixtures[underlying]["index_price"]}})
+        if endpoint == "price":
+            underlying = self.coin_ids.get(query.get("ids"))
+            if underlying in self.fixtures:
+                currency = query.get("vs_currencies", "usd")
+                return StubResponse({query["ids"]: {currency: self.fixtures[underlying]["index_price"]}})
+        return StubResponse({"error": {"message": "not recorded"}}, status_code=404)
+
+    def close(self):
+        pass
+
+
+def recorded_summary(fixture):
+    # Book summary entries of the instruments whose order book is in the fixture
+    return [entry for entry in fixture["book_summary"] if entry["instrument_name"] in fixture["order_books"]]
+
+
+def load_fixtures(directory=FIXTURES_DIRECTORY):
+    # {underlying: fixture} from the <UNDERLYING>.json files written by record_fixtures.py
+    fixtures = {}
+    if not os.path.isdir(directory):
+        return fixtures
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(".json"):
+            with open(os.path.join(directory, filename)) as file:
+                fixtures[filename[:-len(".json")]] = json.load(file)
+    return fixtures
+
+
+def synthetic_fixtures(spots=None, expiry_days=(7, 14, 30, 60, 90, 180), levels=10, seed=0):
+    """
+    Deribit-shaped fixtures for live expiries, used when no recorded fixtures are available.
+
+    Quotes come from Black-76 on a skewed smile around the spot, each order book has `levels`
+    price levels per side.
+    """
+    spots = spots or {"BTC": 30000.0, "ETH": 2000.0}
+    rng = np.random.default_rng(seed)
+    today = datetime.utcnow()
+    fixtures = {}
+    for underlying, spot in spots.items():
+        step = 10 ** math.floor(math.log10(spot)) / 10
+        summary, order_books = [], {}
+        for days in expiry_days:
+            expiry = (today + timedelta(days=days)).strftime("%d%b%y").upper().lstrip("0")
+            t = year_fraction(expiry)
+            forward = spot * math.exp(0.05 * t)
+            for strike in np.arange(round(spot * 0.5 / step), round(spot * 1.5 / step) + 1, 5) * step:
+                volatility = 0.6 - 0.15 * math.log(strike / forward)
+                for option_kind in "CP":
+                    name = f"{underlying}-{expiry}-{int(strike)}-{option_kind}"
+                    mark = float(black76(forward, strike, t, volatility, option_kind == "C")) / forward
+                    tick = max(round(mark * 0.01, 4), 0.0001)
+                    bids = [[round(max(mark - tick * (level + 1), 0.0001), 4), float(rng.integers(1, 50))] for level in range(levels)]
+                    asks = [[round(mark + tick * (level + 1), 4), float(rng.integers(1, 50))] for level in range(levels)]
+                    order_books[name] = {
+                        "instrument_name": name, "bids": bids, "asks": asks,
+                        "underlying_price": forward, "mark_price": mark,
+                    }
+                    summary.append({
+                        "instrument_name": name, "bid_price": bids[0][0], "ask_price": asks[0][0],
+                        "mid_price": 0.5 * (bids[0][0] + asks[0][0]), "mark_price": mark,
+                        "mark_iv": volatility * 100, "underlying_price": forward,
+                    })
+        fixtures[underlying] = {"book_summary": summary, "order_books": order_books, "index_price": spot}
+    return fixtures
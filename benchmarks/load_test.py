@@ -0,0 +1,124 @@
+"""Drive compute_price at a target rate against the local stub server and report the load it generates.
+
+    python -m benchmarks.load_test --qps 20 --duration 30 --size 10 --latency 0.02 --error-rate 0.01
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from pricer.transport import HttpTransport
+
+from .fixtures import load_fixtures, synthetic_fixtures
+from .run_benchmarks import interpolated_portfolio, latency_summary, listed_portfolio, reset_caches
+from .stub_server import StubServer
+
+
+def run_load(pricer, portfolios, qps, duration, concurrency=16, **options):
+    """
+    Call pricer.compute_price on `portfolios` in turn, `qps` times per second for `duration` seconds.
+
+    Calls are scheduled open loop: a slow call does not delay the next ones, and latencies are
+    measured from the scheduled start so that queueing behind a saturated pool is counted.
+    """
+    n_calls = max(int(qps * duration), 1)
+    latencies = [None] * n_calls
+    failures = []
+    lock = threading.Lock()
+
+    def call(index, scheduled):
+        try:
+            pricer.compute_price(portfolios[index % len(portfolios)], verbose=False, **options)
+            latencies[index] = time.perf_counter() - scheduled
+        except Exception as error:
+            with lock:
+                failures.append(repr(error))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for index in range(n_calls):
+            scheduled = start + index / qps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(call, index, scheduled)
+    elapsed = time.perf_counter() - start
+
+    completed = [latency for latency in latencies if latency is not None]
+    options_priced = sum(len(portfolios[index % len(portfolios)]) for index in range(n_calls) if latencies[index] is not None)
+    return {
+        "target_qps": qps,
+        "calls": n_calls,
+        "failed_calls": len(failures),
+        "errors": sorted(set(failures))[:10],
+        "achieved_qps": len(completed) / elapsed,
+        "options_per_s": options_priced / elapsed,
+        "latency_ms": latency_summary(completed) if completed else None,
+        "options_priced": options_priced,
+    }
+
+
+def load_test(fixtures=None, qps=10.0, duration=10.0, size=10, mix="listed", concurrency=16, latency=0.0,
+              latency_jitter=0.0, error_rate=0.0, requests_per_second=None, seed=0, **options):
+    """Run one load test against a fresh stub server and return the JSON-serializable report."""
+    fixtures = fixtures or load_fixtures() or synthetic_fixtures(seed=seed)
+    rng = np.random.default_rng(seed)
+    with StubServer(fixtures, latency=latency, latency_jitter=latency_jitter, error_rate=error_rate,
+                    requests_per_second=requests_per_second, seed=seed) as server:
+        build = listed_portfolio if mix == "listed" else interpolated_portfolio
+        portfolios = [build(server.routes, size, rng) for _ in range(16)]
+
+        reset_caches()
+        transport = HttpTransport(pool_size=concurrency)
+        pricer = server.pricer_class()(transport=transport)
+        report = run_load(pricer, portfolios, qps, duration, concurrency, **options)
+        transport.close()
+        reset_caches()
+
+        statistics = server.statistics()
+    requests = sum(statistics["requests"].values())
+    report.update({
+        "mix": mix,
+        "portfolio_size": size,
+        "server_requests": requests,
+        "throttled": sum(statistics["throttled"].values()),
+        "server_errors": sum(statistics["errors"].values()),
+        # Upstream requests, retries included, per option priced
+        "request_amplification": requests / report["options_priced"] if report["options_priced"] else None,
+        "requests_by_endpoint": dict(sorted(statistics["requests"].items())),
+    })
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--qps", type=float, default=10.0, help="compute_price calls per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds")
+    parser.add_argument("--size", type=int, default=10, help="Options per compute_price call")
+    parser.add_argument("--mix", choices=("listed", "interpolated"), default="listed")
+    parser.add_argument("--concurrency", type=int, default=16, help="Calls in flight at most")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--requests-per-second", type=float, default=None, help="Server-side throttling")
+    parser.add_argument("--book-max-age", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="JSON file, stdout when omitted")
+    args = parser.parse_args(argv)
+
+    report = load_test(qps=args.qps, duration=args.duration, size=args.size, mix=args.mix, concurrency=args.concurrency,
+                       latency=args.latency, latency_jitter=args.latency_jitter, error_rate=args.error_rate,
+                       requests_per_second=args.requests_per_second, seed=args.seed, book_max_age=args.book_max_age)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
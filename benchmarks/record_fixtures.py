@@ -0,0 +1,61 @@
+"""Record live Deribit responses as benchmark fixtures.
+
+    python -m benchmarks.record_fixtures --underlyings BTC ETH --max-books 500
+"""
+import argparse
+import json
+import os
+
+from pricer.transport import HttpTransport
+from pricer.utils import HostRateLimiter, fetch_spot_quote
+
+from .fixtures import FIXTURES_DIRECTORY, recorded_summary
+
+BASE_URL = "https://www.deribit.com/api/v2/"
+
+
+def record(underlying, transport, rate_limiter, max_books=None):
+    def get(url):
+        rate_limiter.acquire(url)
+        response = transport.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f"Failed to record {url}: {response.text}")
+        return response.json()["result"]
+
+    summary = get(f"{BASE_URL}public/get_book_summary_by_currency?currency={underlying}&kind=option")
+    # Most liquid instruments first, so a capped recording keeps the books that matter
+    names = [entry["instrument_name"] for entry in sorted(summary, key=lambda entry: -(entry.get("open_interest") or 0))]
+    order_books = {}
+    for name in names[:max_books]:
+        order_books[name] = get(f"{BASE_URL}public/get_order_book?depth=1000&instrument_name={name}")
+
+    index_price, _ = fetch_spot_quote(underlying, base_url=BASE_URL, transport=transport)
+    fixture = {"book_summary": summary, "order_books": order_books, "index_price": index_price}
+    # A capped recording only lists the recorded books, which keeps interpolation neighbours replayable
+    fixture["book_summary"] = recorded_summary(fixture)
+    return fixture
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--underlyings", nargs="+", default=["BTC", "ETH"])
+    parser.add_argument("--max-books", type=int, default=None, help="Order books recorded per underlying")
+    parser.add_argument("--requests-per-second", type=float, default=10.0)
+    parser.add_argument("--directory", default=FIXTURES_DIRECTORY)
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.directory, exist_ok=True)
+    transport = HttpTransport()
+    rate_limiter = HostRateLimiter(args.requests_per_second)
+    try:
+        for underlying in args.underlyings:
+            fixture = record(underlying, transport, rate_limiter, args.max_books)
+            with open(os.path.join(args.directory, f"{underlying}.json"), "w") as file:
+                json.dump(fixture, file)
+            print(f"Recorded {len(fixture['order_books'])} order books for {underlying}")
+    finally:
+        transport.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Offline pricing benchmarks, written as JSON for tracking regressions between releases.
+
+    python -m benchmarks.run_benchmarks --output results.json
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+from pricer.market_pricing import MarketPricer
+from pricer.option_interpolation import OptionInterpolator
+from pricer.order_book import ArrayOrderBook
+from pricer.utils import parse_contract
+
+from .fixtures import FixtureTransport, load_fixtures, synthetic_fixtures
+
+DEFAULT_SIZES = (1, 10, 100, 1000, 10000)
+
+
+def reset_caches():
+    MarketPricer.instruments_cache.clear()
+    MarketPricer.book_cache.clear()
+    MarketPricer.spot_cache.clear()
+    OptionInterpolator.smile_cache.clear()
+
+
+def latency_summary(latencies):
+    latencies = np.asarray(latencies) * 1000.0
+    return {
+        "mean": float(latencies.mean()),
+        "p50": float(np.percentile(latencies, 50)),
+        "p90": float(np.percentile(latencies, 90)),
+        "p99": float(np.percentile(latencies, 99)),
+        "max": float(latencies.max()),
+    }
+
+
+def listed_portfolio(transport, size, rng):
+    names = sorted(transport.order_books)
+    return [(names[i], float(quantity)) for i, quantity in zip(rng.integers(0, len(names), size), rng.uniform(0.1, 50.0, size))]
+
+
+def interpolated_portfolio(transport, size, rng, listed_share=0.2):
+    # Mostly custom strikes between listed ones, with some listed options mixed in
+    portfolio = []
+    for name, quantity in listed_portfolio(transport, size, rng):
+        if rng.random() >= listed_share:
+            underlying, expiry, strike, is_call = parse_contract(name)
+            strike = strike * (1 + rng.uniform(0.005, 0.02))
+            name = f"{underlying}-{expiry}-{int(strike)}-{'C' if is_call else 'P'}"
+        portfolio.append((name, quantity))
+    return portfolio
+
+
+def bench_compute_price(transport, portfolio, repeats, **options):
+    reset_caches()
+    pricer = MarketPricer(transport=transport)
+    # Warm-up fills the instruments cache, which lives for a day in production
+    pricer.compute_price(portfolio, verbose=False, **options)
+
+    latencies = []
+    requests = transport.requests
+    for _ in range(repeats):
+        start = time.perf_counter()
+        pricer.compute_price(portfolio, verbose=False, **options)
+        latencies.append(time.perf_counter() - start)
+    return {
+        "size": len(portfolio),
+        "repeats": repeats,
+        "latency_ms": latency_summary(latencies),
+        "throughput_options_per_s": len(portfolio) * repeats / sum(latencies),
+        "requests_per_call": (transport.requests - requests) / repeats,
+    }
+
+
+def bench_depth_walks(depths=(10, 100, 1000), n_quantities=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    pricer = MarketPricer()
+    results = []
+    for depth in depths:
+        levels = np.column_stack((np.sort(rng.uniform(0.01, 0.1, depth))[::-1], rng.uniform(0.1, 10.0, depth))).tolist()
+        quantities = rng.uniform(0.1, 5.0 * depth, n_quantities)
+
+        start = time.perf_counter()
+        for quantity in quantities:
+            pricer._weighted_price(levels, quantity)
+        scalar = time.perf_counter() - start
+
+        start = time.perf_counter()
+        ArrayOrderBook(levels, levels).weighted_prices(quantities)
+        batched = time.perf_counter() - start
+
+        results.append({
+            "depth": depth,
+            "quantities": n_quantities,
+            "weighted_price_us_per_walk": scalar / n_quantities * 1e6,
+            "array_order_book_us_per_walk": batched / n_quantities * 1e6,
+        })
+    return results
+
+
+def metadata(fixture_source):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "fixtures": fixture_source,
+    }
+
+
+def run(sizes=DEFAULT_SIZES, repeats=5, fixtures=None, seed=0):
+    """Run every benchmark and return the JSON-serializable report."""
+    fixture_source = "recorded"
+    if fixtures is None:
+        fixtures = load_fixtures()
+    if not fixtures:
+        fixtures, fixture_source = synthetic_fixtures(seed=seed), "synthetic"
+    transport = FixtureTransport(fixtures)
+    rng = np.random.default_rng(seed)
+
+    results = []
+    for size in sizes:
+        portfolio = listed_portfolio(transport, size, rng)
+        for concurrent in (False, True):
+            result = bench_compute_price(transport, portfolio, repeats, concurrent=concurrent)
+            results.append({"benchmark": "compute_price", "mix": "listed", "concurrent": concurrent, **result})
+
+        portfolio = interpolated_portfolio(transport, size, rng)
+        for method in ("linear", "cubic_spline"):
+            result = bench_compute_price(transport, portfolio, repeats, interpolation_method=method)
+            results.append({"benchmark": "compute_price", "mix": "interpolated", "interpolation_method": method, **result})
+
+    for result in bench_depth_walks(seed=seed):
+        results.append({"benchmark": "depth_walk", **result})
+    reset_caches()
+    return {"metadata": metadata(fixture_source), "results": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="Comma-separated portfolio sizes")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="JSON file, stdout when omitted")
+    args = parser.parse_args(argv)
+
+    report = run([int(size) for size in args.sizes.split(",")], args.repeats, seed=args.seed)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
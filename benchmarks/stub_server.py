@@ -0,0 +1,165 @@
+"""Local stand-in for the Deribit and CoinGecko REST APIs, serving recorded or synthetic chains.
+
+    python -m benchmarks.stub_server --port 8080 --latency 0.02 --error-rate 0.01 --requests-per-second 20
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from pricer.market_pricing import MarketPricer
+
+from .fixtures import FixtureTransport, load_fixtures, synthetic_fixtures
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        status, body, headers = self.server.stub.respond(self.path)
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer:
+    """HTTP server answering get_book_summary_by_currency, get_order_book, get_index and simple/price.
+
+    Every response is delayed by `latency` seconds plus up to `latency_jitter`, fails with a 5xx
+    with probability `error_rate`, and requests beyond `requests_per_second` (token bucket of
+    `burst` requests) are throttled with a 429 and a Retry-After header.
+    """
+
+    def __init__(self, fixtures, host="127.0.0.1", port=0, latency=0.0, latency_jitter=0.0, error_rate=0.0,
+                 requests_per_second=None, burst=None, seed=None):
+        self.routes = FixtureTransport(fixtures)
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.requests_per_second = requests_per_second
+        self.burst = burst if burst is not None else max(requests_per_second or 1, 1)
+        self.counts = {}
+        self._random = random.Random(seed)
+        self._tokens = self.burst
+        self._refilled = time.monotonic()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    @property
+    def deribit_url(self):
+        return f"{self.url}api/v2/"
+
+    @property
+    def coingecko_url(self):
+        return f"{self.url}api/v3/"
+
+    def pricer_class(self, base=MarketPricer):
+        # MarketPricer subclass whose requests, catalogue refreshes included, go to this server
+        return type(f"Stub{base.__name__}", (base,), {"base_url": self.deribit_url, "coingecko_url": self.coingecko_url})
+
+    def _count(self, key):
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def statistics(self):
+        # {"requests"|"throttled"|"errors": {endpoint: count}} served so far
+        statistics = {"requests": {}, "throttled": {}, "errors": {}}
+        with self._lock:
+            for (kind, endpoint), count in self.counts.items():
+                statistics[kind][endpoint] = count
+        return statistics
+
+    def _throttled(self):
+        # Token bucket refilled at requests_per_second; returns the seconds until the next token when empty
+        if self.requests_per_second is None:
+            return None
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.requests_per_second)
+        self._refilled = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return None
+        return (1 - self._tokens) / self.requests_per_second
+
+    def respond(self, path):
+        # (status, JSON body, extra headers) for one request
+        endpoint = path.split("?", 1)[0].rstrip("/").rsplit("/", 1)[-1]
+        with self._lock:
+            self._count(("requests", endpoint))
+            retry_after = self._throttled()
+            failed = retry_after is None and self._random.random() < self.error_rate
+            delay = self.latency + self._random.uniform(0.0, self.latency_jitter)
+            if retry_after is not None:
+                self._count(("throttled", endpoint))
+            elif failed:
+                self._count(("errors", endpoint))
+
+        if retry_after is not None:
+            return 429, {"error": {"message": "too_many_requests", "code": 10028}}, {"Retry-After": f"{retry_after:.3f}"}
+        if delay > 0:
+            time.sleep(delay)
+        if failed:
+            return 503, {"error": {"message": "temporarily_unavailable", "code": 10040}}, {}
+        response = self.routes.get(path)
+        return response.status_code, response.json(), {}
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="stub-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+        return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 503")
+    parser.add_argument("--requests-per-second", type=float, default=None, help="Throttle with 429 beyond this rate")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    fixtures = load_fixtures() or synthetic_fixtures(seed=args.seed)
+    server = StubServer(fixtures, args.host, args.port, args.latency, args.latency_jitter, args.error_rate,
+                        args.requests_per_second, seed=args.seed)
+    print(f"Serving Deribit at {server.deribit_url} and CoinGecko at {server.coingecko_url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
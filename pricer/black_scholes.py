@@ -1,8 +1,128 @@
+import numpy as np
+from scipy.special import ndtr
+
+from .contracts import ContractBatch
 from .option_pricer import OptionPricer
 
+
+def _norm_pdf(x):
+    return np.exp(-0.5 * x * x) / np.sqrt(2 * np.pi)
+
+
+def black_scholes(spot, strike, time_to_expiry, volatility, interest_rate=0.0, is_call=True, greeks=True):
+    """
+    Vectorized Black-Scholes prices and Greeks; all inputs broadcast against each other.
+
+    Parameters
+    ----------
+    spot, strike : array_like
+        Underlying and strike prices, in the same currency as the returned price.
+    time_to_expiry : array_like
+        Time to expiry in years. Expired options (<= 0) are worth their intrinsic value.
+    volatility : array_like
+        Annualized volatility as a decimal, eg. 0.55
+    interest_rate : array_like, optional, default: 0.0
+        Continuously compounded risk-free rate.
+    is_call : array_like of bool, optional, default: True
+    greeks : bool, optional, default: True
+        Also return delta, gamma, vega (per 1.00 of vol), theta (per year) and rho (per 1.00 of rate).
+
+    Returns
+    -------
+    result : dict of ndarray
+        'price' and, when requested, the Greeks.
+    """
+    spot, strike, t, volatility, interest_rate, is_call = np.broadcast_arrays(
+        np.asarray(spot, dtype=float), np.asarray(strike, dtype=float), np.asarray(time_to_expiry, dtype=float),
+        np.asarray(volatility, dtype=float), np.asarray(interest_rate, dtype=float), np.asarray(is_call, dtype=bool))
+
+    expired = t <= 0
+    t = np.where(expired, 1.0, t)
+    sqrt_t = np.sqrt(t)
+    vol_sqrt_t = volatility * sqrt_t
+    discount = np.exp(-interest_rate * t)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1 = (np.log(spot / strike) + (interest_rate + 0.5 * volatility ** 2) * t) / vol_sqrt_t
+    d2 = d1 - vol_sqrt_t
+    sign = np.where(is_call, 1.0, -1.0)
+    n_d1 = ndtr(sign * d1)
+    n_d2 = ndtr(sign * d2)
+
+    intrinsic = np.maximum(sign * (spot - strike), 0.0)
+    price = np.where(expired, intrinsic, sign * (spot * n_d1 - strike * discount * n_d2))
+    result = {"price": price}
+    if not greeks:
+        return result
+
+    pdf_d1 = _norm_pdf(d1)
+    live = ~expired
+    result["delta"] = np.where(live, sign * n_d1, sign * (intrinsic > 0))
+    result["gamma"] = np.where(live, pdf_d1 / (spot * vol_sqrt_t), 0.0)
+    result["vega"] = np.where(live, spot * pdf_d1 * sqrt_t, 0.0)
+    result["theta"] = np.where(live, -spot * pdf_d1 * volatility / (2 * sqrt_t) - sign * interest_rate * strike * discount * n_d2, 0.0)
+    result["rho"] = np.where(live, sign * strike * t * discount * n_d2, 0.0)
+    return result
+
+
 class BlackScholesPricer(OptionPricer):
     def __init__(self):
         super().__init__()
 
-    def compute_price(self, ...):
-        # Implement Black-Scholes pricing formula
+    def _parse_option_data(self, option_data, valuation_time=None):
+        batch = ContractBatch.parse(option_data)
+        return batch.underlying_names, batch.strike, batch.time_to_expiry(valuation_time), batch.is_call, batch.quantity
+
+    def _broadcast_by_underlying(self, value, underlyings, name):
+        # value may be a scalar, an array aligned with option_data or a dict {underlying: value}
+        if isinstance(value, dict):
+            missing = set(underlyings) - set(value)
+            if missing:
+                raise ValueError(f"Missing {name} for underlyings: {', '.join(sorted(missing))}")
+            value = np.array([value[underlying] for underlying in underlyings], dtype=float)
+        value = np.broadcast_to(np.asarray(value, dtype=float), underlyings.shape)
+        if np.any(value <= 0):
+            raise ValueError(f"Invalid value for {name}. Must be positive.")
+        return value
+
+    def compute_price(self, option_data, spot, volatility, interest_rate=None, greeks=True, valuation_time=None):
+        """
+        Compute Black-Scholes prices and Greeks for a whole list of options in one vectorized call.
+
+        Parameters
+        ----------
+        option_data : list of tpl [(input_opt , quantity)] or ContractBatch
+            Same format as MarketPricer.compute_price, eg. [("BTC-20SEP23-30000-C", 10)]
+
+        spot : float, array_like or dict
+            Underlying price, either one value, one value per option or a dict {underlying: price}.
+
+        volatility : float, array_like or dict
+            Annualized volatility as a decimal, in the same forms as spot.
+
+        interest_rate : float or array_like, optional, default: None (0)
+            Continuously compounded risk-free rate.
+
+        greeks : bool, optional, default: True
+            Also compute delta, gamma, vega, theta and rho.
+
+        valuation_time : datetime, optional, default: None (now)
+            Naive UTC valuation time used for the time to expiry.
+
+        Returns
+        -------
+        result : dict of ndarray
+            Per-unit 'price' (in the currency of spot) and Greeks aligned with option_data, plus
+            'quantity' and 'time_to_expiry' (years) for aggregation.
+        """
+        underlyings, strikes, time_to_expiry, is_call, quantities = self._parse_option_data(option_data, valuation_time)
+        spot = self._broadcast_by_underlying(spot, underlyings, "spot")
+        volatility = self._broadcast_by_underlying(volatility, underlyings, "volatility")
+        interest_rate = 0.0 if interest_rate is None else interest_rate
+        if np.any(np.asarray(interest_rate) < 0):
+            raise ValueError("Interest rate must be non-negative.")
+
+        result = black_scholes(spot, strikes, time_to_expiry, volatility, interest_rate, is_call, greeks=greeks)
+        result["quantity"] = quantities
+        result["time_to_expiry"] = time_to_expiry
+        return result
@@ -0,0 +1,95 @@
+import math
+
+import numpy as np
+
+# Numeric fields of Deribit get_book_summary_by_currency kept per instrument
+SUMMARY_COLUMNS = (
+    "bid_price", "ask_price", "mid_price", "mark_price", "mark_iv", "underlying_price",
+    "open_interest", "volume", "best_bid_amount", "best_ask_amount",
+)
+# Size of the single level of a mark price book: more than any quantity, finite so that VWAPs stay defined
+MARK_BOOK_SIZE = 1e15
+
+
+class BookSummaryTable:
+    """Column-oriented table of the Deribit book summary for one underlying.
+
+    Every numeric field is a contiguous float array aligned with `names`, missing values are
+    NaN. Prices are quoted in units of the underlying, like the order book.
+    """
+
+    def __init__(self, entries):
+        # Catalogues persisted as plain instrument names carry no prices
+        entries = [entry for entry in entries if isinstance(entry, dict)]
+        self.names = [entry["instrument_name"] for entry in entries]
+        self._rows = {name: row for row, name in enumerate(self.names)}
+        self.columns = {
+            column: np.array([_as_float(entry.get(column)) for entry in entries], dtype=float)
+            for column in SUMMARY_COLUMNS
+        }
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, instrument_name):
+        return instrument_name in self._rows
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def row(self, instrument_name):
+        return self._rows.get(instrument_name)
+
+    def quote(self, instrument_name):
+        # One row as a dict, with None in place of NaN
+        row = self._rows.get(instrument_name)
+        if row is None:
+            return None
+        return {column: _as_optional(values[row]) for column, values in self.columns.items()}
+
+    def top_of_book(self, instrument_name, quantity, default_size):
+        """A one-level order book built from the best bid/ask, or None when it cannot fill `quantity`.
+
+        The summary endpoint does not always report the size at the top of the book; when it
+        is missing `default_size` is assumed.
+        """
+        row = self._rows.get(instrument_name)
+        if row is None:
+            return None
+
+        sides = {}
+        for side, price_column, size_column in (("bids", "bid_price", "best_bid_amount"), ("asks", "ask_price", "best_ask_amount")):
+            price = self.columns[price_column][row]
+            size = self.columns[size_column][row]
+            size = default_size if math.isnan(size) else size
+            if math.isnan(price) or price <= 0:
+                sides[side] = []
+            elif quantity > size:
+                return None
+            else:
+                sides[side] = [[float(price), float(size)]]
+        return self._order_book(row, sides["bids"], sides["asks"])
+
+    def mark_order_book(self, instrument_name):
+        # Both sides at the mark price with a practically unlimited size, so any quantity prices at the mark
+        row = self._rows.get(instrument_name)
+        if row is None:
+            return None
+        mark = self.columns["mark_price"][row]
+        levels = [] if math.isnan(mark) else [[float(mark), MARK_BOOK_SIZE]]
+        return self._order_book(row, levels, list(levels))
+
+    def _order_book(self, row, bids, asks):
+        order_book = {"instrument_name": self.names[row], "bids": bids, "asks": asks}
+        underlying_price = self.columns["underlying_price"][row]
+        if not math.isnan(underlying_price):
+            order_book["underlying_price"] = float(underlying_price)
+        return order_book
+
+
+def _as_float(value):
+    return math.nan if value is None else float(value)
+
+
+def _as_optional(value):
+    return None if math.isnan(value) else float(value)
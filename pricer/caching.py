@@ -0,0 +1,194 @@
+from collections import OrderedDict
+import threading
+import time
+
+from .order_book import ArrayOrderBook
+
+
+class SpotQuote:
+    """A spot/index price together with the source that answered and when it was fetched."""
+
+    __slots__ = ("price", "source", "fetched_at")
+
+    def __init__(self, price, source, fetched_at=None):
+        self.price = price
+        self.source = source
+        self.fetched_at = fetched_at if fetched_at is not None else time.time()
+
+    @property
+    def age(self):
+        return time.time() - self.fetched_at
+
+    def __repr__(self):
+        return f"SpotQuote(price={self.price}, source='{self.source}', age={self.age:.3f}s)"
+
+
+class _Flight:
+    # A fetch in progress that other callers for the same key wait on
+    def __init__(self):
+        self.event = threading.Event()
+        self.quote = None
+        self.error = None
+
+
+class SpotPriceCache:
+    """TTL cache of spot prices keyed by (underlying, currency) with request coalescing.
+
+    While a fetch for a key is running, concurrent callers for the same key wait for its
+    result instead of issuing their own request.
+    """
+
+    def __init__(self, ttl=5.0):
+        self.ttl = ttl
+        self._quotes = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def get(self, underlying, currency, fetch, ttl=None):
+        # fetch() must return a (price, source) tuple
+        ttl = self.ttl if ttl is None else ttl
+        key = (underlying, currency)
+
+        with self._lock:
+            quote = self._quotes.get(key)
+            if quote is not None and quote.age <= ttl:
+                return quote
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[key] = _Flight()
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.quote
+
+        try:
+            price, source = fetch()
+            flight.quote = SpotQuote(price, source)
+            with self._lock:
+                self._quotes[key] = flight.quote
+            return flight.quote
+        except Exception as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            flight.event.set()
+
+    def clear(self):
+        with self._lock:
+            self._quotes.clear()
+
+
+class BookSnapshot:
+    """An order book as returned by Deribit, stamped with the monotonic time it was fetched."""
+
+    __slots__ = ("book", "fetched_at", "size", "_array_book")
+
+    def __init__(self, book, fetched_at=None):
+        self.book = book
+        self.fetched_at = fetched_at if fetched_at is not None else time.monotonic()
+        self.size = _estimate_book_size(book)
+        self._array_book = None
+
+    @property
+    def array_book(self):
+        # ArrayOrderBook of the snapshot, with its cumulative depth and fill curve, built on first use
+        if self._array_book is None:
+            self._array_book = ArrayOrderBook.from_order_book(self.book)
+        return self._array_book
+
+    @property
+    def age(self):
+        return time.monotonic() - self.fetched_at
+
+
+def _estimate_book_size(book):
+    # Rough footprint of a decoded book: a fixed overhead plus one small list per price level
+    levels = len(book.get("bids") or []) + len(book.get("asks") or [])
+    return 512 + 120 * levels
+
+
+class OrderBookCache:
+    """LRU cache of order-book snapshots per instrument, bounded by entry count and optionally memory.
+
+    A snapshot is served when it is younger than `max_age` seconds or was fetched after
+    `fetched_since` (a time.monotonic() value, used to scope reuse to one pricing cycle).
+    """
+
+    def __init__(self, max_entries=2048, max_bytes=None):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive.")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, instrument_name, max_age=None, fetched_since=None):
+        with self._lock:
+            snapshot = self._entries.get(instrument_name)
+            fresh = snapshot is not None and (
+                (max_age is not None and snapshot.age <= max_age)
+                or (fetched_since is not None and snapshot.fetched_at >= fetched_since)
+            )
+            if not fresh:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(instrument_name)
+            self.hits += 1
+            return snapshot
+
+    def put(self, instrument_name, book):
+        snapshot = BookSnapshot(book)
+        with self._lock:
+            previous = self._entries.pop(instrument_name, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[instrument_name] = snapshot
+            self._bytes += snapshot.size
+
+            # Evict least recently used snapshots, but always keep the one just stored
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self.evictions += 1
+        return snapshot
+
+    def peek(self, instrument_name):
+        # The cached snapshot whatever its age, without counting a lookup
+        with self._lock:
+            return self._entries.get(instrument_name)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, instrument_name):
+        return instrument_name in self._entries
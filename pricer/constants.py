@@ -10,3 +10,7 @@ COIN_GECKO_IDS = {
     'XMR': 'monero',
     'TRX': 'tron'
 }
+
+# Deribit options expire at 08:00 UTC
+DERIBIT_EXPIRY_HOUR = 8
+SECONDS_PER_YEAR = 365 * 24 * 3600
@@ -0,0 +1,133 @@
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+
+from .constants import DERIBIT_EXPIRY_HOUR, SECONDS_PER_YEAR
+from .utils import parse_contract, parse_expiry, posix_time
+
+# Proleptic ordinal of 1970-01-01, to turn expiry ordinals into POSIX times
+_EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+
+@lru_cache(maxsize=None)
+def _expiry_ordinal(expiry_str):
+    return parse_expiry(expiry_str).toordinal()
+
+
+class OptionContract:
+    """Immutable Deribit option contract, eg. OptionContract.from_string("BTC-29SEP23-30000-C")."""
+
+    __slots__ = ("underlying", "expiry", "strike", "is_call")
+
+    def __init__(self, underlying, expiry, strike, is_call):
+        object.__setattr__(self, "underlying", underlying)
+        object.__setattr__(self, "expiry", expiry)
+        object.__setattr__(self, "strike", float(strike))
+        object.__setattr__(self, "is_call", bool(is_call))
+
+    @classmethod
+    def from_string(cls, option_string):
+        # The regex match behind parse_contract is memoized per string
+        return cls(*parse_contract(option_string))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("OptionContract is immutable.")
+
+    def __delattr__(self, name):
+        raise AttributeError("OptionContract is immutable.")
+
+    def __reduce__(self):
+        return OptionContract, (self.underlying, self.expiry, self.strike, self.is_call)
+
+    def _key(self):
+        return self.underlying, self.expiry, self.strike, self.is_call
+
+    def __eq__(self, other):
+        return isinstance(other, OptionContract) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return f"OptionContract('{self.name}')"
+
+    @property
+    def option_kind(self):
+        return "C" if self.is_call else "P"
+
+    @property
+    def name(self):
+        # Deribit writes integer strikes without a decimal point
+        strike = str(int(self.strike)) if self.strike.is_integer() else str(self.strike)
+        return f"{self.underlying}-{self.expiry}-{strike}-{self.option_kind}"
+
+    @property
+    def expiry_date(self):
+        return parse_expiry(self.expiry)
+
+
+class ContractBatch:
+    """Struct-of-arrays form of many option contracts, parsed in one pass.
+
+    One contiguous column per field, aligned with `names`: `underlying` holds codes into
+    the `underlyings` tuple, `expiry` the date ordinal of the expiry, `strike`, `is_call` and
+    `quantity`. Every distinct string is parsed once and expiry codes are memoized.
+    """
+
+    def __init__(self, names, underlyings, underlying, expiry, strike, is_call, quantity):
+        self.names = names
+        self.underlyings = underlyings
+        self.underlying = underlying
+        self.expiry = expiry
+        self.strike = strike
+        self.is_call = is_call
+        self.quantity = quantity
+
+    @classmethod
+    def parse(cls, option_data):
+        """
+        Parse option strings into a ContractBatch; a ContractBatch is returned unchanged.
+
+        Parameters
+        ----------
+        option_data : list of str or list of tpl [(input_opt, quantity)]
+            Option strings, quantities default to 1.
+        """
+        if isinstance(option_data, cls):
+            return option_data
+        if not isinstance(option_data, list):
+            raise ValueError("Invalid value for option_data. Must be a list of tuples (option_string, quantity).")
+
+        names = [option if isinstance(option, str) else option[0] for option in option_data]
+        quantity = np.array([1.0 if isinstance(option, str) else option[1] for option in option_data], dtype=float)
+        contracts = [parse_contract(name) for name in names]
+
+        underlyings, underlying = np.unique([contract[0] for contract in contracts], return_inverse=True)
+        expiry = np.array([_expiry_ordinal(contract[1]) for contract in contracts], dtype=np.int64)
+        strike = np.array([contract[2] for contract in contracts], dtype=float)
+        is_call = np.array([contract[3] for contract in contracts], dtype=bool)
+        return cls(names, tuple(underlyings.tolist()), underlying.astype(np.int32), expiry, strike, is_call, quantity)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, row):
+        return OptionContract.from_string(self.names[row])
+
+    def __iter__(self):
+        return (OptionContract.from_string(name) for name in self.names)
+
+    @property
+    def underlying_names(self):
+        # Underlying ticker of every row
+        return np.array(self.underlyings)[self.underlying] if len(self) else np.empty(0, dtype=str)
+
+    def time_to_expiry(self, valuation_time=None):
+        # ACT/365 years to the 08:00 UTC expiries, straight from the expiry ordinals
+        expiry_time = (self.expiry - _EPOCH_ORDINAL) * 86400.0 + DERIBIT_EXPIRY_HOUR * 3600.0
+        return (expiry_time - posix_time(valuation_time)) / SECONDS_PER_YEAR
+
+    def option_data(self):
+        # Back to the [(input_opt, quantity)] form of MarketPricer.compute_price
+        return list(zip(self.names, self.quantity.tolist()))
@@ -0,0 +1,152 @@
+import numpy as np
+from scipy.special import ndtr
+
+from .utils import year_fraction
+
+MIN_VOLATILITY = 1e-6
+MAX_VOLATILITY = 10.0
+
+
+def black76(forward, strike, time_to_expiry, volatility, is_call=True, discount_factor=1.0):
+    """Vectorized Black-76 price of a European option on a forward; inputs broadcast."""
+    forward, strike, t, volatility, is_call, discount_factor = np.broadcast_arrays(
+        np.asarray(forward, dtype=float), np.asarray(strike, dtype=float), np.asarray(time_to_expiry, dtype=float),
+        np.asarray(volatility, dtype=float), np.asarray(is_call, dtype=bool), np.asarray(discount_factor, dtype=float))
+    price, _ = _normalized_black(strike / forward, t, volatility, is_call)
+    return discount_factor * forward * price
+
+
+def _normalized_black(k, t, volatility, is_call):
+    # Undiscounted Black price and vega for a unit forward and strike k = K / F
+    sqrt_t = np.sqrt(t)
+    s = volatility * sqrt_t
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1 = -np.log(k) / s + 0.5 * s
+    d2 = d1 - s
+    sign = np.where(is_call, 1.0, -1.0)
+    price = sign * (ndtr(sign * d1) - k * ndtr(sign * d2))
+    vega = np.exp(-0.5 * d1 * d1) / np.sqrt(2 * np.pi) * sqrt_t
+    return price, vega
+
+
+def _initial_guess(k, t, otm_price, otm_call):
+    # Corrado-Miller approximation on the equivalent call price, falling back to a moneyness-based guess
+    call_price = np.where(otm_call, otm_price, otm_price + 1 - k)
+    half_gap = 0.5 * (1 - k)
+    centre = call_price - half_gap
+    discriminant = np.maximum(centre * centre - (1 - k) ** 2 / np.pi, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        guess = np.sqrt(2 * np.pi) / (1 + k) * (centre + np.sqrt(discriminant)) / np.sqrt(t)
+        fallback = np.sqrt(2 * np.abs(np.log(k)) / t)
+    guess = np.where(np.isfinite(guess) & (guess > MIN_VOLATILITY), guess, fallback)
+    return np.clip(np.where(np.isfinite(guess), guess, 0.5), 0.01, MAX_VOLATILITY / 2)
+
+
+def implied_volatility(price, forward, strike, time_to_expiry, is_call=True, discount_factor=1.0, tol=1e-12, max_iterations=100):
+    """
+    Vectorized Black-76 implied volatility for a whole chain.
+
+    Each option is inverted on its out-of-the-money equivalent (through put-call parity), which
+    keeps deep in-the-money quotes well conditioned. Newton steps are safeguarded by a bisection
+    bracket in [MIN_VOLATILITY, MAX_VOLATILITY], so flat vega in the wings cannot diverge.
+
+    Parameters
+    ----------
+    price : array_like
+        Option prices in the currency of forward and strike.
+    forward, strike : array_like
+    time_to_expiry : array_like
+        Years to expiry.
+    is_call : array_like of bool, optional, default: True
+    discount_factor : array_like, optional, default: 1.0
+    tol : float, optional
+        Tolerance on the price error, relative to the out-of-the-money price.
+    max_iterations : int, optional
+
+    Returns
+    -------
+    volatility : ndarray
+        Implied volatilities, NaN where the price violates the no-arbitrage bounds
+        (below intrinsic value or above the forward/strike bound), the option has expired
+        or no volatility in the bracket reproduces the price.
+    """
+    price, forward, strike, t, is_call, discount_factor = np.broadcast_arrays(
+        np.asarray(price, dtype=float), np.asarray(forward, dtype=float), np.asarray(strike, dtype=float),
+        np.asarray(time_to_expiry, dtype=float), np.asarray(is_call, dtype=bool), np.asarray(discount_factor, dtype=float))
+    shape = price.shape
+    price, forward, strike, t, is_call, discount_factor = (
+        array.ravel() for array in (price, forward, strike, t, is_call, discount_factor))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k = strike / forward
+        target = price / (discount_factor * forward)
+    intrinsic = np.maximum(np.where(is_call, 1 - k, k - 1), 0.0)
+    otm_call = k >= 1
+    otm_price = target - intrinsic
+    upper_bound = np.where(otm_call, 1.0, k)
+
+    volatility = np.full(price.shape, np.nan)
+    valid = (
+        np.isfinite(otm_price) & (forward > 0) & (strike > 0) & (t > 0)
+        & (otm_price > 0) & (otm_price < upper_bound)
+    )
+    idx = np.flatnonzero(valid)
+    if len(idx) == 0:
+        return volatility.reshape(shape)
+
+    k, t, otm_call, otm_price = k[idx], t[idx], otm_call[idx], otm_price[idx]
+    max_price, _ = _normalized_black(k, t, np.full(len(idx), MAX_VOLATILITY), otm_call)
+    reachable = otm_price < max_price
+
+    vol = _initial_guess(k, t, otm_price, otm_call)
+    lower = np.full(len(idx), MIN_VOLATILITY)
+    upper = np.full(len(idx), MAX_VOLATILITY)
+    active = np.flatnonzero(reachable)
+
+    for _ in range(max_iterations):
+        if len(active) == 0:
+            break
+        model, vega = _normalized_black(k[active], t[active], vol[active], otm_call[active])
+        diff = model - otm_price[active]
+        converged = np.abs(diff) <= tol * otm_price[active]
+
+        # Price is increasing in vol: tighten the bracket around the root
+        upper[active] = np.where(diff > 0, vol[active], upper[active])
+        lower[active] = np.where(diff < 0, vol[active], lower[active])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = vol[active] - diff / vega
+        inside = np.isfinite(newton) & (newton > lower[active]) & (newton < upper[active])
+        step = np.where(inside, newton, 0.5 * (lower[active] + upper[active]))
+        vol[active] = np.where(converged, vol[active], step)
+
+        still_active = ~converged & (upper[active] - lower[active] > 1e-14)
+        active = active[still_active]
+
+    vol[~reachable] = np.nan
+    volatility[idx] = vol
+    return volatility.reshape(shape)
+
+
+def chain_implied_volatility(summary, price_column="mark_price", valuation_time=None):
+    """
+    Implied volatilities of every instrument in a BookSummaryTable (Deribit book summary).
+
+    Deribit quotes option prices in units of the underlying, so the forward-currency price is
+    the quoted price times the summary's underlying (forward) price of that expiry.
+
+    Returns
+    -------
+    volatility : ndarray
+        Aligned with summary.names, NaN where the quote is missing or violates no-arbitrage.
+    """
+    parts = [name.split("-") for name in summary.names]
+    expiries = [part[1] for part in parts]
+    strikes = np.array([float(part[2]) for part in parts], dtype=float)
+    is_call = np.array([part[3] == "C" for part in parts], dtype=bool)
+    fractions = {expiry: year_fraction(expiry, valuation_time) for expiry in set(expiries)}
+    time_to_expiry = np.array([fractions[expiry] for expiry in expiries], dtype=float)
+
+    forward = summary["underlying_price"]
+    price = summary[price_column] * forward
+    return implied_volatility(price, forward, strikes, time_to_expiry, is_call)
@@ -0,0 +1,74 @@
+import numpy as np
+
+from .constants import SECONDS_PER_YEAR
+from .utils import expiry_timestamp, parse_expiry, posix_time
+
+
+class InstrumentIndex:
+    """Lookup structure over the listed instruments of one underlying, built once per cache refresh.
+
+    Holds a hash set of instrument names, the expiries as parsed dates in chronological order
+    (with their expiry timestamps) and, per expiry and option kind ('C'/'P'), a sorted array
+    of listed strikes.
+    """
+
+    def __init__(self, instruments):
+        names = []
+        strikes = {}
+        for instrument in instruments:
+            # Accept instrument names as well as Deribit book summary entries
+            name = instrument["instrument_name"] if isinstance(instrument, dict) else instrument
+            names.append(name)
+            parts = name.split("-")
+            if len(parts) != 4:
+                continue
+            _, expiry, strike, option_kind = parts
+            strikes.setdefault((expiry, option_kind), set()).add(float(strike))
+
+        self.names = frozenset(names)
+        self.expiry_dates = {expiry: parse_expiry(expiry) for expiry, _ in strikes}
+        self.expiries = sorted(self.expiry_dates, key=self.expiry_dates.get)
+        self.expiry_timestamps = np.array([expiry_timestamp(expiry) for expiry in self.expiries], dtype=float)
+        self.strikes = {key: np.array(sorted(values)) for key, values in strikes.items()}
+
+    def __contains__(self, instrument_name):
+        return instrument_name in self.names
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def strikes_for(self, expiry, option_kind):
+        return self.strikes.get((expiry, option_kind), np.empty(0))
+
+    def expiry_times(self, valuation_time=None):
+        # Year fractions of the sorted expiries, from the timestamps parsed at index time
+        return (self.expiry_timestamps - posix_time(valuation_time)) / SECONDS_PER_YEAR
+
+    def bracket_expiries(self, target_expiries):
+        """Return the (lower, upper, weight) positions in `expiries` around each target, see bracket_strikes.
+
+        weight is linear in time to expiry; targets outside the listed range are clamped to the
+        first/last expiry and a listed target gets lower == upper.
+        """
+        targets = np.array([expiry_timestamp(expiry) for expiry in target_expiries], dtype=float)
+        return bracket_strikes(self.expiry_timestamps, targets)
+
+
+def bracket_strikes(strikes, target_strikes):
+    """Return the (lower, upper, weight) entries of a sorted strike array around each target strike.
+
+    lower and upper are positions in the sorted, non-empty strike array and weight is the
+    linear interpolation weight of the upper strike. Targets outside the listed range are
+    clamped to the first/last strike; a listed target gets lower == upper.
+    """
+    strikes = np.asarray(strikes, dtype=float)
+    targets = np.clip(np.asarray(target_strikes, dtype=float), strikes[0], strikes[-1])
+    upper = np.searchsorted(strikes, targets)
+    lower = np.where(strikes[upper] == targets, upper, np.maximum(upper - 1, 0))
+    span = strikes[upper] - strikes[lower]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        weight = np.where(span > 0, (targets - strikes[lower]) / span, 0.0)
+    return lower, upper, weight
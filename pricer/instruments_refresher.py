@@ -0,0 +1,89 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentsRefresher:
+    """Background refresh of the instruments catalogue of several underlyings.
+
+    Every `interval` seconds the book summaries of all configured underlyings are downloaded in
+    parallel and swapped into the pricer class' instruments_cache. While a refresh is running,
+    quote requests keep pricing off the previous catalogue (stale-while-revalidate); a failed
+    refresh keeps the previous catalogue and is retried at the next interval.
+    """
+
+    def __init__(self, pricer_class, underlyings, interval=3600.0, max_workers=None, transport=None):
+        self.pricer_class = pricer_class
+        self.underlyings = [underlying.upper() for underlying in underlyings]
+        self.interval = interval
+        self.max_workers = max_workers or len(self.underlyings) or 1
+        self.transport = transport
+        self.errors = {}
+        self._requested = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def covers(self, underlying):
+        return self.is_running and underlying in self.underlyings
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def request(self, underlying):
+        # Ask for an early refresh of one underlying, eg. when a quote found its catalogue stale
+        with self._lock:
+            self._requested.add(underlying)
+        self._wake.set()
+
+    def refresh(self, underlyings=None):
+        """Refresh the given underlyings (all configured ones by default) in parallel and wait for them."""
+        underlyings = list(underlyings or self.underlyings)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            outcomes = list(executor.map(self._refresh_one, underlyings))
+        return dict(zip(underlyings, outcomes))
+
+    def _refresh_one(self, underlying):
+        # True when refreshed, False when another caller was already refreshing it
+        try:
+            refreshed = self.pricer_class._refresh_instruments(underlying, transport=self.transport, force_update=True)
+        except Exception as error:
+            logger.warning("Instruments refresh for %s failed, keeping the previous catalogue: %s", underlying, error)
+            self.errors[underlying] = error
+            return False
+        self.errors.pop(underlying, None)
+        return refreshed
+
+    def run(self):
+        next_refresh = 0.0
+        while not self._stop.is_set():
+            with self._lock:
+                requested, self._requested = self._requested, set()
+            if time.monotonic() >= next_refresh:
+                next_refresh = time.monotonic() + self.interval
+                self.refresh()
+            elif requested:
+                self.refresh(sorted(requested))
+            # Sleep until the next full refresh, an early refresh request or stop()
+            self._wake.wait(max(next_refresh - time.monotonic(), 0.0))
+            self._wake.clear()
+
+    def start(self):
+        if self.is_running:
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="instruments-refresher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,72 @@
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+
+class InstrumentsStore:
+    """Persistent instruments catalogue shared by processes, backed by a SQLite file in WAL mode.
+
+    Each underlying is stored as one row with its fetch timestamp, written in a single
+    transaction so readers never see a partial catalogue. A write never replaces a newer
+    catalogue saved concurrently by another process.
+    """
+
+    def __init__(self, directory, filename="instruments.sqlite3", timeout=30.0):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, filename)
+        self.timeout = timeout
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS instruments ("
+                "underlying TEXT PRIMARY KEY, fetched_at REAL NOT NULL, payload TEXT NOT NULL)"
+            )
+
+    def _connect(self):
+        # A short-lived connection per operation keeps the store safe to use from threads and processes
+        return _closing_connection(sqlite3.connect(self.path, timeout=self.timeout))
+
+    def load(self, underlying):
+        """Return (timestamp, instruments) for the underlying, or None if nothing is stored."""
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT fetched_at, payload FROM instruments WHERE underlying = ?", (underlying,)
+            ).fetchone()
+        if row is None:
+            return None
+        fetched_at, payload = row
+        return datetime.fromtimestamp(fetched_at), json.loads(payload)
+
+    def save(self, underlying, instruments, timestamp):
+        payload = json.dumps(instruments, separators=(",", ":"))
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT INTO instruments (underlying, fetched_at, payload) VALUES (?, ?, ?) "
+                "ON CONFLICT(underlying) DO UPDATE SET fetched_at = excluded.fetched_at, payload = excluded.payload "
+                "WHERE excluded.fetched_at > instruments.fetched_at",
+                (underlying, timestamp.timestamp(), payload),
+            )
+
+    def timestamps(self):
+        with self._connect() as connection:
+            rows = connection.execute("SELECT underlying, fetched_at FROM instruments").fetchall()
+        return {underlying: datetime.fromtimestamp(fetched_at) for underlying, fetched_at in rows}
+
+
+class _closing_connection:
+    # sqlite3's own context manager commits/rolls back but leaves the connection open
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self.connection
+
+    def __exit__(self, exc_type, exc, traceback):
+        try:
+            if exc_type is None:
+                self.connection.commit()
+            else:
+                self.connection.rollback()
+        finally:
+            self.connection.close()
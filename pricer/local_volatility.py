@@ -1,11 +1,245 @@
+import math
+from datetime import datetime, timezone
+
+import numpy as np
+
 from .option_pricer import OptionPricer
+from .market_pricing import MarketPricer
+from .contracts import ContractBatch
+from .implied_volatility import chain_implied_volatility
+from .constants import SECONDS_PER_YEAR
+from .utils import parse_contract, posix_time, year_fraction
+
+MIN_LOCAL_VARIANCE = 1e-4
+MAX_LOCAL_VARIANCE = 25.0
+
+
+class LocalVolatilitySurface:
+    """Dupire local volatility precomputed on a (time, log-moneyness) grid.
+
+    `local_vol[i, j]` is the local volatility at `times[i]` and log-moneyness
+    `log_moneyness[j]` = log(S / F(t)), stored as a C-contiguous array for fast bilinear lookup.
+    Times are years from `as_of` (POSIX seconds), the valuation time the surface was built at.
+    """
+
+    def __init__(self, times, log_moneyness, local_vol, forward_times, forwards, as_of=None):
+        self.times = np.ascontiguousarray(times, dtype=float)
+        self.log_moneyness = np.ascontiguousarray(log_moneyness, dtype=float)
+        self.local_vol = np.ascontiguousarray(local_vol, dtype=float)
+        self.forward_times = np.asarray(forward_times, dtype=float)
+        self.forwards = np.asarray(forwards, dtype=float)
+        self.as_of = as_of
+
+    def elapsed(self, valuation_time=None):
+        # Years from as_of to valuation_time, the offset of the valuation time on the surface's time axis
+        return 0.0 if self.as_of is None else (posix_time(valuation_time) - self.as_of) / SECONDS_PER_YEAR
+
+    @classmethod
+    def from_implied(cls, expiry_times, slices, forwards, n_strikes=101, n_times=64, as_of=None):
+        """
+        Build the surface from implied volatility slices with Gatheral's form of the Dupire formula.
+
+        Parameters
+        ----------
+        expiry_times : array_like
+            Years to each listed expiry.
+        slices : list of (log_moneyness, implied_vol) array pairs, one per expiry
+        forwards : array_like
+            Forward price of each expiry.
+        as_of : float, optional
+            POSIX time expiry_times are measured from.
+        """
+        order = np.argsort(expiry_times)
+        expiry_times = np.asarray(expiry_times, dtype=float)[order]
+        forwards = np.asarray(forwards, dtype=float)[order]
+        slices = [slices[i] for i in order]
+
+        k_min = min(np.min(k) for k, _ in slices)
+        k_max = max(np.max(k) for k, _ in slices)
+        log_moneyness = np.linspace(k_min, k_max, n_strikes)
+
+        # Total implied variance per expiry on the common strike grid, flat extrapolation in the wings
+        node_variance = np.array([
+            np.interp(log_moneyness, k, vol ** 2 * t) for (k, vol), t in zip(slices, expiry_times)
+        ])
+        # Linear in time from w(0) = 0, which keeps the calendar interpolation arbitrage-free
+        # as long as the quoted total variance increases with expiry
+        node_times = np.concatenate(([0.0], expiry_times))
+        node_variance = np.vstack((np.zeros(n_strikes), np.maximum.accumulate(node_variance, axis=0)))
+        times = np.linspace(expiry_times[0] / 4, expiry_times[-1], n_times)
+        w = np.array([np.interp(times, node_times, node_variance[:, j]) for j in range(n_strikes)]).T
+
+        dw_dt = np.gradient(w, times, axis=0)
+        dw_dk = np.gradient(w, log_moneyness, axis=1)
+        d2w_dk2 = np.gradient(dw_dk, log_moneyness, axis=1)
+        k = log_moneyness[np.newaxis, :]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            denominator = (
+                1 - k / w * dw_dk
+                + 0.25 * (-0.25 - 1 / w + k ** 2 / w ** 2) * dw_dk ** 2
+                + 0.5 * d2w_dk2
+            )
+            local_variance = dw_dt / denominator
+        local_variance = np.where(np.isfinite(local_variance) & (denominator > 0), local_variance, MIN_LOCAL_VARIANCE)
+        local_vol = np.sqrt(np.clip(local_variance, MIN_LOCAL_VARIANCE, MAX_LOCAL_VARIANCE))
+
+        return cls(times, log_moneyness, local_vol, expiry_times, forwards, as_of=as_of)
+
+    def forward(self, time):
+        return np.interp(time, self.forward_times, self.forwards)
+
+    def lookup(self, log_moneyness, time):
+        """Bilinear interpolation of the local volatility, clamped to the grid edges; inputs broadcast."""
+        k, t = np.broadcast_arrays(np.asarray(log_moneyness, dtype=float), np.asarray(time, dtype=float))
+        times, strikes = self.times, self.log_moneyness
+        t = np.clip(t, times[0], times[-1])
+        k = np.clip(k, strikes[0], strikes[-1])
+
+        i = np.clip(np.searchsorted(times, t) - 1, 0, len(times) - 2)
+        j = np.clip(np.searchsorted(strikes, k) - 1, 0, len(strikes) - 2)
+        wt = (t - times[i]) / (times[i + 1] - times[i])
+        wk = (k - strikes[j]) / (strikes[j + 1] - strikes[j])
+
+        grid = self.local_vol
+        return (
+            (1 - wt) * ((1 - wk) * grid[i, j] + wk * grid[i, j + 1])
+            + wt * ((1 - wk) * grid[i + 1, j] + wk * grid[i + 1, j + 1])
+        )
+
 
 class LocalVolatilityPricer(OptionPricer):
-    def __init__(self):
+    # Calibrated surfaces per underlying, with the instruments cache timestamp and valuation time they were built at
+    surface_cache = {}
+
+    def __init__(self, n_paths=20000, steps_per_year=365, seed=None):
         super().__init__()
+        self.n_paths = n_paths
+        self.steps_per_year = steps_per_year
+        self.seed = seed
+
+    @classmethod
+    def calibrate(cls, underlying, update_cache=True, valuation_time=None):
+        """Return the local volatility surface of the underlying, rebuilt only when market data changed."""
+        if update_cache:
+            MarketPricer.update_instruments_cache(underlying)
+        cache_entry = MarketPricer.instruments_cache.get(underlying)
+        if cache_entry is None or not len(cache_entry.get("summary", ())):
+            raise ValueError(f"No book summary available for {underlying}.")
+
+        # valuation_time=None (now) shares one surface, shifted by surface.elapsed() when used later
+        key = (cache_entry["timestamp"], valuation_time)
+        cached = cls.surface_cache.get(underlying)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        surface = cls._build_surface(cache_entry["summary"], valuation_time)
+        cls.surface_cache[underlying] = (key, surface)
+        return surface
+
+    @staticmethod
+    def _build_surface(summary, valuation_time=None):
+        # Times are measured from one fixed valuation time, recorded as the surface's as_of
+        if valuation_time is None:
+            valuation_time = datetime.now(timezone.utc).replace(tzinfo=None)
+        # Deribit mark IVs (in percent) when available, otherwise implied from the mark prices
+        implied_vol = summary["mark_iv"] / 100
+        missing = np.isnan(implied_vol)
+        if missing.any():
+            implied_vol = np.where(missing, chain_implied_volatility(summary, valuation_time=valuation_time), implied_vol)
+
+        contracts = [parse_contract(name) for name in summary.names]
+        expiries = np.array([contract[1] for contract in contracts])
+        strikes = np.array([contract[2] for contract in contracts], dtype=float)
+        forwards = summary["underlying_price"]
+
+        expiry_times, slices, slice_forwards = [], [], []
+        for expiry in np.unique(expiries):
+            rows = (expiries == expiry) & np.isfinite(implied_vol) & np.isfinite(forwards)
+            t = year_fraction(expiry, valuation_time)
+            if t <= 0 or rows.sum() < 2:
+                continue
+            forward = float(np.median(forwards[rows]))
+            # Calls and puts of the same strike share one point: average their vols
+            unique_strikes, position = np.unique(strikes[rows], return_inverse=True)
+            vols = np.bincount(position, weights=implied_vol[rows]) / np.bincount(position)
+            expiry_times.append(t)
+            slices.append((np.log(unique_strikes / forward), vols))
+            slice_forwards.append(forward)
+
+        if not slices:
+            raise ValueError("Not enough quotes to calibrate a local volatility surface.")
+        return LocalVolatilitySurface.from_implied(expiry_times, slices, slice_forwards, as_of=posix_time(valuation_time))
+
+    def compute_volatility(self, underlying, strikes, time_to_expiry, update_cache=True):
+        """Local volatility at the given strikes and times (years) from the calibrated surface."""
+        surface = self.calibrate(underlying, update_cache=update_cache)
+        time_to_expiry = np.asarray(time_to_expiry, dtype=float) + surface.elapsed()
+        return surface.lookup(np.log(np.asarray(strikes, dtype=float) / surface.forward(time_to_expiry)), time_to_expiry)
+
+    def _simulate(self, surface, expiry_times, rng, start=0.0):
+        """Prices at each (sorted) expiry time along antithetic log-Euler paths, shape (n_expiries, 2 * half).
+
+        Times are on the surface's time axis, paths start at `start`. Column i + half is the
+        antithetic twin of column i.
+        """
+        half = (self.n_paths + 1) // 2
+        log_spot = np.full(2 * half, math.log(surface.forward(start)))
+        captured = np.empty((len(expiry_times), 2 * half))
+
+        t = start
+        for index, expiry_time in enumerate(expiry_times):
+            n_steps = int(math.ceil((expiry_time - t) * self.steps_per_year))
+            dt = (expiry_time - t) / n_steps if n_steps > 0 else 0.0
+            for _ in range(n_steps):
+                # Drift follows the forward curve so E[S_T] = F(T); vol is read off the surface
+                drift = (math.log(surface.forward(t + dt)) - math.log(surface.forward(t))) / dt
+                vol = surface.lookup(log_spot - math.log(surface.forward(t)), t)
+                z = rng.standard_normal(half)
+                z = np.concatenate((z, -z))
+                log_spot += (drift - 0.5 * vol * vol) * dt + vol * math.sqrt(dt) * z
+                t += dt
+            captured[index] = np.exp(log_spot)
+        return captured
+
+    def compute_price(self, option_data, update_cache=True, valuation_time=None):
+        """
+        Price European options by Monte Carlo under the calibrated local volatility surface.
+
+        All options of one underlying share a single set of simulated paths; each surface is
+        calibrated once and reused until the instruments cache is refreshed.
+
+        Parameters
+        ----------
+        option_data : list of tpl [(input_opt , quantity)] or ContractBatch
+            Same format as MarketPricer.compute_price.
+
+        Returns
+        -------
+        result : dict of ndarray
+            Per-unit 'price' (in the quote currency of the underlying), 'standard_error' and
+            'quantity', aligned with option_data.
+        """
+        batch = ContractBatch.parse(option_data)
+        strikes = batch.strike
+        sign = np.where(batch.is_call, 1.0, -1.0)
+        time_to_expiry = np.maximum(batch.time_to_expiry(valuation_time), 0.0)
+
+        price = np.empty(len(batch))
+        standard_error = np.empty(len(batch))
+        rng = np.random.default_rng(self.seed)
+        for code, underlying in enumerate(batch.underlyings):
+            surface = self.calibrate(underlying, update_cache=update_cache, valuation_time=valuation_time)
+            rows = np.flatnonzero(batch.underlying == code)
+            # Sorted distinct expiry times, all captured along one set of paths
+            expiry_times, position = np.unique(time_to_expiry[rows], return_inverse=True)
+            start = surface.elapsed(valuation_time)
+            paths = self._simulate(surface, expiry_times + start, rng, start=start)
 
-    def compute_volatility(self, ...):
-        # Implement local volatility model
+            payoff = np.maximum(sign[rows, np.newaxis] * (paths[position] - strikes[rows, np.newaxis]), 0.0)
+            # Antithetic twins are averaged first, the pair means are independent samples
+            half = payoff.shape[1] // 2
+            pairs = 0.5 * (payoff[:, :half] + payoff[:, half:])
+            price[rows] = pairs.mean(axis=1)
+            standard_error[rows] = pairs.std(axis=1, ddof=1) / math.sqrt(half)
 
-    def compute_price(self, ...):
-        # Implement pricing formula with local volatility
+        return {"price": price, "standard_error": standard_error, "quantity": batch.quantity}
@@ -1,42 +1,233 @@
 from .option_pricer import OptionPricer
-from .utils import fetch_spot_price
+from .utils import fetch_spot_quote, HostRateLimiter
+from .caching import SpotPriceCache, OrderBookCache
+from .transport import get_default_transport
 from .constants import COIN_GECKO_IDS
+import logging
+import numpy as np
 import requests
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from .option_interpolation import OptionInterpolator
+from .instrument_index import InstrumentIndex
+from .instruments_store import InstrumentsStore
+from .instruments_refresher import InstrumentsRefresher
+from .book_summary import BookSummaryTable
+from .order_book import ArrayOrderBook
+from .contracts import ContractBatch
+from .metrics import endpoint_of, get_metrics, response_size
+
+logger = logging.getLogger(__name__)
+
+class PricingResult(dict):
+    """The price_dic returned by compute_price, with the spot quotes used to produce it."""
+
+    def __init__(self, *args, spot_quotes=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # {(underlying, currency): SpotQuote} with the answering source and its age
+        self.spot_quotes = spot_quotes if spot_quotes is not None else {}
+
+
+class _PerThread:
+    """Pricer attribute held per thread, so that one pricer can run compute_price from several threads."""
+
+    def __init__(self, default=None, factory=None):
+        self.default = default
+        self.factory = factory
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        state = instance._thread_state()
+        if self.name not in state:
+            state[self.name] = self.factory() if self.factory is not None else self.default
+        return state[self.name]
+
+    def __set__(self, instance, value):
+        instance._thread_state()[self.name] = value
+
 
 class MarketPricer(OptionPricer):   
+    # REST endpoints, class-wide so that catalogue refreshes hit the same hosts as the pricer
+    base_url = "https://www.deribit.com/api/v2/"
+    coingecko_url = "https://api.coingecko.com/api/v3/"
     instruments_cache = {}
-
-    def __init__(self):
+    instruments_cache_ttl = timedelta(days=1)
+    # Optional InstrumentsStore persisting the catalogue across processes, see use_instruments_store
+    instruments_store = None
+    # Optional InstrumentsRefresher downloading catalogues in the background, see use_instruments_refresher
+    instruments_refresher = None
+    _refresh_locks = {}
+    _refresh_locks_guard = threading.Lock()
+    spot_cache = SpotPriceCache()
+    book_cache = OrderBookCache()
+
+    # The option being priced and the policy of the current pricing cycle live per thread
+    input_string = _PerThread()
+    option_underlying = _PerThread()
+    option_type = _PerThread()
+    strike = _PerThread()
+    time_to_expiry = _PerThread()
+    interest_rate = _PerThread()
+    quantity = _PerThread()
+    price_source = _PerThread(default='order_book')
+    book_max_age = _PerThread()
+    _cycle_started = _PerThread()
+    _spot_quotes = _PerThread(factory=dict)
+
+    def __init__(self, max_workers=8, requests_per_second=None, transport=None, spot_ttl=5.0, market_data=None,
+                 summary_max_age=5.0, top_of_book_quantity=1.0):
+        self._local = threading.local()
         super().__init__()
-        self.base_url = "https://www.deribit.com/api/v2/"
+        self.transport = transport if transport is not None else get_default_transport()
+        self.max_workers = max_workers
+        self.spot_ttl = spot_ttl
+        # Optional streaming MarketDataEngine; its in-memory books take precedence over REST
+        self.market_data = market_data
+        self.rate_limiter = HostRateLimiter(requests_per_second) if requests_per_second else None
+        # Book summary pricing (price_source='top_of_book'/'mark'): max summary age in seconds and the
+        # size assumed at the top of the book when the summary does not report it
+        self.summary_max_age = summary_max_age
+        self.top_of_book_quantity = top_of_book_quantity
+        self.price_source = 'order_book'
+
+        # Order-book reuse policy of the current compute_price call, see book_cache
+        self.book_max_age = None
+        self._cycle_started = None
+        self._spot_quotes = {}
     
+    def _thread_state(self):
+        state = getattr(self._local, 'state', None)
+        if state is None:
+            state = self._local.state = {}
+        return state
+
+    def _bind_thread_state(self, function):
+        # Worker threads act on behalf of the calling thread: same option, pricing cycle and spot quotes
+        state = self._thread_state()
+
+        def bound(*args):
+            self._local.state = state
+            return function(*args)
+        return bound
+
+    @staticmethod
+    def _log(verbose, message, *args):
+        # verbose progress goes to the log at INFO, otherwise at DEBUG; formatted only when enabled
+        logger.log(logging.INFO if verbose else logging.DEBUG, message, *args)
+
     def __str__(self):
         return f"MarketPricer(input_string='{self.input_string}', quantity={self.quantity})"
     
     @classmethod
-    def update_instruments_cache(cls, input_string, force_update=False):
+    def use_instruments_store(cls, directory):
+        cls.instruments_store = InstrumentsStore(directory) if directory is not None else None
+        return cls.instruments_store
+
+    @classmethod
+    def use_instruments_refresher(cls, underlyings, interval=3600.0, max_workers=None, transport=None):
+        """Start refreshing the catalogues of `underlyings` every `interval` seconds in the background (None stops it)."""
+        if cls.instruments_refresher is not None:
+            cls.instruments_refresher.stop()
+            cls.instruments_refresher = None
+        if underlyings is not None:
+            cls.instruments_refresher = InstrumentsRefresher(cls, underlyings, interval, max_workers, transport).start()
+        return cls.instruments_refresher
+
+    @classmethod
+    def _is_stale(cls, timestamp, max_age=None):
+        max_age = cls.instruments_cache_ttl if max_age is None else timedelta(seconds=max_age)
+        return timestamp is None or datetime.now() - timestamp > max_age
+
+    @classmethod
+    def update_instruments_cache(cls, input_string, force_update=False, transport=None, max_age=None):
         # Extract the option underlying from the input string
         option_underlying = input_string.split("-")[0].upper()
 
         # Initialize the cache entry if it does not exist
         if option_underlying not in cls.instruments_cache:
-            cls.instruments_cache[option_underlying] = {"timestamp": None, "instruments": []}
+            cls.instruments_cache[option_underlying] = {"timestamp": None, "instruments": InstrumentIndex([]), "summary": BookSummaryTable([])}
 
         cache_entry = cls.instruments_cache[option_underlying]
 
-        # Update the cache if necessary (forced update or stale data)
-        if force_update or cache_entry["timestamp"] is None or datetime.now() - cache_entry["timestamp"] > timedelta(days=1):
-            # Create an instance of the class with a quantity of 1 and update_cache set to False to avoid recursion
-            instance = cls()
-            cache_entry["instruments"] = instance._fetch_options_instruments()
-            cache_entry["timestamp"] = datetime.now()
+        # Warm start from the persistent store when this process has nothing fresher
+        if not force_update and cls.instruments_store is not None and cls._is_stale(cache_entry["timestamp"], max_age):
+            stored = cls.instruments_store.load(option_underlying)
+            if stored is not None and not cls._is_stale(stored[0], max_age):
+                timestamp, instruments = stored
+                cache_entry = {"timestamp": timestamp, "instruments": InstrumentIndex(instruments), "summary": BookSummaryTable(instruments)}
+                cls.instruments_cache[option_underlying] = cache_entry
+
+        # Update the cache if necessary (forced update or stale data, max_age in seconds overrides the TTL)
+        stale = force_update or cls._is_stale(cache_entry["timestamp"], max_age)
+        metrics = get_metrics()
+        if metrics.enabled:
+            metrics.increment("cache_requests", cache="instruments", result="miss" if stale else "hit")
+        if not stale:
+            return
+        refresher = cls.instruments_refresher
+        if not force_update and cache_entry["timestamp"] is not None and refresher is not None and refresher.covers(option_underlying):
+            # Stale-while-revalidate: keep pricing off the current catalogue, the refresher downloads the next one
+            refresher.request(option_underlying)
+            return
+        cls._refresh_instruments(option_underlying, transport, force_update, max_age)
+
+    @classmethod
+    def _refresh_lock(cls, option_underlying):
+        with cls._refresh_locks_guard:
+            return cls._refresh_locks.setdefault(option_underlying, threading.Lock())
+
+    @classmethod
+    def _refresh_instruments(cls, option_underlying, transport=None, force_update=False, max_age=None):
+        # Single flight per underlying: with a catalogue to serve, callers don't queue behind a running download
+        cache_entry = cls.instruments_cache.get(option_underlying, {})
+        lock = cls._refresh_lock(option_underlying)
+        if not lock.acquire(blocking=cache_entry.get("timestamp") is None):
+            return False
+        try:
+            # A cold-start caller that waited may find the catalogue refreshed meanwhile
+            if not force_update and not cls._is_stale(cls.instruments_cache.get(option_underlying, {}).get("timestamp"), max_age):
+                return False
+            with get_metrics().timer("instruments_refresh", underlying=option_underlying):
+                # Create an instance of the class with a quantity of 1 and update_cache set to False to avoid recursion
+                instance = cls()
+                if transport is not None:
+                    instance.transport = transport
+                instance.option_underlying = option_underlying
+                # Index the catalogue once per refresh: O(1) membership, sorted expiries and strikes
+                instruments = instance._fetch_options_instruments()
+                # Swap the whole entry so readers never see an index and a summary of different refreshes
+                cache_entry = {"timestamp": datetime.now(), "instruments": InstrumentIndex(instruments), "summary": BookSummaryTable(instruments)}
+                cls.instruments_cache[option_underlying] = cache_entry
+                if cls.instruments_store is not None:
+                    cls.instruments_store.save(option_underlying, instruments, cache_entry["timestamp"])
+            logger.debug("Refreshed %d instruments for %s", len(cache_entry["instruments"]), option_underlying)
+            return True
+        finally:
+            lock.release()
+
+    def _http_get(self, url):
+        # Single choke point for outgoing requests so per-host rate limiting applies everywhere
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(url)
+        response = self.transport.get(url)
+        metrics = get_metrics()
+        if metrics.enabled:
+            endpoint = endpoint_of(url)
+            metrics.increment("requests", endpoint=endpoint)
+            metrics.increment("response_bytes", response_size(response), endpoint=endpoint)
+        return response
 
     def _fetch_options_instruments(self):
         # Construct the API request URL
         url = f"{self.base_url}public/get_book_summary_by_currency?currency={self.option_underlying}&kind=option"
-        response = requests.get(url)
+        response = self._http_get(url)
 
         # Handle non-successful API response
         if response.status_code != 200:
@@ -47,28 +238,75 @@ class MarketPricer(OptionPricer):
         if "result" not in book_data:
             raise ValueError("Unexpected response format from Deribit API")
 
-        # Extract instrument names from the response
-        instrument_names = [entry["instrument_name"] for entry in book_data["result"]]
-        return instrument_names
+        # Keep the whole summary: names for the index, best bid/ask and mark for book summary pricing
+        return book_data["result"]
 
     def _fetch_option_book(self, input_string=None):
         if input_string:
             instrument_name = input_string
         else:
             instrument_name = self.input_string
-            
+
+        metrics = get_metrics()
+        with metrics.timer("book_fetch"):
+            order_book, source = self._load_option_book(instrument_name)
+        if metrics.enabled:
+            metrics.increment("book_sources", source=source)
+            if source in ('cache', 'rest'):
+                metrics.increment("cache_requests", cache="book", result="hit" if source == 'cache' else "miss")
+        return order_book
+
+    def _load_option_book(self, instrument_name):
+        # (order book, where it came from): 'market_data', 'summary', 'cache' or 'rest'
+        if self.market_data is not None:
+            order_book = self.market_data.get_order_book(instrument_name)
+            if order_book is not None:
+                return order_book, 'market_data'
+
+        if self.price_source != 'order_book':
+            order_book = self._summary_order_book(instrument_name)
+            if order_book is not None:
+                return order_book, 'summary'
+
+        snapshot = self.book_cache.get(instrument_name, max_age=self.book_max_age, fetched_since=self._cycle_started)
+        if snapshot is not None:
+            return snapshot.book, 'cache'
+
         url = f"{self.base_url}public/get_order_book?depth=1000&instrument_name={instrument_name}"
-        response = requests.get(url)
+        response = self._http_get(url)
 
         # Handle non-successful API response
         if response.status_code != 200:
             raise requests.exceptions.RequestException(f"Failed to fetch option book data from Deribit API: {response.text}")
 
         order_book_data = response.json()
-        return order_book_data['result']
+        return self.book_cache.put(instrument_name, order_book_data['result']).book, 'rest'
         
-    def _fetch_spot_price(self, currency='usd'):
-        return fetch_spot_price(self.option_underlying, currency=currency, base_url=self.base_url)
+    def _summary_order_book(self, instrument_name):
+        # Order book synthesized from the cached book summary; None means the full depth is needed
+        summary = self.instruments_cache.get(instrument_name.split("-")[0].upper(), {}).get("summary")
+        if summary is None:
+            return None
+        if self.price_source == 'mark':
+            return summary.mark_order_book(instrument_name)
+        return summary.top_of_book(instrument_name, self.quantity, default_size=self.top_of_book_quantity)
+
+    def _fetch_spot_price(self, currency='usd', option_underlying=None):
+        option_underlying = option_underlying or self.option_underlying
+        metrics = get_metrics()
+        fetched = []
+
+        def fetch():
+            fetched.append(True)
+            return fetch_spot_quote(option_underlying, currency=currency, base_url=self.base_url, transport=self.transport,
+                                    coingecko_url=self.coingecko_url)
+
+        with metrics.timer("spot_lookup"):
+            quote = self.spot_cache.get(option_underlying, currency, fetch, ttl=self.spot_ttl)
+        if metrics.enabled:
+            metrics.increment("cache_requests", cache="spot", result="miss" if fetched else "hit")
+        self._spot_quotes[(option_underlying, currency)] = quote
+        return quote.price
 
     def _get_underlying_price(self, order_book, use_future_price):
         if use_future_price and 'underlying_price' in order_book:
@@ -98,6 +336,8 @@ class MarketPricer(OptionPricer):
             
             # Handle the case where the remaining quantity is larger than the order book
             if total_qty < target_quantity:
+                # Priced at the last level; compute_price_ladder flags it per side
+                get_metrics().increment("insufficient_depth")
                 remaining_qty = target_quantity - total_qty
                 total_price += price * remaining_qty
                 total_qty += remaining_qty
@@ -124,17 +364,21 @@ class MarketPricer(OptionPricer):
 
         underlying_price = self._get_underlying_price(order_book, use_future_price)
 
-        bid_weighted_price = self._calculate_price_if_available(bids, quantity, underlying_price)
-        ask_weighted_price = self._calculate_price_if_available(asks, quantity, underlying_price)
+        with get_metrics().timer("depth_walk"):
+            bid_weighted_price = self._calculate_price_if_available(bids, quantity, underlying_price)
+            ask_weighted_price = self._calculate_price_if_available(asks, quantity, underlying_price)
 
         bid_weighted_price, ask_weighted_price = self._handle_missing_prices(
             bid_weighted_price, ask_weighted_price, bid_spread, ask_spread)
 
         return [bid_weighted_price, ask_weighted_price]
     
-    def _validate_inputs(self, option_data, future_spot, interpolation_method, bid_spread, ask_spread):
+    def _validate_inputs(self, option_data, future_spot, interpolation_method, bid_spread, ask_spread, price_source='order_book'):
         if future_spot not in ['future', 'spot']:
             raise ValueError("Invalid value for future_spot. Valid values: 'future', 'spot'")
+
+        if price_source not in ['order_book', 'top_of_book', 'mark']:
+            raise ValueError("Invalid value for price_source. Valid values: 'order_book', 'top_of_book', 'mark'")
             
         if interpolation_method not in ['linear', 'cubic_spline']:
             raise ValueError("Invalid value for interpolation_method. Valid values: 'linear', 'cubic_spline'")
@@ -152,36 +396,93 @@ class MarketPricer(OptionPricer):
             if not isinstance(option, tuple):
                 raise ValueError("Invalid value for option_data. Each element must be a tuple (option_string, quantity).")
 
-    def _process_option(self, option_tuple, future_spot, interpolation_method, bid_spread, ask_spread, update_cache, verbose):
+    def _summary_max_age(self, interpolation_method=None):
+        # Book summary pricing and spline interpolation need a recent summary, not just a recent catalogue
+        if self.price_source != 'order_book' or interpolation_method == 'cubic_spline':
+            return self.summary_max_age
+        return None
+
+    def _process_option(self, option_tuple, future_spot, interpolation_method, bid_spread, ask_spread, verbose):
+        # The instruments cache was brought up to date by _is_listed just before
         input_string, quantity = option_tuple
         self.parse_option_string(input_string, quantity)
-        if update_cache:
-            self.update_instruments_cache(input_string)
+        self.input_string = input_string
 
         option_name = self.input_string
         if option_name in self.instruments_cache[self.option_underlying]["instruments"]:
-            if verbose:
-                print(f"Fetching order book for {option_name}...")
+            self._log(verbose, "Fetching order book for %s...", option_name)
             order_book = self._fetch_option_book()
         else:
-            if verbose:
-                print(f"Option {option_name} not available. Using interpolation method: {interpolation_method}...")
-
-            instrument_data = option_name.split('-')
-            target_strike = float(instrument_data[2])
-            target_expiry = instrument_data[1]
-            target_quantity = self.quantity
+            self._log(verbose, "Option %s not available. Using interpolation method: %s...", option_name, interpolation_method)
 
-            interpolator = OptionInterpolator(self.instruments_cache[self.option_underlying]['instruments'], self)
-            interpolated_price = interpolator.interpolate_option_price(target_strike, target_expiry, target_quantity, method=interpolation_method)
-            return interpolated_price
+            return self._interpolate_options([option_tuple], future_spot, interpolation_method, bid_spread, ask_spread)[0]
 
-        if verbose:
-            print("Using spot price..." if future_spot == 'spot' else "Using future price...")
+        self._log(verbose, "Using spot price..." if future_spot == 'spot' else "Using future price...")
         price = self._get_weighted_price(order_book, use_future_price=(future_spot == 'future'), bid_spread=bid_spread, ask_spread=ask_spread)
         return price
     
-    def compute_price(self, option_data, future_spot='future', interpolation_method='linear', bid_spread=0.05, ask_spread=0.05, update_cache=True, verbose=True):
+    def _is_listed(self, input_string, update_cache, interpolation_method):
+        if update_cache:
+            self.update_instruments_cache(input_string, transport=self.transport, max_age=self._summary_max_age(interpolation_method))
+        return input_string in self.instruments_cache.get(input_string.split("-")[0].upper(), {}).get("instruments", ())
+
+    def _interpolate_options(self, option_data, future_spot, interpolation_method, bid_spread, ask_spread):
+        # Non-listed options of one underlying share one interpolator and one fetch of their neighbour books
+        groups = {}
+        for position, (input_string, quantity) in enumerate(option_data):
+            self.parse_option_string(input_string, quantity)
+            groups.setdefault(self.option_underlying, []).append(position)
+
+        prices = [None] * len(option_data)
+        for underlying, positions in groups.items():
+            targets = [option_data[position] for position in positions]
+            self.option_underlying = underlying
+            # Books synthesized from the summary have to cover the largest target quantity
+            self.quantity = max(quantity for _, quantity in targets)
+            interpolator = OptionInterpolator(self.instruments_cache[underlying]['instruments'], self)
+            interpolated = interpolator.interpolate_batch(targets, method=interpolation_method, use_future_price=(future_spot == 'future'),
+                                                          bid_spread=bid_spread, ask_spread=ask_spread)
+            # Same [bid, ask] layout as listed options
+            for position, bid, ask in zip(positions, interpolated['bid'], interpolated['ask']):
+                prices[position] = [float(bid), float(ask)]
+        return prices
+
+    def _fetch_option_books(self, instrument_names):
+        # Several books at once, with up to max_workers requests in flight
+        if len(instrument_names) <= 1:
+            return {name: self._fetch_option_book(name) for name in instrument_names}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return dict(zip(instrument_names, executor.map(self._bind_thread_state(self._fetch_option_book), instrument_names)))
+
+    def _prefetch_market_data(self, option_data, future_spot, update_cache, verbose):
+        underlyings = sorted({option_string.split("-")[0].upper() for option_string, _ in option_data})
+        if update_cache:
+            for underlying in underlyings:
+                self.update_instruments_cache(underlying, transport=self.transport, max_age=self._summary_max_age())
+        if self.price_source != 'order_book':
+            # Books come from the summary just refreshed, full depth is only fetched for large quantities
+            return
+
+        # Dedupe the listed instruments; non-listed ones go through interpolation later
+        instrument_names = sorted({
+            option_string for option_string, _ in option_data
+            if option_string in self.instruments_cache.get(option_string.split("-")[0].upper(), {}).get("instruments", ())
+        })
+        self._log(verbose, "Fetching %d order books with up to %d requests in flight...", len(instrument_names), self.max_workers)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Books and spot prices land in book_cache and spot_cache, where _process_option picks them up
+            fetch_book = self._bind_thread_state(self._fetch_option_book)
+            fetch_spot = self._bind_thread_state(self._fetch_spot_price)
+            book_futures = [executor.submit(fetch_book, name) for name in instrument_names]
+            spot_futures = []
+            if future_spot == 'spot':
+                spot_futures = [executor.submit(fetch_spot, 'usd', underlying) for underlying in underlyings]
+
+            for future in book_futures + spot_futures:
+                future.result()
+
+    def compute_price(self, option_data, future_spot='future', interpolation_method='linear', bid_spread=0.05, ask_spread=0.05, update_cache=True, verbose=True, concurrent=False, book_max_age=None, price_source='order_book'):
         """
         Compute the option price using weighted prices from the order book or interpolation.
 
@@ -194,6 +495,8 @@ class MarketPricer(OptionPricer):
                     STRIKE -> strike price wanted eg. 200 (it can be a float 200.1)
                     K -> option type, eg. C (call) or P (put)
             Valid value: eg. BTC-20SEP23-30000-C
+            A ContractBatch is accepted too. One pricer may run compute_price from several threads
+            at once, the per-call state is kept per thread.
             
         future_spot : str, optional, default: 'future'
             Whether to use the future price ('future') or spot price ('spot') for the underlying asset.
@@ -201,7 +504,8 @@ class MarketPricer(OptionPricer):
 
         interpolation_method : str, optional, default: 'linear'
             The method to use for price interpolation if the option is not available in the order book.
-            Valid values: 'linear', 'cubic_spline'
+            All non-listed options of a call are interpolated together, fetching each neighbouring
+            listed book once. Valid values: 'linear', 'cubic_spline'
 
         bid_spread : float, optional, default: 0.05
             The spread to apply when calculating bid price if only the ask price is available.
@@ -211,24 +515,177 @@ class MarketPricer(OptionPricer):
             The spread to apply when calculating ask price if only the bid price is available.
             Must be a positive float value.
 
+        verbose : bool, optional, default: True
+            Log progress messages at INFO level (DEBUG otherwise) on the 'pricer.market_pricing' logger.
+            Stage timings, request counts and cache hit ratios go to the sink set with
+            pricer.metrics.set_metrics.
+
+        concurrent : bool, optional, default: False
+            Fetch the order books of all distinct listed instruments (and the spot prices when
+            future_spot='spot') in parallel before pricing, with at most `max_workers` requests
+            in flight. The returned prices are the same as in sequential mode.
+
+        book_max_age : float, optional, default: None
+            Staleness budget in seconds for order books cached by earlier calls. Within one call
+            every distinct instrument (including interpolation neighbours) is fetched at most once
+            regardless of this value; with None only books fetched during this call are reused.
+
+        price_source : str, optional, default: 'order_book'
+            Where bid and ask prices come from.
+            'order_book' walks the full order book of every instrument.
+            'top_of_book' uses the best bid/ask of the book summary, which is downloaded once per
+            underlying and refreshed when older than `summary_max_age`. The full order book is only
+            fetched when the quantity exceeds the top-of-book size (`top_of_book_quantity` when the
+            summary does not report it).
+            'mark' prices both sides at the summary mark price.
+            Interpolation neighbours are priced from the same source.
+
         Returns
         -------
-        price : float
-            The computed price for the option.
+        price_dic : PricingResult
+            Dict mapping each input option string to its [bid, ask] prices. Its `spot_quotes`
+            attribute holds the SpotQuote (price, source, age) of every spot price used.
 
         Raises
         ------
         NotImplementedError
             If method is not implemented yet.
         """
-        self._validate_inputs(option_data, future_spot, interpolation_method, bid_spread, ask_spread)
+        if isinstance(option_data, ContractBatch):
+            option_data = option_data.option_data()
+        self._validate_inputs(option_data, future_spot, interpolation_method, bid_spread, ask_spread, price_source)
     
-        price_dic = {}
-        for option_tuple in option_data:
-            price_dic[option_tuple[0]] = self._process_option(option_tuple, future_spot, interpolation_method, bid_spread, ask_spread, update_cache, verbose)
+        price_dic = PricingResult()
+        metrics = get_metrics()
+        with metrics.timer("compute_price"), self._pricing_cycle(book_max_age, price_source):
+            if concurrent:
+                self._prefetch_market_data(option_data, future_spot, update_cache, verbose)
+            pending = []
+            for option_tuple in option_data:
+                if self._is_listed(option_tuple[0], update_cache, interpolation_method):
+                    price_dic[option_tuple[0]] = self._process_option(option_tuple, future_spot, interpolation_method, bid_spread, ask_spread, verbose)
+                else:
+                    # Placeholder keeps the input order, non-listed options are interpolated together below
+                    price_dic[option_tuple[0]] = None
+                    pending.append(option_tuple)
+
+            if pending:
+                self._log(verbose, "%d options not available. Using interpolation method: %s...", len(pending), interpolation_method)
+                for option_tuple, price in zip(pending, self._interpolate_options(pending, future_spot, interpolation_method, bid_spread, ask_spread)):
+                    price_dic[option_tuple[0]] = price
+        metrics.increment("options_priced", len(option_data))
+        price_dic.spot_quotes = self._spot_quotes
 
         return price_dic
 
+    def compute_price_ladder(self, option_string, quantities, future_spot='future', bid_spread=0.05, ask_spread=0.05, book_max_age=None):
+        """
+        Compute the bid and ask prices of a listed option for a whole ladder of quantities.
+
+        The order book is fetched once and walked for every quantity in a single vectorized
+        call; quantities beyond the available depth are filled at the last level's price and
+        flagged. The walk arrays are cached with the book snapshot, so further ladders on the
+        same snapshot reuse them.
+
+        Parameters
+        ----------
+        option_string : str
+            The listed option to price, eg. BTC-20SEP23-30000-C
+
+        quantities : array_like of float
+            The positive quantities to price.
+
+        future_spot, bid_spread, ask_spread, book_max_age
+            As in compute_price.
+
+        Returns
+        -------
+        prices : dict
+            One array per key with one value per quantity: 'bid' and 'ask' prices, the
+            'bid_marginal' and 'ask_marginal' prices of the last unit filled, 'bid_slippage' and
+            'ask_slippage' as the cost relative to mid, 'bid_available' and 'ask_available' sizes,
+            and 'bid_insufficient' and 'ask_insufficient' when the book is thinner than the quantity.
+        """
+        self.parse_option_string(option_string)
+        self.input_string = option_string
+        with self._pricing_cycle(book_max_age):
+            order_book = self._fetch_option_book(option_string)
+            underlying_price = self._get_underlying_price(order_book, use_future_price=(future_spot == 'future'))
+
+        fills = self._array_order_book(option_string, order_book).fill(quantities)
+        bid, ask = fills['bid']['vwap'] * underlying_price, fills['ask']['vwap'] * underlying_price
+
+        # Same spreads as _handle_missing_prices when one side of the book is empty
+        if np.isnan(bid).all() and np.isnan(ask).all():
+            raise NotImplementedError("Bid and ask prices missing, interpolation or other methods not implemented yet.")
+        if np.isnan(bid).all():
+            bid = ask * (1 - bid_spread)
+        elif np.isnan(ask).all():
+            ask = bid * (1 + ask_spread)
+
+        prices = {'bid': bid, 'ask': ask}
+        for side, fill in fills.items():
+            prices[f'{side}_marginal'] = fill['marginal_price'] * underlying_price
+            prices[f'{side}_slippage'] = fill['slippage']
+            prices[f'{side}_available'] = fill['available']
+            prices[f'{side}_insufficient'] = fill['insufficient']
+        return prices
+
+    def compute_fill_curve(self, option_string, future_spot='future', book_max_age=None):
+        """
+        Compute the fill curve of both sides of a listed option's order book.
+
+        Parameters
+        ----------
+        option_string : str
+            The listed option, eg. BTC-20SEP23-30000-C
+
+        future_spot, book_max_age
+            As in compute_price.
+
+        Returns
+        -------
+        curve : dict
+            'mid' price, and 'bid' and 'ask' dicts with one array entry per price level: the
+            marginal 'price', 'size', cumulative 'available' size, 'vwap' of filling down to the
+            level and its 'slippage' relative to mid. Prices are in USD, sizes in contracts.
+        """
+        self.parse_option_string(option_string)
+        self.input_string = option_string
+        with self._pricing_cycle(book_max_age):
+            order_book = self._fetch_option_book(option_string)
+            underlying_price = self._get_underlying_price(order_book, use_future_price=(future_spot == 'future'))
+
+        array_book = self._array_order_book(option_string, order_book)
+        curve = {'mid': array_book.mid * underlying_price}
+        for side, levels in array_book.fill_curve().items():
+            # Copies: the cached curve stays shared by every later call on the same snapshot
+            curve[side] = {key: np.array(values) for key, values in levels.items()}
+            curve[side]['price'] *= underlying_price
+            curve[side]['vwap'] *= underlying_price
+        return curve
+
+    def _array_order_book(self, instrument_name, order_book):
+        # Books from book_cache keep their ArrayOrderBook with the snapshot; other sources build one per call
+        snapshot = self.book_cache.peek(instrument_name)
+        if snapshot is not None and snapshot.book is order_book:
+            return snapshot.array_book
+        return ArrayOrderBook.from_order_book(order_book)
+
+    @contextmanager
+    def _pricing_cycle(self, book_max_age, price_source='order_book'):
+        # Scope of book reuse (see book_cache), of the price source and of the spot quotes reported on the result
+        self._spot_quotes = {}
+        self.book_max_age = book_max_age
+        self.price_source = price_source
+        self._cycle_started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.book_max_age = None
+            self.price_source = 'order_book'
+            self._cycle_started = None
+
 
 if __name__ == "__main__":
     price = MarketPricer(input_string='BTC-29MAY23-28000-C', quantity=10, verbose=True)
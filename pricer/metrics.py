@@ -0,0 +1,147 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class NullMetrics:
+    """Metrics sink that drops everything; the default, so instrumentation is nearly free when disabled."""
+
+    enabled = False
+
+    def timer(self, stage, **labels):
+        return _NULL_TIMER
+
+    def increment(self, name, value=1, **labels):
+        pass
+
+    def observe(self, name, value, **labels):
+        pass
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class InMemoryMetrics(NullMetrics):
+    """Thread-safe in-memory collector of counters and timings, keyed by name and labels.
+
+    Timings of the pricing stages go to the 'stage_seconds' observation with a `stage` label;
+    observations keep their count, sum and max.
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.observations = {}
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    @contextmanager
+    def timer(self, stage, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("stage_seconds", time.perf_counter() - start, stage=stage, **labels)
+
+    def increment(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            count, total, maximum = self.observations.get(key, (0, 0.0, value))
+            self.observations[key] = (count + 1, total + value, max(maximum, value))
+
+    def counter(self, name, **labels):
+        with self._lock:
+            return self.counters.get(self._key(name, labels), 0)
+
+    def stage(self, stage, **labels):
+        # (count, total seconds, max seconds) of one pricing stage, summed over the label sets matching labels
+        wanted = set(labels.items()) | {("stage", stage)}
+        count, total, maximum = 0, 0.0, 0.0
+        with self._lock:
+            for (name, key_labels), (n, seconds, longest) in self.observations.items():
+                if name == "stage_seconds" and wanted <= set(key_labels):
+                    count, total, maximum = count + n, total + seconds, max(maximum, longest)
+        return count, total, maximum
+
+    def cache_hit_ratio(self, cache):
+        hits = self.counter("cache_requests", cache=cache, result="hit")
+        misses = self.counter("cache_requests", cache=cache, result="miss")
+        return hits / (hits + misses) if hits + misses else None
+
+    def clear(self):
+        with self._lock:
+            self.counters.clear()
+            self.observations.clear()
+
+    def to_prometheus(self, namespace="pricer"):
+        """Render the collected metrics in the Prometheus text exposition format."""
+        with self._lock:
+            counters = sorted(self.counters.items())
+            observations = sorted(self.observations.items())
+
+        lines = []
+        declared = set()
+        for (name, labels), value in counters:
+            metric = f"{namespace}_{name}_total"
+            if metric not in declared:
+                declared.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{_format_labels(labels)} {value}")
+        for (name, labels), (count, total, maximum) in observations:
+            metric = f"{namespace}_{name}"
+            if metric not in declared:
+                declared.add(metric)
+                lines.append(f"# TYPE {metric} summary")
+            lines.append(f"{metric}_count{_format_labels(labels)} {count}")
+            lines.append(f"{metric}_sum{_format_labels(labels)} {total!r}")
+            lines.append(f"{metric}_max{_format_labels(labels)} {maximum!r}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + "}"
+
+
+_sink = NullMetrics()
+
+
+def get_metrics():
+    return _sink
+
+
+def set_metrics(sink):
+    """Install the process-wide metrics sink (None disables metrics) and return it."""
+    global _sink
+    _sink = sink if sink is not None else NullMetrics()
+    return _sink
+
+
+def response_size(response):
+    # Body size in bytes when the response exposes it (test doubles may not)
+    content = getattr(response, "content", None)
+    return len(content) if isinstance(content, (bytes, bytearray, str)) else 0
+
+
+def endpoint_of(url):
+    # Last path segment, eg. 'get_order_book'
+    return url.split("?", 1)[0].rstrip("/").rsplit("/", 1)[-1]
@@ -0,0 +1,215 @@
+import math
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .option_pricer import OptionPricer
+
+
+class GeometricBrownianMotion:
+    """Lognormal dynamics with constant volatility, simulated exactly on the time grid."""
+
+    def __init__(self, volatility):
+        if volatility <= 0:
+            raise ValueError("Volatility must be positive.")
+        self.volatility = volatility
+
+    def log_paths(self, spot, drift, dt, z):
+        increments = (drift - 0.5 * self.volatility ** 2) * dt + self.volatility * math.sqrt(dt) * z
+        log_paths = np.empty((z.shape[0], z.shape[1] + 1))
+        log_paths[:, 0] = math.log(spot)
+        np.cumsum(increments, axis=1, out=log_paths[:, 1:])
+        log_paths[:, 1:] += log_paths[:, :1]
+        return log_paths
+
+
+class VolatilityFunctionDynamics:
+    """Log-Euler dynamics with a user-supplied volatility `volatility_function(spot, t)`.
+
+    The function receives the spot of every path at time t (years) and returns the
+    volatilities as an array; it must be picklable (a module-level function) to run in
+    a process pool.
+    """
+
+    def __init__(self, volatility_function):
+        self.volatility_function = volatility_function
+
+    def log_paths(self, spot, drift, dt, z):
+        log_paths = np.empty((z.shape[0], z.shape[1] + 1))
+        log_paths[:, 0] = math.log(spot)
+        for step in range(z.shape[1]):
+            volatility = np.asarray(self.volatility_function(np.exp(log_paths[:, step]), step * dt), dtype=float)
+            log_paths[:, step + 1] = log_paths[:, step] + (drift - 0.5 * volatility ** 2) * dt + volatility * math.sqrt(dt) * z[:, step]
+        return log_paths
+
+
+class EuropeanPayoff:
+    def __init__(self, strike, is_call=True):
+        self.strike = strike
+        self.is_call = is_call
+
+    def __call__(self, paths):
+        sign = 1.0 if self.is_call else -1.0
+        return np.maximum(sign * (paths[:, -1] - self.strike), 0.0)
+
+
+class AsianPayoff:
+    """Arithmetic average-price option, averaging the simulated prices after the start date."""
+
+    def __init__(self, strike, is_call=True):
+        self.strike = strike
+        self.is_call = is_call
+
+    def __call__(self, paths):
+        sign = 1.0 if self.is_call else -1.0
+        return np.maximum(sign * (paths[:, 1:].mean(axis=1) - self.strike), 0.0)
+
+
+class BarrierPayoff:
+    """Knock-out option on the discretely monitored path: worthless once the barrier is touched."""
+
+    def __init__(self, strike, barrier, is_call=True):
+        self.strike = strike
+        self.barrier = barrier
+        self.is_call = is_call
+
+    def __call__(self, paths):
+        sign = 1.0 if self.is_call else -1.0
+        spot = paths[:, 0:1]
+        # Up-and-out above the starting spot, down-and-out below it
+        knocked_out = np.where(self.barrier > spot, paths >= self.barrier, paths <= self.barrier).any(axis=1)
+        return np.where(knocked_out, 0.0, np.maximum(sign * (paths[:, -1] - self.strike), 0.0))
+
+
+def _simulate_block(dynamics, payoff, spot, drift, time_to_expiry, n_steps, n_paths, seed):
+    # Sufficient statistics of one block of antithetic pairs: n, sums of y, x, x^2, x*y, y^2,
+    # with y the pair-averaged payoff and x the pair-averaged terminal price (the control variate)
+    rng = np.random.default_rng(seed)
+    half = n_paths // 2
+    z = rng.standard_normal((half, n_steps))
+    z = np.concatenate((z, -z))
+    paths = np.exp(dynamics.log_paths(spot, drift, time_to_expiry / n_steps, z))
+
+    y = np.asarray(payoff(paths), dtype=float)
+    y = 0.5 * (y[:half] + y[half:])
+    x = 0.5 * (paths[:half, -1] + paths[half:, -1])
+    return np.array([half, y.sum(), x.sum(), x @ x, x @ y, y @ y])
+
+
+class MonteCarloPricer(OptionPricer):
+    """Monte Carlo pricer simulating blocks of antithetic paths, serially or on a process pool.
+
+    The pool of n_workers processes is started on the first pooled compute_price and reused by
+    the following ones; close() it, or use the pricer as a context manager, when done.
+    """
+
+    def __init__(self, n_paths=100000, steps_per_year=365, chunk_size=10000, n_workers=None, seed=None):
+        super().__init__()
+        self.n_paths = n_paths
+        self.steps_per_year = steps_per_year
+        # Paths per block: memory is bounded by chunk_size * (n_steps + 1) floats per worker
+        self.chunk_size = chunk_size
+        self.n_workers = n_workers if n_workers is not None else os.cpu_count()
+        self.seed = seed
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def _pool(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.n_workers)
+            return self._executor
+
+    def _run_blocks(self, arguments):
+        if self.n_workers <= 1 or len(arguments) == 1:
+            return [_simulate_block(*block) for block in arguments]
+        return list(self._pool().map(_simulate_block, *zip(*arguments)))
+
+    def close(self):
+        # Shut the process pool down; a later pooled compute_price starts a new one
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+    def compute_price(self, payoff, spot, time_to_expiry, dynamics, interest_rate=0.0, control_variate=True):
+        """
+        Price a (possibly path-dependent) payoff by Monte Carlo simulation.
+
+        Paths are generated in blocks of chunk_size antithetic paths, spread over a process pool
+        of n_workers. Every block draws from its own child of SeedSequence(seed), so a given seed
+        gives the same price whatever the number of workers.
+
+        Parameters
+        ----------
+        payoff : callable
+            Maps simulated prices of shape (n_paths, n_steps + 1) to the payoff of each path,
+            eg. EuropeanPayoff, AsianPayoff or BarrierPayoff. Must be picklable when n_workers > 1.
+
+        spot : float
+            Underlying price today, in the currency of the payoff.
+
+        time_to_expiry : float
+            Years to expiry.
+
+        dynamics : GeometricBrownianMotion or VolatilityFunctionDynamics
+            Model of the underlying under the risk-neutral measure (drift = interest_rate).
+
+        interest_rate : float, optional, default: 0.0
+            Continuously compounded risk-free rate.
+
+        control_variate : bool, optional, default: True
+            Regress the payoff on the terminal price, whose expectation is the forward.
+
+        Returns
+        -------
+        result : dict
+            'price', its 'standard_error' and the number of simulated 'n_paths' (n_paths rounded up
+            to an even number of at least 4).
+        """
+        if spot <= 0:
+            raise ValueError("Spot price must be positive.")
+        if time_to_expiry <= 0:
+            raise ValueError("Time to expiry must be positive.")
+        if interest_rate < 0:
+            raise ValueError("Interest rate must be non-negative.")
+
+        n_steps = max(1, int(math.ceil(time_to_expiry * self.steps_per_year)))
+        # Whole antithetic pairs in every block, and at least two pairs for the standard error
+        chunk_size = max(2, self.chunk_size - self.chunk_size % 2)
+        n_paths = max(4, self.n_paths + self.n_paths % 2)
+        n_blocks = int(math.ceil(n_paths / chunk_size))
+        # Full blocks, the last one holding what is left
+        block_sizes = [chunk_size] * (n_blocks - 1) + [n_paths - (n_blocks - 1) * chunk_size]
+        seeds = np.random.SeedSequence(self.seed).spawn(n_blocks)
+        arguments = [(dynamics, payoff, spot, interest_rate, time_to_expiry, n_steps, size, seed)
+                     for size, seed in zip(block_sizes, seeds)]
+
+        n, sum_y, sum_x, sum_xx, sum_xy, sum_yy = np.sum(self._run_blocks(arguments), axis=0)
+        mean_y, mean_x = sum_y / n, sum_x / n
+        var_y = (sum_yy - n * mean_y ** 2) / (n - 1)
+        var_x = (sum_xx - n * mean_x ** 2) / (n - 1)
+        cov_xy = (sum_xy - n * mean_x * mean_y) / (n - 1)
+
+        estimate, variance = mean_y, var_y
+        if control_variate and var_x > 0:
+            beta = cov_xy / var_x
+            forward = spot * math.exp(interest_rate * time_to_expiry)
+            estimate = mean_y - beta * (mean_x - forward)
+            variance = max(var_y - cov_xy ** 2 / var_x, 0.0)
+
+        discount = math.exp(-interest_rate * time_to_expiry)
+        return {
+            "price": discount * estimate,
+            "standard_error": discount * math.sqrt(variance / n),
+            "n_paths": int(2 * n),
+        }
@@ -1,148 +1,285 @@
-from datetime import datetime
+import numpy as np
+from .instrument_index import InstrumentIndex, bracket_strikes
+from .contracts import OptionContract
+from .implied_volatility import black76, implied_volatility
+from .metrics import get_metrics
+from .order_book import ArrayOrderBook
+from .utils import parse_contract, year_fraction, year_fractions
+from .volatility_smile import fit_variance_smiles
+
 class OptionInterpolator:
+    # Variance smiles per underlying, with the instruments cache timestamp they were fitted from
+    smile_cache = {}
+
     def __init__(self, data_source, market_pricer):
-        self.data_source = data_source
+        # data_source is the InstrumentIndex of the underlying (a list of names is indexed here)
+        self.data_source = data_source if isinstance(data_source, InstrumentIndex) else InstrumentIndex(data_source)
         self.market_pricer = market_pricer
 
-    def _extract_expiry_strike_data(self):
-        expiry_strike_data = {}
-        for instrument_name in self.data_source:
-            expiry, strike = self._parse_instrument_name(instrument_name)
-            if expiry not in expiry_strike_data:
-                expiry_strike_data[expiry] = []
-            expiry_strike_data[expiry].append(strike)
-        return expiry_strike_data
-    
-    def _parse_instrument_name(self, instrument_name):
-        instrument_data = instrument_name.split('-')
-        strike = float(instrument_data[2])
-        expiry = instrument_data[1]
-        
-        return expiry, strike
-    
-    def _find_nearest_lower_upper_expiry(self, data, target):
-        date_format = "%d%b%y"
-        target_date = datetime.strptime(target, date_format)
-        lower = None
-        upper = None
-
-        for date_str in data:
-            date = datetime.strptime(date_str, date_format)
-
-            if date <= target_date:
-                if lower is None or date > datetime.strptime(lower, date_format):
-                    lower = date_str
-            elif date > target_date:
-                if upper is None or date < datetime.strptime(upper, date_format):
-                    upper = date_str
-
-        return lower, upper
-    
-    def _find_nearest_lower_upper_strike(self, expiry_strike_data, target_strike):
-        strike_data = sorted(expiry_strike_data)
-        n = len(strike_data)
-        lower = None
-        upper = None
-        
-        # Check if target_strike is outside the strike range
-        if target_strike <= strike_data[0]:
-            return None, strike_data[0]
-        elif target_strike >= strike_data[-1]:
-            return strike_data[-1], None
-        
-        # Binary search for the nearest lower and upper strikes
-        left = 0
-        right = n - 1
-        while left <= right:
-            mid = (left + right) // 2
-            if strike_data[mid] == target_strike:
-                return target_strike, target_strike
-            elif strike_data[mid] < target_strike:
-                lower = strike_data[mid]
-                left = mid + 1
-            else:
-                upper = strike_data[mid]
-                right = mid - 1
-        
-        return lower, upper
-
-    def _interpolate_strike_price(self, expiry_strike_data, expiry, target_strike, target_instrument, target_quantity, skip_handle_missing_prices=False):
-        market_pricer = self.market_pricer
-        strike_data = expiry_strike_data[expiry]
-        lower_strike, upper_strike = self._find_nearest_lower_upper_strike(strike_data, target_strike)
+    def _contract_name(self, expiry, strike, option_kind):
+        return OptionContract(self.market_pricer.option_underlying, expiry, strike, option_kind == 'C').name
+
+    def _neighbour_prices(self, books, names, quantities, bid_spread, ask_spread):
+        # Bid/ask (in units of the underlying) and forward of each neighbour contract, at the quantity of its target
+        bid = np.full(len(names), np.nan)
+        ask = np.full(len(names), np.nan)
+        forward = np.full(len(names), np.nan)
+        for name in set(names):
+            rows = names == name
+            book = ArrayOrderBook.from_order_book(books[name])
+            bid[rows], ask[rows] = book.weighted_prices(quantities[rows])
+            if book.underlying_price is not None:
+                forward[rows] = book.underlying_price
 
-        if lower_strike == upper_strike:
-            contract = '-'.join(target_instrument.split('-')[:2] + [str(lower_strike)] + target_instrument.split('-')[3:])
-            data = market_pricer._fetch_option_book(contract)
-            bid = market_pricer.calculate_price_if_available(data['bids'], target_quantity)
-            ask = market_pricer.calculate_price_if_available(data['asks'], target_quantity)
-            bid, ask = market_pricer._handle_missing_prices(bid,ask)
-            return {'bid': bid, 'ask': ask}
+        # Same spreads as MarketPricer._handle_missing_prices for a one-sided book
+        bid = np.where(np.isnan(bid), ask * (1 - bid_spread), bid)
+        ask = np.where(np.isnan(ask), bid * (1 + ask_spread), ask)
+        return bid, ask, forward
 
-        target_instrument = target_instrument.split('-')
+    def _slice_prices(self, slices, strikes, option_kinds, quantities, bid_spread, ask_spread):
+        # Strike-interpolated prices of every target in its lower and upper expiry slices,
+        # bracketing all targets first so that each neighbour book is fetched once
+        index = self.data_source
+        plans = []
+        needed = set()
+        for leg, positions in slices.items():
+            for position in np.unique(positions):
+                slice_expiry = index.expiries[position]
+                for option_kind in ('C', 'P'):
+                    rows = np.flatnonzero((positions == position) & (option_kinds == option_kind))
+                    listed = index.strikes_for(slice_expiry, option_kind)
+                    if len(rows) == 0 or len(listed) == 0:
+                        continue
+                    lower, upper, weight = bracket_strikes(listed, strikes[rows])
+                    lower_names = np.array([self._contract_name(slice_expiry, strike, option_kind) for strike in listed[lower]])
+                    upper_names = np.array([self._contract_name(slice_expiry, strike, option_kind) for strike in listed[upper]])
+                    needed.update(lower_names.tolist())
+                    needed.update(upper_names.tolist())
+                    plans.append((leg, rows, lower_names, upper_names, weight))
 
-        target_instrument[2] = str(lower_strike)
-        contract_lower = '-'.join(target_instrument)
+        books = self.market_pricer._fetch_option_books(sorted(needed))
 
-        target_instrument[2] = str(upper_strike)
-        contract_upper = '-'.join(target_instrument)
+        prices = {leg: {field: np.full(len(strikes), np.nan) for field in ('bid', 'ask', 'forward')} for leg in slices}
+        for leg, rows, lower_names, upper_names, weight in plans:
+            lower_prices = self._neighbour_prices(books, lower_names, quantities[rows], bid_spread, ask_spread)
+            upper_prices = self._neighbour_prices(books, upper_names, quantities[rows], bid_spread, ask_spread)
+            for field, lower_price, upper_price in zip(('bid', 'ask', 'forward'), lower_prices, upper_prices):
+                prices[leg][field][rows] = _blend(lower_price, upper_price, weight)
+        return prices
 
-        lower_data = market_pricer._fetch_option_book(contract_lower)
-        upper_data = market_pricer._fetch_option_book(contract_upper)
+    def _calendar_price(self, lower_price, upper_price, lower_forward, upper_forward, forward, strikes, is_call, times, weight):
+        t, t_lower, t_upper = times
+        # Total implied variance of each slice, NaN where the quote cannot be inverted
+        with np.errstate(invalid='ignore', divide='ignore'):
+            lower_variance = implied_volatility(lower_price * lower_forward, lower_forward, strikes, t_lower, is_call) ** 2 * t_lower
+            upper_variance = implied_volatility(upper_price * upper_forward, upper_forward, strikes, t_upper, is_call) ** 2 * t_upper
 
-        lower_bid = market_pricer.calculate_price_if_available(lower_data['bids'], target_quantity)
-        lower_ask = market_pricer.calculate_price_if_available(lower_data['asks'], target_quantity)
-        upper_bid = market_pricer.calculate_price_if_available(upper_data['bids'], target_quantity)
-        upper_ask = market_pricer.calculate_price_if_available(upper_data['asks'], target_quantity)
+            # Linear in time between slices; a single slice (or a target beyond the listed expiries) keeps its implied vol
+            variance = (1 - weight) * lower_variance + weight * upper_variance
+            single = np.where(np.isnan(lower_variance), upper_variance / t_upper, lower_variance / t_lower) * t
+            variance = np.where(np.isnan(variance) | (t_lower == t_upper), single, variance)
+            price = black76(forward, strikes, t, np.sqrt(variance / t), is_call) / forward
 
-        if not skip_handle_missing_prices:
-            lower_bid, lower_ask = market_pricer._handle_missing_prices(lower_bid, lower_ask, fallback_method=lambda: self._interpolate_strike_price( expiry_strike_data, expiry, target_strike, target_instrument, target_quantity, skip_handle_missing_prices=True ))
-            upper_bid, upper_ask = market_pricer._handle_missing_prices(upper_bid, upper_ask, fallback_method=lambda: self._interpolate_strike_price( expiry_strike_data, expiry, target_strike, target_instrument, target_quantity, skip_handle_missing_prices=True ))
+        # Quotes without an implied vol fall back to interpolating the price itself
+        return np.where(np.isnan(price), _blend(lower_price, upper_price, weight), price)
 
+    def _linear_batch(self, expiries, strikes, option_kinds, quantities, use_future_price, bid_spread, ask_spread):
+        index = self.data_source
+        if not index.expiries:
+            raise ValueError("No listed expiry to interpolate from.")
 
-        if lower_bid is None and lower_ask is None and upper_bid is None and upper_ask is None:
+        # Calendar brackets and year fractions from the expiry table of the index, one lookup per distinct expiry
+        codes, position = np.unique(expiries, return_inverse=True)
+        lower, upper, weight = (values[position] for values in index.bracket_expiries(codes.tolist()))
+        listed = np.isin(expiries, index.expiries)
+        expiry_times = index.expiry_times()
+        times = (year_fractions(expiries), expiry_times[lower], expiry_times[upper])
+        is_call = option_kinds == 'C'
+
+        prices = self._slice_prices({'lower': lower, 'upper': upper}, strikes, option_kinds, quantities, bid_spread, ask_spread)
+        lower_prices, upper_prices = prices['lower'], prices['upper']
+        forward = _blend(lower_prices['forward'], upper_prices['forward'], weight)
+
+        result = {}
+        for side in ('bid', 'ask'):
+            price = self._calendar_price(lower_prices[side], upper_prices[side], lower_prices['forward'], upper_prices['forward'],
+                                         forward, strikes, is_call, times, weight)
+            # Listed expiries keep the strike-interpolated quotes
+            result[side] = np.where(listed, lower_prices[side], price)
+
+        if np.any(np.isnan(result['bid']) & np.isnan(result['ask'])):
             raise NotImplementedError("Bid and ask prices missing, theoretical valuation not implemented yet.")
 
-        if lower_bid is None and lower_ask is None:
-            interpolated_bid = upper_bid
-            interpolated_ask = upper_ask
-        elif upper_bid is None and upper_ask is None:
-            interpolated_bid = lower_bid
-            interpolated_ask = lower_ask
-        else:
-            interpolated_bid = self._interpolate_value(lower_strike, lower_bid, upper_strike, upper_bid, target_strike)
-            interpolated_ask = self._interpolate_value(lower_strike, lower_ask, upper_strike, upper_ask, target_strike)
+        # Convert to the quote currency with the forward of the target expiry, or the spot price
+        underlying_price = forward
+        if not use_future_price or np.isnan(forward).any():
+            spot = self.market_pricer._fetch_spot_price()
+            underlying_price = np.where(use_future_price & ~np.isnan(forward), forward, spot)
+        return {'bid': result['bid'] * underlying_price, 'ask': result['ask'] * underlying_price}
+
+    def neighbours(self, option_data):
+        # Listed contracts read by the linear interpolation of each target, one set per target
+        index = self.data_source
+        if not index.expiries:
+            return [set() for _ in option_data]
+        contracts = [parse_contract(option_string) for option_string, _ in option_data]
+        lower, upper, _ = index.bracket_expiries([contract[1] for contract in contracts])
+
+        neighbours = []
+        for (_, _, strike, is_call), lower_position, upper_position in zip(contracts, lower, upper):
+            option_kind = 'C' if is_call else 'P'
+            names = set()
+            for position in {int(lower_position), int(upper_position)}:
+                expiry = index.expiries[position]
+                listed = index.strikes_for(expiry, option_kind)
+                if len(listed):
+                    lower_strike, upper_strike, _ = bracket_strikes(listed, [strike])
+                    names.add(self._contract_name(expiry, listed[lower_strike[0]], option_kind))
+                    names.add(self._contract_name(expiry, listed[upper_strike[0]], option_kind))
+            neighbours.append(names)
+        return neighbours
+
+    def interpolate_batch(self, option_data, method='linear', use_future_price=True, bid_spread=0.05, ask_spread=0.05):
+        """
+        Interpolate the prices of many non-listed options of this underlying at once.
+
+        Targets are grouped by expiry and option kind. With the linear method the neighbouring
+        listed contracts of all targets are fetched once each, with up to max_workers requests in
+        flight, and every target is interpolated in one vectorized pass over strikes and expiries.
+
+        Parameters
+        ----------
+        option_data : list of tpl [(input_opt, quantity)]
+            Same format as MarketPricer.compute_price.
+
+        method : str, optional, default: 'linear'
+            'linear' or 'cubic_spline'.
+
+        Returns
+        -------
+        prices : dict
+            {'bid': ndarray, 'ask': ndarray} aligned with option_data.
+        """
+        metrics = get_metrics()
+        with metrics.timer("interpolation", method=method):
+            prices = self._interpolate_batch(option_data, method, use_future_price, bid_spread, ask_spread)
+        metrics.increment("options_interpolated", len(option_data), method=method)
+        return prices
 
-        return {'bid': interpolated_bid, 'ask': interpolated_ask}
+    def _interpolate_batch(self, option_data, method, use_future_price, bid_spread, ask_spread):
+        contracts = [parse_contract(option_string) for option_string, _ in option_data]
+        expiries = np.array([contract[1] for contract in contracts])
+        strikes = np.array([contract[2] for contract in contracts], dtype=float)
+        option_kinds = np.array(['C' if contract[3] else 'P' for contract in contracts])
+        quantities = np.array([quantity for _, quantity in option_data], dtype=float)
 
-    def _interpolate_value(self, strike1, price1, strike2, price2, target_strike):
-        if strike1 == strike2:
-            return price1
-        return price1 + (target_strike - strike1) * (price2 - price1) / (strike2 - strike1)
-    
-    def linear_interpolation(self, target_strike, target_expiry):
-        expiry_strike_data = self._extract_expiry_strike_data()
-        
-        # Find the nearest lower and upper expiries
-        lower_expiry, upper_expiry = self._find_nearest_lower_upper_expiry(list(expiry_strike_data.keys()), target_expiry)
+        if method == 'linear':
+            return self._linear_batch(expiries, strikes, option_kinds, quantities, use_future_price, bid_spread, ask_spread)
+        if method != 'cubic_spline':
+            raise ValueError(f"Unsupported interpolation method: {method}")
+
+        bid = np.full(len(option_data), np.nan)
+        ask = np.full(len(option_data), np.nan)
+        for expiry, option_kind in set(zip(expiries.tolist(), option_kinds.tolist())):
+            rows = (expiries == expiry) & (option_kinds == option_kind)
+            price = self.cubic_spline_interpolation(strikes[rows], expiry, option_kind, use_future_price, bid_spread, ask_spread)
+            bid[rows], ask[rows] = price['bid'], price['ask']
+        return {'bid': bid, 'ask': ask}
+
+    def linear_interpolation(self, target_strike, target_expiry, target_quantity=1.0, option_kind=None, use_future_price=True, bid_spread=0.05, ask_spread=0.05):
+        option_kind = option_kind or ('C' if self.market_pricer.option_type == 'call' else 'P')
+        price = self._linear_batch(np.array([target_expiry]), np.array([float(target_strike)]), np.array([option_kind]),
+                                   np.array([float(target_quantity)]), use_future_price, bid_spread, ask_spread)
+        return {'bid': float(price['bid'][0]), 'ask': float(price['ask'][0])}
 
-        # Perform interpolation for each expiry
-        lower_expiry_interpolated_price = self._interpolate_strike_price(expiry_strike_data, lower_expiry, target_strike)
-        upper_expiry_interpolated_price = self._interpolate_strike_price(expiry_strike_data, upper_expiry, target_strike)
+    def _variance_smiles(self):
+        # One spline fit per expiry slice, reused until the book summary is refreshed
+        market_pricer = self.market_pricer
+        underlying = market_pricer.option_underlying
+        cache_entry = market_pricer.instruments_cache[underlying]
+        cached = self.smile_cache.get(underlying)
+        hit = cached is not None and cached[0] == cache_entry["timestamp"]
+        metrics = get_metrics()
+        if metrics.enabled:
+            metrics.increment("cache_requests", cache="smile", result="hit" if hit else "miss")
+        if hit:
+            return cached[1]
+
+        smiles = fit_variance_smiles(cache_entry["summary"])
+        self.smile_cache[underlying] = (cache_entry["timestamp"], smiles)
+        return smiles
 
-        # Perform interpolation between the lower and upper expiries to get the final interpolated price
-        interpolated_price = self._interpolate_value(lower_expiry, lower_expiry_interpolated_price, upper_expiry, upper_expiry_interpolated_price, target_expiry)
+    def _smile_prices(self, smiles, side, strikes, target_expiry, is_call):
+        # Prices in units of the underlying and the forward of the target expiry
+        if target_expiry in smiles:
+            smile = smiles[target_expiry]
+            return smile.price(side, strikes, is_call), smile.forward
 
-        return interpolated_price
+        # Non-listed expiry: total variance linear in time at constant log-moneyness
+        fitted = sorted(smiles.values(), key=lambda smile: smile.time_to_expiry)
+        if not fitted:
+            raise ValueError("No expiry slice available for cubic spline interpolation.")
+        t = year_fraction(target_expiry)
+        if t <= 0:
+            raise ValueError(f"Expiry {target_expiry} is in the past.")
+        lower = [smile for smile in fitted if smile.time_to_expiry <= t]
+        upper = [smile for smile in fitted if smile.time_to_expiry > t]
+        lower = lower[-1] if lower else None
+        upper = upper[0] if upper else None
+
+        if lower is None or upper is None:
+            # Beyond the listed expiries: keep the implied vol of the nearest slice
+            smile = lower or upper
+            forward = smile.forward
+            variance = smile.total_variance(side, strikes) * t / smile.time_to_expiry
+        else:
+            weight = (t - lower.time_to_expiry) / (upper.time_to_expiry - lower.time_to_expiry)
+            forward = lower.forward + weight * (upper.forward - lower.forward)
+            moneyness = strikes / forward
+            variance = (
+                (1 - weight) * lower.total_variance(side, moneyness * lower.forward)
+                + weight * upper.total_variance(side, moneyness * upper.forward)
+            )
+        return black76(forward, strikes, t, np.sqrt(variance / t), is_call) / forward, forward
 
-    def cubic_spline_interpolation(self, target_strike, target_expiry):
-        # Implement cubic spline interpolation using self.data_source
-        pass
+    def cubic_spline_interpolation(self, target_strike, target_expiry, option_kind=None, use_future_price=True, bid_spread=0.05, ask_spread=0.05):
+        """
+        Price non-listed strikes from cubic splines of total implied variance fitted on the book summary.
 
-    def interpolate_option_price(self, target_strike, target_expiry, method='linear'):
+        target_strike may be a scalar or an array of strikes of the same expiry, which are all
+        evaluated at once. No order book is fetched: the smiles are fitted once per expiry from the
+        summary bid/ask quotes, so the target quantity does not affect the price.
+        """
+        market_pricer = self.market_pricer
+        option_kind = option_kind or ('C' if market_pricer.option_type == 'call' else 'P')
+        strikes = np.atleast_1d(np.asarray(target_strike, dtype=float))
+        smiles = self._variance_smiles()
+
+        bid, forward = self._smile_prices(smiles, 'bid', strikes, target_expiry, option_kind == 'C')
+        ask, _ = self._smile_prices(smiles, 'ask', strikes, target_expiry, option_kind == 'C')
+        if np.isnan(bid).all() and np.isnan(ask).all():
+            raise NotImplementedError("Bid and ask prices missing, theoretical valuation not implemented yet.")
+        # Same spreads as MarketPricer._handle_missing_prices for a side without quotes
+        bid = np.where(np.isnan(bid), ask * (1 - bid_spread), bid)
+        ask = np.where(np.isnan(ask), bid * (1 + ask_spread), ask)
+
+        underlying_price = market_pricer._get_underlying_price({'underlying_price': forward}, use_future_price)
+        bid, ask = bid * underlying_price, ask * underlying_price
+        if np.ndim(target_strike) == 0:
+            return {'bid': float(bid[0]), 'ask': float(ask[0])}
+        return {'bid': bid, 'ask': ask}
+
+    def interpolate_option_price(self, target_strike, target_expiry, target_quantity=1.0, method='linear', **kwargs):
         if method == 'linear':
-            return self.linear_interpolation(target_strike, target_expiry)
+            return self.linear_interpolation(target_strike, target_expiry, target_quantity, **kwargs)
         elif method == 'cubic_spline':
-            return self.cubic_spline_interpolation(target_strike, target_expiry)
+            return self.cubic_spline_interpolation(target_strike, target_expiry, **kwargs)
         else:
             raise ValueError(f"Unsupported interpolation method: {method}")
+
+
+def _blend(lower, upper, weight):
+    # Linear interpolation between neighbours, falling back to the one that has a price
+    blended = (1 - weight) * lower + weight * upper
+    blended = np.where(np.isnan(lower), upper, blended)
+    return np.where(np.isnan(upper), lower, blended)
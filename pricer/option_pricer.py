@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
-import re
+
+from .contracts import OptionContract
 
 class OptionPricer(ABC):
     def __init__(self):
@@ -39,24 +40,19 @@ class OptionPricer(ABC):
             raise ValueError("Quantity must be positive.")
     
     def parse_option_string(self, option_string, quantity=1, interest_rate=None):
-        pattern = r'([A-Za-z]+)-(\d{2}[A-Za-z]{3}\d{2})-(\d+\.?\d*)-([CP])'
-        match = re.match(pattern, option_string)
-        
-        if match:
-            asset, date_str, strike_str, option_kind = match.groups()
-            strike = float(strike_str)
-            asset = asset.upper()
-            expiration_date = datetime.strptime(date_str, "%d%b%y")
-            time_to_expiry = (expiration_date - datetime.now()).days
-            option_type = "call" if option_kind == "C" else "put"
-            
-            self.initialize_parameters(strike=strike, time_to_expiry=time_to_expiry,
-                                    option_type=option_type, underlying=asset, quantity=quantity, interest_rate=interest_rate)
-
-            return asset, date_str, strike, option_type, time_to_expiry
-        else:
+        # Memoized parse, see OptionContract.from_string
+        try:
+            contract = OptionContract.from_string(option_string)
+        except ValueError:
             raise ValueError("Invalid option string format.")
 
+        time_to_expiry = (contract.expiry_date - datetime.now()).days
+        option_type = "call" if contract.is_call else "put"
+        self.initialize_parameters(strike=contract.strike, time_to_expiry=time_to_expiry,
+                                option_type=option_type, underlying=contract.underlying, quantity=quantity, interest_rate=interest_rate)
+
+        return contract.underlying, contract.expiry, contract.strike, option_type, time_to_expiry
+
     # The compute_price method must be implemented by all derived classes
     @abstractmethod
     def compute_price(self, *args, **kwargs):
@@ -0,0 +1,123 @@
+import numpy as np
+
+
+class BookSide:
+    """One side of an order book as contiguous price/size arrays with cumulative depth."""
+
+    def __init__(self, levels):
+        levels = np.asarray(levels, dtype=float).reshape(-1, 2)
+        self.prices = np.ascontiguousarray(levels[:, 0])
+        self.sizes = np.ascontiguousarray(levels[:, 1])
+        self.cum_size = np.cumsum(self.sizes)
+        self.cum_notional = np.cumsum(self.prices * self.sizes)
+        # Average price of filling the book down to each level
+        self.level_vwap = self.cum_notional / self.cum_size if len(self.prices) else self.cum_notional
+        # Shared by every user of a cached book: read-only so that no caller can alter it
+        for array in (self.prices, self.sizes, self.cum_size, self.cum_notional, self.level_vwap):
+            array.flags.writeable = False
+
+    def __len__(self):
+        return len(self.prices)
+
+    @property
+    def depth(self):
+        return self.cum_size[-1] if len(self) else 0.0
+
+    def vwap(self, quantities):
+        """Average fill price for each target quantity when walking the book from the top.
+
+        Like MarketPricer._weighted_price, the part of a quantity larger than the whole
+        book is filled at the last level's price. Returns NaN for an empty side.
+        """
+        return self.fill(quantities)[0]
+
+    def fill(self, quantities):
+        # (vwap, marginal price, available size) per quantity; beyond the depth the last level's price extends
+        quantities = np.asarray(quantities, dtype=float)
+        n = len(self)
+        if n == 0:
+            return np.full(quantities.shape, np.nan), np.full(quantities.shape, np.nan), np.zeros(quantities.shape)
+
+        # First level whose cumulative size covers the quantity (n when the book is too thin)
+        level = np.searchsorted(self.cum_size, quantities, side="left")
+        fill_level = np.minimum(level, n - 1)
+
+        # Size and notional consumed before the fill level, with a leading zero for the top level
+        cum_size = np.concatenate(([0.0], self.cum_size))
+        cum_notional = np.concatenate(([0.0], self.cum_notional))
+        filled = cum_size[level]
+        notional = cum_notional[level] + self.prices[fill_level] * (quantities - filled)
+        return notional / quantities, self.prices[fill_level], np.minimum(quantities, self.depth)
+
+
+class ArrayOrderBook:
+    """Array-backed order book supporting batched VWAP depth walks for many quantities at once."""
+
+    def __init__(self, bids, asks, underlying_price=None):
+        self.bids = BookSide(bids)
+        self.asks = BookSide(asks)
+        self.underlying_price = underlying_price
+        self._fill_curve = None
+
+    @classmethod
+    def from_order_book(cls, order_book):
+        # order_book as returned by Deribit get_order_book (or MarketDataEngine.get_order_book)
+        return cls(order_book.get("bids") or [], order_book.get("asks") or [], order_book.get("underlying_price"))
+
+    def weighted_prices(self, quantities):
+        """Return (bid_vwap, ask_vwap) arrays, in units of the underlying, for a vector of quantities."""
+        quantities = np.asarray(quantities, dtype=float)
+        if np.any(quantities <= 0):
+            raise ValueError("Quantities must be positive.")
+        return self.bids.vwap(quantities), self.asks.vwap(quantities)
+
+    @property
+    def mid(self):
+        # Mid of the best bid and ask, NaN when a side is empty
+        if len(self.bids) and len(self.asks):
+            return 0.5 * (self.bids.prices[0] + self.asks.prices[0])
+        return np.nan
+
+    def _sides(self):
+        # Slippage is signed as a cost: selling below mid on the bid, buying above it on the ask
+        return (("bid", self.bids, -1.0), ("ask", self.asks, 1.0))
+
+    def fill_curve(self):
+        """
+        The fill curve of both sides, one entry per price level, computed once per book.
+
+        Returns
+        -------
+        curve : dict
+            {'bid': side, 'ask': side} where each side maps 'price' (the marginal price of the
+            level), 'size', 'available' (cumulative size down to the level), 'vwap' (average
+            price of filling down to the level) and 'slippage' (cost of that VWAP relative to mid)
+            to read-only arrays in book units.
+        """
+        if self._fill_curve is None:
+            mid = self.mid
+            self._fill_curve = {
+                name: {
+                    "price": side.prices, "size": side.sizes, "available": side.cum_size, "vwap": side.level_vwap,
+                    "slippage": sign * (side.level_vwap - mid) / mid,
+                }
+                for name, side, sign in self._sides()
+            }
+            for levels in self._fill_curve.values():
+                levels["slippage"].flags.writeable = False
+        return self._fill_curve
+
+    def fill(self, quantities):
+        """Per side and quantity: 'vwap', 'marginal_price', 'slippage' vs mid, 'available' size and 'insufficient' depth."""
+        quantities = np.asarray(quantities, dtype=float)
+        if np.any(quantities <= 0):
+            raise ValueError("Quantities must be positive.")
+        mid = self.mid
+        fills = {}
+        for name, side, sign in self._sides():
+            vwap, marginal_price, available = side.fill(quantities)
+            fills[name] = {
+                "vwap": vwap, "marginal_price": marginal_price, "slippage": sign * (vwap - mid) / mid,
+                "available": available, "insufficient": quantities > side.depth,
+            }
+        return fills
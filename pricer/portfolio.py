@@ -0,0 +1,193 @@
+import numpy as np
+
+from .contracts import ContractBatch
+from .option_interpolation import OptionInterpolator
+
+
+def _same_book(previous, book):
+    # Streaming books are rebuilt only on change; REST books carry a change_id, others are compared by content.
+    # The underlying price is left out: it ticks on every fetch and is followed by the ('spot', underlying) input
+    if previous is book:
+        return True
+    if previous is None:
+        return False
+    if "change_id" in previous and "change_id" in book:
+        return previous["change_id"] == book["change_id"]
+    return previous.get("bids") == book.get("bids") and previous.get("asks") == book.get("asks")
+
+
+class Portfolio:
+    """Options portfolio revalued incrementally on top of a MarketPricer.
+
+    Every leg depends on a few market inputs: the order book of a listed leg, the neighbouring
+    books of a linearly interpolated leg, the book summary of a spline-interpolated leg and the
+    spot price of its underlying. The last snapshot of each input is kept, and a revaluation
+    only reprices the legs whose inputs changed, updating the totals by difference. The inputs
+    are worked out again whenever the instruments catalogue of an underlying is refreshed.
+    """
+
+    def __init__(self, pricer, option_data, future_spot='future', interpolation_method='linear', bid_spread=0.05,
+                 ask_spread=0.05, book_max_age=None, entry_prices=None):
+        batch = ContractBatch.parse(option_data)
+        option_data = batch.option_data()
+        pricer._validate_inputs(option_data, future_spot, interpolation_method, bid_spread, ask_spread)
+
+        self.pricer = pricer
+        self.option_data = option_data
+        self.quantity = batch.quantity
+        self.future_spot = future_spot
+        self.interpolation_method = interpolation_method
+        self.bid_spread = bid_spread
+        self.ask_spread = ask_spread
+        self.book_max_age = book_max_age
+
+        # Per-leg prices and the running totals derived from them
+        self.bid = np.full(len(option_data), np.nan)
+        self.ask = np.full(len(option_data), np.nan)
+        # Entry prices per unit, the first mid price by default, for the PnL
+        self.entry = np.array([(entry_prices or {}).get(name, np.nan) for name, _ in option_data], dtype=float)
+        self.bid_value = 0.0
+        self.ask_value = 0.0
+        self.pnl = 0.0
+
+        self._underlyings = {}
+        for row, (name, _) in enumerate(option_data):
+            self._underlyings.setdefault(name.split("-")[0].upper(), []).append(row)
+        self._listed = np.zeros(len(option_data), dtype=bool)
+        self._dependencies = {}
+        self._snapshots = {}
+        # Catalogue timestamp per underlying the dependencies were built from
+        self._catalogues = None
+        self._build_dependencies()
+
+    def _build_dependencies(self):
+        # {input key: [leg rows]} with keys ('book', name), ('summary', underlying) and ('spot', underlying),
+        # rebuilt when a catalogue refresh may have listed or delisted legs; True if it was rebuilt
+        pricer = self.pricer
+        catalogues = {}
+        for underlying in self._underlyings:
+            pricer.update_instruments_cache(underlying, transport=pricer.transport, max_age=pricer._summary_max_age(self.interpolation_method))
+            catalogues[underlying] = pricer.instruments_cache[underlying]["timestamp"]
+        if catalogues == self._catalogues:
+            return False
+
+        self._catalogues = catalogues
+        self._dependencies = {}
+        for underlying, rows in self._underlyings.items():
+            index = pricer.instruments_cache[underlying]["instruments"]
+            pending = []
+            for row in rows:
+                name = self.option_data[row][0]
+                self._listed[row] = name in index
+                if self._listed[row]:
+                    self._depend(('book', name), row)
+                else:
+                    pending.append(row)
+                self._depend(('spot', underlying), row)
+
+            if self.interpolation_method == 'cubic_spline':
+                for row in pending:
+                    self._depend(('summary', underlying), row)
+            elif pending:
+                pricer.option_underlying = underlying
+                interpolator = OptionInterpolator(index, pricer)
+                for row, names in zip(pending, interpolator.neighbours([self.option_data[row] for row in pending])):
+                    for name in names:
+                        self._depend(('book', name), row)
+
+        self._snapshots = {key: snapshot for key, snapshot in self._snapshots.items() if key in self._dependencies}
+        return True
+
+    def _depend(self, key, row):
+        self._dependencies.setdefault(key, []).append(row)
+
+    def _poll(self, keys):
+        # Fetch the current snapshot of each input once and return the keys whose snapshot changed
+        pricer = self.pricer
+        books = pricer._fetch_option_books(sorted(name for kind, name in keys if kind == 'book'))
+        changed = set()
+        for key in keys:
+            kind, name = key
+            previous = self._snapshots.get(key)
+            if kind == 'book':
+                snapshot = books[name]
+                unchanged = previous is not None and _same_book(previous, snapshot)
+            elif kind == 'summary':
+                pricer.update_instruments_cache(name, transport=pricer.transport, max_age=pricer.summary_max_age)
+                snapshot = pricer.instruments_cache[name]["timestamp"]
+                unchanged = previous == snapshot
+            else:
+                snapshot = pricer._fetch_spot_price('usd', name)
+                unchanged = previous == snapshot
+            if not unchanged:
+                self._snapshots[key] = snapshot
+                changed.add(key)
+        return changed
+
+    def _reprice(self, rows):
+        pricer = self.pricer
+        use_future_price = self.future_spot == 'future'
+        listed = [row for row in rows if self._listed[row]]
+        interpolated = [row for row in rows if not self._listed[row]]
+
+        prices = {}
+        for row in listed:
+            name, quantity = self.option_data[row]
+            pricer.parse_option_string(name, quantity)
+            pricer.input_string = name
+            order_book = pricer._fetch_option_book(name)
+            prices[row] = pricer._get_weighted_price(order_book, use_future_price, self.bid_spread, self.ask_spread)
+        if interpolated:
+            interpolated_prices = pricer._interpolate_options([self.option_data[row] for row in interpolated], self.future_spot,
+                                                              self.interpolation_method, self.bid_spread, self.ask_spread)
+            prices.update(zip(interpolated, interpolated_prices))
+
+        rows = np.fromiter(prices, dtype=int, count=len(prices))
+        bid = np.array([prices[row][0] for row in rows], dtype=float)
+        ask = np.array([prices[row][1] for row in rows], dtype=float)
+        quantity = self.quantity[rows]
+        # First valuation of a leg sets its entry price when none was given
+        self.entry[rows] = np.where(np.isnan(self.entry[rows]), 0.5 * (bid + ask), self.entry[rows])
+
+        old_bid = np.nan_to_num(self.bid[rows])
+        old_ask = np.nan_to_num(self.ask[rows])
+        old_pnl = np.where(np.isnan(self.bid[rows]), 0.0, 0.5 * (old_bid + old_ask) - self.entry[rows])
+        self.bid_value += float(quantity @ (bid - old_bid))
+        self.ask_value += float(quantity @ (ask - old_ask))
+        self.pnl += float(quantity @ (0.5 * (bid + ask) - self.entry[rows] - old_pnl))
+        self.bid[rows] = bid
+        self.ask[rows] = ask
+
+    def revalue(self, changed=None, full=False):
+        """
+        Reprice the legs whose market inputs changed since the last revaluation.
+
+        Parameters
+        ----------
+        changed : iterable of str, optional, default: None
+            Instrument names known to have moved (eg. from a MarketDataEngine). Only their books
+            are checked, plus the summary and spot inputs; by default every input is polled.
+
+        full : bool, optional, default: False
+            Reprice every leg, eg. to roll the time to expiry of interpolated legs forward.
+
+        Returns
+        -------
+        totals : dict
+            Portfolio 'bid' and 'ask' values, 'pnl' against the entry mid prices and the number
+            of legs 'repriced'.
+        """
+        # A refreshed catalogue may change how legs are priced: reprice them all
+        full = self._build_dependencies() or full
+        keys = list(self._dependencies)
+        if changed is not None:
+            changed = set(changed)
+            keys = [key for key in keys if key[0] != 'book' or key[1] in changed or key not in self._snapshots]
+
+        with self.pricer._pricing_cycle(self.book_max_age):
+            moved = self._poll(keys)
+            rows = range(len(self.option_data)) if full else sorted({row for key in moved for row in self._dependencies[key]})
+            if rows:
+                self._reprice(list(rows))
+
+        return {'bid': self.bid_value, 'ask': self.ask_value, 'pnl': self.pnl, 'repriced': len(rows)}
@@ -0,0 +1,262 @@
+import itertools
+import logging
+import multiprocessing
+import pickle
+import threading
+from multiprocessing.connection import Client, Listener
+
+from .market_pricing import MarketPricer
+from .shared_market import SharedBookTable, SharedCatalogue
+from .transport import get_default_transport
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AUTHKEY = b"pricer"
+
+
+def _picklable_error(error):
+    # Errors go back to the client pickled; one holding eg. a response or a socket is sent as a RuntimeError
+    try:
+        pickle.dumps(error)
+    except Exception:
+        return RuntimeError(f"{type(error).__name__}: {error}")
+    return error
+
+
+def _serve_worker(pricer_class, books, catalogue, demand, addresses, stop, authkey, transport_factory, max_workers):
+    # Pricing worker: prices off the shared books and catalogue, answers requests from local sockets
+    transport = transport_factory() if transport_factory is not None else get_default_transport()
+    pricer = pricer_class(max_workers=max_workers, transport=transport, market_data=books)
+    stats = {"requests": 0, "fallback_books": 0}
+    stats_lock = threading.Lock()
+
+    def fallback(instrument_name):
+        # A book the market-data process doesn't publish yet: ask for it and fetch it once ourselves
+        with stats_lock:
+            stats["fallback_books"] += 1
+        demand.put(instrument_name)
+
+    books.on_miss = fallback
+
+    def handle(connection):
+        with connection:
+            while True:
+                try:
+                    method, args, kwargs = connection.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    catalogue.install(pricer_class)
+                    if method == "compute_price":
+                        result = dict(pricer.compute_price(*args, **kwargs))
+                        with stats_lock:
+                            stats["requests"] += 1
+                    elif method == "stats":
+                        with stats_lock:
+                            result = dict(stats)
+                    else:
+                        raise ValueError(f"Unknown method: {method}")
+                    connection.send(("ok", result))
+                except Exception as error:
+                    connection.send(("error", _picklable_error(error)))
+
+    listener = Listener(("127.0.0.1", 0), authkey=authkey)
+    addresses.put(listener.address)
+
+    def accept():
+        while True:
+            try:
+                connection = listener.accept()
+            except (OSError, EOFError):
+                return
+            threading.Thread(target=handle, args=(connection,), daemon=True).start()
+
+    threading.Thread(target=accept, daemon=True).start()
+    stop.wait()
+    listener.close()
+
+
+class PricingService:
+    """Pricing workers in N processes sharing one market-data process through shared memory.
+
+    The market-data process (the one calling start()) refreshes the instrument catalogue of
+    `underlyings` every `catalogue_interval` seconds and the order books of the published
+    instruments every `book_interval` seconds, through one MarketPricer and thus one set of
+    upstream requests. Books go to a SharedBookTable and the catalogue to a SharedCatalogue;
+    the workers read both without copying them per process and answer compute_price requests
+    from PricingClient on local sockets. An instrument not published yet is fetched once by the
+    worker asking for it and published from then on.
+    """
+
+    def __init__(self, underlyings, n_workers=None, instruments=(), book_interval=1.0, catalogue_interval=3600.0,
+                 capacity=4096, max_depth=100, max_book_age=None, pricer_class=MarketPricer, transport_factory=None,
+                 market_data=None, max_workers=8, authkey=DEFAULT_AUTHKEY):
+        self.underlyings = [underlying.upper() for underlying in underlyings]
+        self.n_workers = n_workers or multiprocessing.cpu_count()
+        self.instruments = set(instruments)
+        self.book_interval = book_interval
+        self.catalogue_interval = catalogue_interval
+        self.capacity = capacity
+        self.max_depth = max_depth
+        # Workers fall back to REST for books older than this, eg. when the market-data process stalls
+        self.max_book_age = max_book_age if max_book_age is not None else 10 * book_interval
+        self.pricer_class = pricer_class
+        self.transport_factory = transport_factory
+        self.max_workers = max_workers
+        self.authkey = authkey
+        transport = transport_factory() if transport_factory is not None else None
+        self.pricer = pricer_class(max_workers=max_workers, transport=transport, market_data=market_data)
+        self.addresses = []
+        self.books = None
+        self.catalogue = None
+        self._processes = []
+        self._threads = []
+        self._stop = threading.Event()
+        # The shared book table takes a single writer: the books and demand threads publish under this lock
+        self._write_lock = threading.Lock()
+        self._context = multiprocessing.get_context("spawn")
+
+    def refresh_catalogue(self):
+        for underlying in self.underlyings:
+            self.pricer_class._refresh_instruments(underlying, transport=self.pricer.transport, force_update=True)
+        self.catalogue.publish({underlying: self.pricer_class.instruments_cache[underlying] for underlying in self.underlyings
+                                if underlying in self.pricer_class.instruments_cache})
+
+    def refresh_books(self, instrument_names=None):
+        # One fetch per instrument for all workers; with a streaming market_data the books come from memory
+        with self._write_lock:
+            names = sorted(self.instruments if instrument_names is None else instrument_names)
+            if not names:
+                return
+            with self.pricer._pricing_cycle(None):
+                books = self.pricer._fetch_option_books(names)
+            for name, order_book in books.items():
+                self.books.put(name, order_book)
+
+    def publish(self, instrument_names):
+        # Add instruments to the published set and publish their books right away
+        with self._write_lock:
+            new_names = set(instrument_names) - self.instruments
+            self.instruments |= new_names
+        if new_names:
+            self.refresh_books(new_names)
+
+    def _run_catalogue(self):
+        while not self._stop.wait(self.catalogue_interval):
+            self._guard(self.refresh_catalogue)
+
+    def _run_books(self):
+        while not self._stop.wait(self.book_interval):
+            self._guard(self.refresh_books)
+
+    def _run_demand(self):
+        while not self._stop.is_set():
+            names = {self._demand.get()}
+            while not self._demand.empty():
+                names.add(self._demand.get())
+            names.discard(None)
+            self._guard(self.publish, names)
+
+    def _guard(self, function, *args):
+        # A failed refresh keeps the previous snapshots published
+        try:
+            function(*args)
+        except Exception as error:
+            logger.warning("Market data refresh failed, serving the previous snapshots: %s", error)
+
+    def start(self):
+        self.books = SharedBookTable(capacity=self.capacity, max_depth=self.max_depth, max_age=self.max_book_age)
+        self.catalogue = SharedCatalogue()
+        self._demand = self._context.Queue()
+        self._stop_workers = self._context.Event()
+        self.refresh_catalogue()
+        self.refresh_books()
+
+        addresses = self._context.Queue()
+        for index in range(self.n_workers):
+            process = self._context.Process(
+                target=_serve_worker, name=f"pricing-worker-{index}", daemon=True,
+                args=(self.pricer_class, self.books, self.catalogue, self._demand, addresses, self._stop_workers,
+                      self.authkey, self.transport_factory, self.max_workers))
+            process.start()
+            self._processes.append(process)
+        self.addresses = [addresses.get(timeout=60) for _ in self._processes]
+
+        for target in (self._run_catalogue, self._run_books, self._run_demand):
+            thread = threading.Thread(target=target, name=f"pricing-service-{target.__name__.strip('_')}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def client(self):
+        return PricingClient(self.addresses, self.authkey)
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        self._stop_workers.set()
+        self._demand.put(None)
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._processes, self._threads = [], []
+        self.books.close()
+        self.catalogue.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+        return False
+
+
+class PricingClient:
+    """Client of a PricingService, spreading requests round-robin over its workers.
+
+    Safe to share between threads: each worker connection serves one request at a time.
+    """
+
+    def __init__(self, addresses, authkey=DEFAULT_AUTHKEY):
+        if not addresses:
+            raise ValueError("PricingClient needs at least one worker address.")
+        self.addresses = list(addresses)
+        self.authkey = authkey
+        self._connections = [None] * len(self.addresses)
+        self._locks = [threading.Lock() for _ in self.addresses]
+        self._next = itertools.count()
+
+    def _call(self, index, method, *args, **kwargs):
+        with self._locks[index]:
+            if self._connections[index] is None:
+                self._connections[index] = Client(self.addresses[index], authkey=self.authkey)
+            connection = self._connections[index]
+            connection.send((method, args, kwargs))
+            status, result = connection.recv()
+        if status == "error":
+            raise result
+        return result
+
+    def compute_price(self, option_data, **kwargs):
+        """Price option_data on the next worker; same arguments and {name: [bid, ask]} result as MarketPricer.compute_price."""
+        kwargs.setdefault("verbose", False)
+        return self._call(next(self._next) % len(self.addresses), "compute_price", option_data, **kwargs)
+
+    def stats(self):
+        # Requests served and books fetched outside the shared table, per worker
+        return [self._call(index, "stats") for index in range(len(self.addresses))]
+
+    def close(self):
+        for index, connection in enumerate(self._connections):
+            if connection is not None:
+                connection.close()
+                self._connections[index] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
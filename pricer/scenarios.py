@@ -0,0 +1,179 @@
+from datetime import datetime
+
+import numpy as np
+
+from .black_scholes import BlackScholesPricer, black_scholes
+from .contracts import ContractBatch
+
+GREEKS = ("delta", "gamma", "vega", "theta", "rho")
+# 21 x 11 risk grid: spot -50% to +50% in 5% steps, volatility -25 to +25 points in 5 point steps
+DEFAULT_SPOT_SHOCKS = np.linspace(-0.5, 0.5, 21)
+DEFAULT_VOL_SHOCKS = np.linspace(-0.25, 0.25, 11)
+# Volatility floor of shocked scenarios, so that large negative vol shocks stay priceable
+MIN_VOLATILITY = 1e-4
+
+
+def _expiry_code(ordinal):
+    # Deribit expiry code of a date ordinal, eg. '5JUN23'
+    return datetime.fromordinal(int(ordinal)).strftime("%d%b%y").upper().lstrip("0")
+
+
+def _group_codes(batch, by):
+    # (group code per option, group keys) for by=None (positions), 'underlying', 'expiry' or both
+    if by is None:
+        return np.arange(len(batch)), list(batch.names)
+    fields = (by,) if isinstance(by, str) else tuple(by)
+    columns = []
+    for field in fields:
+        if field == "underlying":
+            columns.append(batch.underlying.astype(np.int64))
+        elif field == "expiry":
+            columns.append(batch.expiry)
+        else:
+            raise ValueError("Invalid value for by. Valid values: None, 'underlying', 'expiry' or both.")
+    unique, codes = np.unique(np.column_stack(columns), axis=0, return_inverse=True)
+    keys = []
+    for row in unique:
+        labels = tuple(batch.underlyings[value] if field == "underlying" else _expiry_code(value) for field, value in zip(fields, row))
+        keys.append(labels[0] if len(labels) == 1 else labels)
+    return codes.reshape(-1), keys
+
+
+class ScenarioCube:
+    """Portfolio values over a grid of spot and volatility shocks.
+
+    values[measure] has shape (len(keys), len(spot_shocks), len(vol_shocks)) with one row per
+    position or per group of positions (see ScenarioPricer.compute_price). Measures are the
+    position 'pv' and, when computed, the position Greeks; base_pv holds the unshocked 'pv'.
+    """
+
+    def __init__(self, keys, spot_shocks, vol_shocks, values, base_pv, by=None, batch=None):
+        self.keys = keys
+        self.spot_shocks = spot_shocks
+        self.vol_shocks = vol_shocks
+        self.values = values
+        self.base_pv = base_pv
+        self.by = by
+        self._batch = batch
+
+    def __getitem__(self, measure):
+        return self.values[measure]
+
+    @property
+    def pnl(self):
+        # Scenario PV minus the unshocked PV
+        return self.values["pv"] - self.base_pv[:, None, None]
+
+    def total(self, measure="pv"):
+        # (spot shocks, vol shocks) grid of the whole portfolio
+        return self.values[measure].sum(axis=0)
+
+    def aggregate(self, by=("underlying", "expiry")):
+        """Sum a per-position cube by 'underlying', 'expiry' or both into a new ScenarioCube."""
+        if self.by is not None:
+            raise ValueError("The cube is already aggregated; compute it per position to regroup it.")
+        codes, keys = _group_codes(self._batch, by)
+        values = {}
+        for measure, value in self.values.items():
+            values[measure] = np.zeros((len(keys),) + value.shape[1:])
+            np.add.at(values[measure], codes, value)
+        base_pv = np.bincount(codes, weights=self.base_pv, minlength=len(keys))
+        return ScenarioCube(keys, self.spot_shocks, self.vol_shocks, values, base_pv, by=by)
+
+
+class ScenarioPricer(BlackScholesPricer):
+    """Black-Scholes revaluation of a whole book over a spot × volatility shock grid in one pass.
+
+    The book is parsed once and priced as one (options × spot shocks × vol shocks) array
+    computation, in chunks of at most `chunk_size` cells to bound the temporaries.
+    """
+
+    def __init__(self, chunk_size=1_000_000):
+        super().__init__()
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive.")
+        self.chunk_size = chunk_size
+
+    def compute_price(self, option_data, spot, volatility, spot_shocks=DEFAULT_SPOT_SHOCKS,
+                      vol_shocks=DEFAULT_VOL_SHOCKS, interest_rate=None, greeks=True, valuation_time=None, by=None):
+        """
+        Value every position of option_data over the grid of spot and volatility shocks.
+
+        Parameters
+        ----------
+        option_data : list of tpl [(input_opt , quantity)] or ContractBatch
+            Same format as MarketPricer.compute_price, eg. [("BTC-20SEP23-30000-C", 10)]
+
+        spot, volatility : float, array_like or dict
+            Unshocked underlying price and annualized volatility, as in BlackScholesPricer.compute_price.
+
+        spot_shocks : array_like, optional, default: -50% to +50% in 5% steps
+            Relative spot shocks, the shocked spot is spot * (1 + shock).
+
+        vol_shocks : array_like, optional, default: -25 to +25 vol points in 5 point steps
+            Absolute volatility shocks as decimals, the shocked volatility is floored at 0.01%.
+
+        interest_rate : float, optional, default: None (0)
+
+        greeks : bool, optional, default: True
+            Also compute the position delta, gamma, vega, theta and rho in every scenario.
+
+        valuation_time : datetime, optional, default: None (now)
+
+        by : str or tuple of str, optional, default: None
+            Sum positions by 'underlying', 'expiry' or ('underlying', 'expiry') while pricing, so
+            that memory stays proportional to the number of groups. None keeps one row per position.
+
+        Returns
+        -------
+        cube : ScenarioCube
+            PVs and Greeks in the currency of spot, one row per position or group.
+        """
+        batch, spot, volatility, time_to_expiry, interest_rate = self._prepare(option_data, spot, volatility, interest_rate, valuation_time)
+        spot_shocks = np.asarray(spot_shocks, dtype=float)
+        vol_shocks = np.asarray(vol_shocks, dtype=float)
+        if np.any(spot_shocks <= -1):
+            raise ValueError("Spot shocks must be greater than -100%.")
+
+        codes, keys = _group_codes(batch, by)
+        measures = ("pv",) + (GREEKS if greeks else ())
+        shape = (len(spot_shocks), len(vol_shocks))
+        values = {measure: np.zeros((len(keys),) + shape) for measure in measures}
+
+        rows_per_chunk = max(1, self.chunk_size // max(spot_shocks.size * vol_shocks.size, 1))
+        for start in range(0, len(batch), rows_per_chunk):
+            # Options along the first axis, spot shocks along the second and vol shocks along the third
+            rows = slice(start, start + rows_per_chunk)
+            chunk = (rows, None, None)
+            result = black_scholes(
+                spot[chunk] * (1 + spot_shocks[None, :, None]),
+                batch.strike[chunk],
+                time_to_expiry[chunk],
+                np.maximum(volatility[chunk] + vol_shocks[None, None, :], MIN_VOLATILITY),
+                interest_rate[chunk],
+                batch.is_call[chunk],
+                greeks=greeks,
+            )
+            quantity = batch.quantity[chunk]
+            for measure in measures:
+                position_values = quantity * result["price" if measure == "pv" else measure]
+                if by is None:
+                    values[measure][rows] = position_values
+                else:
+                    np.add.at(values[measure], codes[rows], position_values)
+
+        base_price = black_scholes(spot, batch.strike, time_to_expiry, volatility, interest_rate, batch.is_call, greeks=False)["price"]
+        base_pv = np.bincount(codes, weights=batch.quantity * base_price, minlength=len(keys))
+        return ScenarioCube(keys, spot_shocks, vol_shocks, values, base_pv, by=by, batch=batch if by is None else None)
+
+    def _prepare(self, option_data, spot, volatility, interest_rate, valuation_time):
+        # The book parsed once, with per-option spot, volatility and rate columns
+        batch = ContractBatch.parse(option_data)
+        underlyings = batch.underlying_names
+        time_to_expiry = batch.time_to_expiry(valuation_time)
+        spot = self._broadcast_by_underlying(spot, underlyings, "spot")
+        volatility = self._broadcast_by_underlying(volatility, underlyings, "volatility")
+        interest_rate = np.broadcast_to(np.asarray(0.0 if interest_rate is None else interest_rate, dtype=float), underlyings.shape)
+        if np.any(interest_rate < 0):
+            raise ValueError("Interest rate must be non-negative.")
+        return batch, spot, volatility, time_to_expiry, interest_rate
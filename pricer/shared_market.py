@@ -0,0 +1,244 @@
+import json
+import threading
+import time
+from datetime import datetime
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .book_summary import BookSummaryTable
+from .instrument_index import InstrumentIndex
+
+NAME_BYTES = 64
+
+
+def _attach(name):
+    # Attach to a segment owned by another process; before Python 3.13 readers spawned by the owner
+    # share its resource tracker, which unlinks the segment only when the owner unlinks it
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _read_consistent(versions, slot, read):
+    # Seqlock read: retry while the single writer is mid-update (odd version) or updated meanwhile
+    while True:
+        version = int(versions[slot])
+        if version % 2 == 0:
+            value = read()
+            if int(versions[slot]) == version:
+                return version, value
+        time.sleep(0)
+
+
+def _catalogue_entries(cache_entry):
+    # Book summary entries back from an instruments_cache entry, plain names when no summary row exists
+    summary = cache_entry.get("summary")
+    entries = []
+    for name in sorted(cache_entry["instruments"].names):
+        quote = summary.quote(name) if summary is not None else None
+        entries.append({"instrument_name": name, **quote} if quote is not None else name)
+    return entries
+
+
+class SharedBookTable:
+    """Order-book snapshots in one shared-memory segment, written by one process and read zero-copy by others.
+
+    Each of the `capacity` slots holds an instrument name, up to `max_depth` [price, amount] levels
+    per side, the underlying price and the fetch time. A slot's version counter is odd while it is
+    being written, so readers retry instead of seeing a half-written book. Deeper books are truncated.
+    Readers plug in as MarketPricer(market_data=...).
+    """
+
+    def __init__(self, name=None, capacity=4096, max_depth=100, create=True, max_age=None):
+        self.capacity = capacity
+        self.max_depth = max_depth
+        # Readers ignore snapshots older than max_age seconds, so the pricer falls back to REST
+        self.max_age = max_age
+        layout = self._layout(capacity, max_depth)
+        size = sum(np.dtype(dtype).itemsize * int(np.prod(shape)) for _, dtype, shape in layout)
+        self.segment = shared_memory.SharedMemory(name=name, create=True, size=size) if create else _attach(name)
+        self.owner = create
+
+        offset = 0
+        for field, dtype, shape in layout:
+            array = np.ndarray(shape, dtype=dtype, buffer=self.segment.buf, offset=offset)
+            setattr(self, field, array)
+            offset += array.nbytes
+        if create:
+            self.versions[:] = 0
+            self.used[:] = 0
+
+        # Optional callable told about every instrument a reader could not serve
+        self.on_miss = None
+        self._slots = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _layout(capacity, max_depth):
+        return (
+            ("used", np.int64, (1,)),
+            ("versions", np.int64, (capacity,)),
+            ("depths", np.int32, (capacity, 2)),
+            ("underlying_prices", np.float64, (capacity,)),
+            ("fetched_at", np.float64, (capacity,)),
+            ("names", f"S{NAME_BYTES}", (capacity,)),
+            ("levels", np.float64, (capacity, 2, max_depth, 2)),
+        )
+
+    @property
+    def name(self):
+        return self.segment.name
+
+    def __getstate__(self):
+        # Worker processes get a reader attached to the same segment
+        return {"name": self.name, "capacity": self.capacity, "max_depth": self.max_depth, "max_age": self.max_age}
+
+    def __setstate__(self, state):
+        self.__init__(state["name"], state["capacity"], state["max_depth"], create=False, max_age=state["max_age"])
+
+    def _slot(self, instrument_name, allocate=False):
+        slot = self._slots.get(instrument_name)
+        if slot is not None:
+            return slot
+        with self._lock:
+            # Names are append-only: pick up the ones published since the last lookup
+            for slot in range(len(self._slots), int(self.used[0])):
+                self._slots[self.names[slot].decode()] = slot
+            slot = self._slots.get(instrument_name)
+            if slot is None and allocate:
+                slot = int(self.used[0])
+                if slot >= self.capacity:
+                    raise MemoryError(f"Shared book table is full ({self.capacity} instruments).")
+                self.names[slot] = instrument_name.encode()
+                self._slots[instrument_name] = slot
+                self.used[0] = slot + 1
+            return slot
+
+    def put(self, instrument_name, order_book):
+        slot = self._slot(instrument_name, allocate=True)
+        bids = np.asarray(order_book.get("bids") or np.empty((0, 2)), dtype=float)[:self.max_depth]
+        asks = np.asarray(order_book.get("asks") or np.empty((0, 2)), dtype=float)[:self.max_depth]
+
+        self.versions[slot] += 1
+        self.levels[slot, 0, :len(bids)] = bids
+        self.levels[slot, 1, :len(asks)] = asks
+        self.depths[slot] = (len(bids), len(asks))
+        self.underlying_prices[slot] = order_book.get("underlying_price", np.nan)
+        self.fetched_at[slot] = time.time()
+        self.versions[slot] += 1
+
+    def get_order_book(self, instrument_name):
+        # Same shape as the REST get_order_book result; None when not published or older than max_age
+        slot = self._slot(instrument_name)
+        if slot is None:
+            return self._miss(instrument_name)
+
+        def read():
+            n_bids, n_asks = self.depths[slot]
+            return (self.levels[slot, 0, :n_bids].tolist(), self.levels[slot, 1, :n_asks].tolist(),
+                    float(self.underlying_prices[slot]), float(self.fetched_at[slot]))
+
+        version, (bids, asks, underlying_price, fetched_at) = _read_consistent(self.versions, slot, read)
+        if version == 0 or (self.max_age is not None and time.time() - fetched_at > self.max_age):
+            return self._miss(instrument_name)
+        book = {"instrument_name": instrument_name, "bids": bids, "asks": asks, "change_id": version,
+                "timestamp": int(fetched_at * 1000)}
+        if not np.isnan(underlying_price):
+            book["underlying_price"] = underlying_price
+        return book
+
+    def _miss(self, instrument_name):
+        if self.on_miss is not None:
+            self.on_miss(instrument_name)
+        return None
+
+    def __contains__(self, instrument_name):
+        return self._slot(instrument_name) is not None
+
+    def __len__(self):
+        return int(self.used[0])
+
+    def close(self):
+        # Views into the segment must go before it can be closed
+        for field, _, _ in self._layout(self.capacity, self.max_depth):
+            setattr(self, field, None)
+        self.segment.close()
+        if self.owner:
+            self.segment.unlink()
+
+
+class SharedCatalogue:
+    """The instruments catalogue of every underlying, published as one versioned blob in shared memory.
+
+    The writer serializes {underlying: (timestamp, book summary)} once per refresh; readers decode
+    it only when its version changed and install it into a MarketPricer class' instruments_cache.
+    """
+
+    def __init__(self, name=None, size=64 * 1024 * 1024, create=True):
+        self.segment = shared_memory.SharedMemory(name=name, create=True, size=size + 16) if create else _attach(name)
+        self.owner = create
+        self.header = np.ndarray((2,), dtype=np.int64, buffer=self.segment.buf)
+        self.payload = np.ndarray((self.segment.size - 16,), dtype=np.uint8, buffer=self.segment.buf, offset=16)
+        if create:
+            self.header[:] = 0
+        self.installed_version = 0
+        self._lock = threading.Lock()
+
+    @property
+    def name(self):
+        return self.segment.name
+
+    def __getstate__(self):
+        return {"name": self.name}
+
+    def __setstate__(self, state):
+        self.__init__(state["name"], create=False)
+
+    @property
+    def version(self):
+        return int(self.header[0])
+
+    def publish(self, instruments_cache):
+        catalogue = {
+            underlying: {"timestamp": entry["timestamp"].timestamp(), "instruments": _catalogue_entries(entry)}
+            for underlying, entry in instruments_cache.items() if entry.get("timestamp") is not None
+        }
+        payload = np.frombuffer(json.dumps(catalogue, separators=(",", ":")).encode(), dtype=np.uint8)
+        if payload.size > self.payload.size:
+            raise MemoryError(f"Catalogue of {payload.size} bytes does not fit the {self.payload.size} byte segment.")
+        with self._lock:
+            self.header[0] += 1
+            self.payload[:payload.size] = payload
+            self.header[1] = payload.size
+            self.header[0] += 1
+
+    def read(self):
+        # (version, {underlying: {"timestamp": posix, "instruments": [...]}})
+        version, payload = _read_consistent(self.header, 0, lambda: self.payload[:int(self.header[1])].tobytes())
+        return version, (json.loads(payload) if payload else {})
+
+    def install(self, pricer_class):
+        # Refresh pricer_class.instruments_cache when a newer catalogue was published; True if it did
+        if self.version == self.installed_version:
+            return False
+        with self._lock:
+            version, catalogue = self.read()
+            if version == self.installed_version:
+                return False
+            for underlying, entry in catalogue.items():
+                instruments = entry["instruments"]
+                pricer_class.instruments_cache[underlying] = {
+                    "timestamp": datetime.fromtimestamp(entry["timestamp"]),
+                    "instruments": InstrumentIndex(instruments),
+                    "summary": BookSummaryTable(instruments),
+                }
+            self.installed_version = version
+        return True
+
+    def close(self):
+        self.header = self.payload = None
+        self.segment.close()
+        if self.owner:
+            self.segment.unlink()
@@ -0,0 +1,347 @@
+import itertools
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class LocalOrderBook:
+    """An order book kept current from a snapshot followed by incremental Deribit `book` deltas."""
+
+    def __init__(self, instrument_name):
+        self.instrument_name = instrument_name
+        self.change_id = None
+        self.timestamp = None
+        self.underlying_price = None
+        self._bids = {}
+        self._asks = {}
+        self._materialized = None
+
+    @property
+    def is_synced(self):
+        return self.change_id is not None
+
+    def apply_snapshot(self, data):
+        self._bids = {}
+        self._asks = {}
+        self._apply_levels(self._bids, data.get("bids", []))
+        self._apply_levels(self._asks, data.get("asks", []))
+        self.change_id = data["change_id"]
+        self.timestamp = data.get("timestamp")
+        self._materialized = None
+
+    def apply_change(self, data):
+        # Returns False on a sequence gap, in which case the book must be resynced from a new snapshot
+        if not self.is_synced or data.get("prev_change_id") != self.change_id:
+            self.invalidate()
+            return False
+        self._apply_levels(self._bids, data.get("bids", []))
+        self._apply_levels(self._asks, data.get("asks", []))
+        self.change_id = data["change_id"]
+        self.timestamp = data.get("timestamp")
+        self._materialized = None
+        return True
+
+    def invalidate(self):
+        self.change_id = None
+        self._materialized = None
+
+    def set_underlying_price(self, underlying_price):
+        if underlying_price != self.underlying_price:
+            self.underlying_price = underlying_price
+            self._materialized = None
+
+    def _apply_levels(self, side, levels):
+        for level in levels:
+            # Snapshots may come as [price, amount], deltas always as [action, price, amount]
+            if len(level) == 2:
+                action, (price, amount) = "new", level
+            else:
+                action, price, amount = level
+            if action == "delete" or amount == 0:
+                side.pop(price, None)
+            else:
+                side[price] = amount
+
+    def to_order_book(self):
+        # Same shape as the REST get_order_book result, rebuilt at most once per change
+        if self._materialized is None:
+            book = {
+                "instrument_name": self.instrument_name,
+                "bids": [[price, self._bids[price]] for price in sorted(self._bids, reverse=True)],
+                "asks": [[price, self._asks[price]] for price in sorted(self._asks)],
+                "change_id": self.change_id,
+                "timestamp": self.timestamp,
+            }
+            if self.underlying_price is not None:
+                book["underlying_price"] = self.underlying_price
+            self._materialized = book
+        return self._materialized
+
+
+class MarketDataEngine:
+    """Keeps local order books current from a streaming feed so MarketPricer can price from memory.
+
+    The feed is read from a pluggable transport exposing connect(), send(message),
+    recv() (a decoded JSON-RPC message, None once the feed is closed, TimeoutError after a
+    read timeout) and close(). Books are subscribed on the `book.<instrument>.<interval>`
+    channel and their underlying price on `ticker.<instrument>.<interval>`. A sequence gap
+    invalidates the book and triggers a resubscription, which makes Deribit send a fresh snapshot.
+
+    The engine asks for heartbeats every `heartbeat_interval` seconds and answers them. A feed
+    silent for more than `max_age` seconds or dropped is reconnected with exponential backoff
+    and every book resubscribed; meanwhile, and once the engine stops, books are reported as
+    unavailable so that MarketPricer falls back to REST instead of pricing off frozen books.
+    """
+
+    def __init__(self, transport, interval="100ms", heartbeat_interval=10, max_age=30.0, reconnect_delay=0.5,
+                 max_reconnect_delay=30.0):
+        self.transport = transport
+        self.interval = interval
+        self.heartbeat_interval = heartbeat_interval
+        self.max_age = max_age
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.books = {}
+        self.resyncs = 0
+        self.reconnects = 0
+        self.messages = 0
+        self.last_message_at = None
+        self._lock = threading.Lock()
+        # Transports are not thread-safe for sending: the reader, subscribers and reconnects share this lock
+        self._send_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._request_ids = itertools.count(1)
+
+    def _book_channel(self, instrument_name):
+        return f"book.{instrument_name}.{self.interval}"
+
+    def _ticker_channel(self, instrument_name):
+        return f"ticker.{instrument_name}.{self.interval}"
+
+    def _send(self, method, params):
+        with self._send_lock:
+            self.transport.send({"jsonrpc": "2.0", "id": next(self._request_ids), "method": method, "params": params})
+
+    def _subscribe_channels(self, instrument_names):
+        channels = [channel for name in instrument_names for channel in (self._book_channel(name), self._ticker_channel(name))]
+        self._send("public/subscribe", {"channels": channels})
+
+    def subscribe(self, instrument_names):
+        new_names = []
+        with self._lock:
+            for instrument_name in instrument_names:
+                if instrument_name not in self.books:
+                    self.books[instrument_name] = LocalOrderBook(instrument_name)
+                    new_names.append(instrument_name)
+        if new_names:
+            self._subscribe_channels(new_names)
+        return new_names
+
+    def resync(self, instrument_name):
+        channel = self._book_channel(instrument_name)
+        with self._lock:
+            self.resyncs += 1
+        self._send("public/unsubscribe", {"channels": [channel]})
+        self._send("public/subscribe", {"channels": [channel]})
+
+    def process_message(self, message):
+        with self._lock:
+            self.last_message_at = time.monotonic()
+        method = message.get("method")
+        if method == "heartbeat":
+            # Deribit closes the connection unless its test requests are answered
+            if message.get("params", {}).get("type") == "test_request":
+                self._send("public/test", {})
+            return
+        if method != "subscription":
+            return
+        params = message["params"]
+        channel, data = params["channel"], params["data"]
+        kind, instrument_name = channel.split(".")[:2]
+
+        needs_resync = False
+        with self._lock:
+            self.messages += 1
+            book = self.books.get(instrument_name)
+            if book is None:
+                return
+            if kind == "book":
+                if data.get("type") == "snapshot":
+                    book.apply_snapshot(data)
+                elif book.is_synced:
+                    needs_resync = not book.apply_change(data)
+                # Deltas received while waiting for a snapshot are dropped
+            elif kind == "ticker" and "underlying_price" in data:
+                book.set_underlying_price(data["underlying_price"])
+
+        if needs_resync:
+            self.resync(instrument_name)
+
+    def get_order_book(self, instrument_name):
+        # Returns None when the instrument is not streamed, is waiting for a snapshot or the feed went silent
+        with self._lock:
+            book = self.books.get(instrument_name)
+            if book is None or not book.is_synced:
+                return None
+            if self.max_age is not None and (self.last_message_at is None or time.monotonic() - self.last_message_at > self.max_age):
+                return None
+            return book.to_order_book()
+
+    def invalidate_all(self):
+        with self._lock:
+            for book in self.books.values():
+                book.invalidate()
+
+    def _connect(self):
+        # (Re)open the feed, ask for heartbeats and subscribe every known book, which sends fresh snapshots
+        with self._send_lock:
+            self.transport.connect()
+        with self._lock:
+            self.last_message_at = time.monotonic()
+            instrument_names = list(self.books)
+        if self.heartbeat_interval is not None:
+            self._send("public/set_heartbeat", {"interval": self.heartbeat_interval})
+        if instrument_names:
+            self._subscribe_channels(instrument_names)
+
+    def _reconnect(self):
+        # Retry with exponential backoff until connected or stopped; False when stopped
+        delay = self.reconnect_delay
+        while not self._stopped.wait(delay):
+            try:
+                with self._send_lock:
+                    self.transport.close()
+                self._connect()
+            except Exception as error:
+                logger.warning("Market data feed reconnection failed, retrying in %.1fs: %s", delay, error)
+                delay = min(2 * delay, self.max_reconnect_delay)
+                continue
+            with self._lock:
+                self.reconnects += 1
+            if self._stopped.is_set():
+                self.transport.close()
+                return False
+            return True
+        return False
+
+    def _silent(self):
+        with self._lock:
+            if self.max_age is None or self.last_message_at is None:
+                return False
+            return time.monotonic() - self.last_message_at > self.max_age
+
+    def run(self):
+        # Blocking read loop until stop(); use start() to run it on a background thread
+        try:
+            while not self._stopped.is_set():
+                try:
+                    message = self.transport.recv()
+                except TimeoutError:
+                    if not self._silent():
+                        continue
+                    message = None
+                if message is not None:
+                    self.process_message(message)
+                    continue
+                # Feed dropped or silent: books can't be kept current until resubscribed
+                self.invalidate_all()
+                if self._stopped.is_set():
+                    break
+                logger.warning("Market data feed lost, reconnecting")
+                if not self._reconnect():
+                    break
+        finally:
+            self.invalidate_all()
+
+    def start(self, instrument_names=()):
+        self._stopped.clear()
+        self._connect()
+        self.subscribe(instrument_names)
+        self._thread = threading.Thread(target=self.run, name="market-data-engine", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        self._stopped.set()
+        self.transport.close()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+class WebSocketTransport:
+    """Deribit JSON-RPC over WebSocket, based on the optional `websocket-client` package."""
+
+    def __init__(self, url="wss://www.deribit.com/ws/api/v2", timeout=10.0):
+        try:
+            import websocket
+        except ImportError as error:
+            raise ImportError("WebSocketTransport requires the 'websocket-client' package.") from error
+        self._websocket = websocket
+        self.url = url
+        self.timeout = timeout
+        self._connection = None
+
+    def connect(self):
+        self._connection = self._websocket.create_connection(self.url, timeout=self.timeout)
+
+    def send(self, message):
+        self._connection.send(json.dumps(message))
+
+    def recv(self):
+        try:
+            raw = self._connection.recv()
+        except (self._websocket.WebSocketTimeoutException, TimeoutError) as error:
+            raise TimeoutError(f"No message from {self.url} within {self.timeout}s") from error
+        except (self._websocket.WebSocketException, OSError):
+            return None
+        return json.loads(raw) if raw else None
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+
+
+class ReplayTransport:
+    """Replays recorded feed messages, for tests and offline runs. Sent requests are kept in `sent`.
+
+    With a `timeout`, recv() raises TimeoutError when no message is fed within that many seconds.
+    """
+
+    def __init__(self, messages=(), timeout=None):
+        self._messages = deque(messages)
+        self._condition = threading.Condition()
+        self._closed = False
+        self.timeout = timeout
+        self.connects = 0
+        self.sent = []
+
+    def connect(self):
+        with self._condition:
+            self._closed = False
+            self.connects += 1
+
+    def feed(self, message):
+        with self._condition:
+            self._messages.append(message)
+            self._condition.notify()
+
+    def send(self, message):
+        self.sent.append(message)
+
+    def recv(self):
+        # Blocks until a message is fed; once closed, drains what is left and then returns None
+        with self._condition:
+            while not self._messages and not self._closed:
+                if not self._condition.wait(self.timeout):
+                    raise TimeoutError(f"No message fed within {self.timeout}s")
+            return self._messages.popleft() if self._messages else None
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
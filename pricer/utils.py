@@ -1,28 +1,112 @@
-import requests
-from .constants import COIN_GECKO_IDS
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from urllib.parse import urlparse
 
-def fetch_spot_price(option_underlying, currency='usd', base_url="https://www.deribit.com/api/v2/"):
+import numpy as np
+
+from .constants import COIN_GECKO_IDS, DERIBIT_EXPIRY_HOUR, SECONDS_PER_YEAR
+from .metrics import endpoint_of, get_metrics, response_size
+from .transport import get_default_transport
+
+OPTION_PATTERN = re.compile(r'([A-Za-z]+)-(\d{1,2}[A-Za-z]{3}\d{2})-(\d+\.?\d*)-([CP])$')
+
+
+class HostRateLimiter:
+    """Spread requests to the same host at most `requests_per_second` apart."""
+
+    def __init__(self, requests_per_second):
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive.")
+        self.min_interval = 1.0 / requests_per_second
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def acquire(self, url):
+        host = urlparse(url).netloc
+        # Reserve the next free slot for this host, then sleep outside the lock
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def fetch_spot_price(option_underlying, currency='usd', base_url="https://www.deribit.com/api/v2/", transport=None):
+    return fetch_spot_quote(option_underlying, currency=currency, base_url=base_url, transport=transport)[0]
+
+def _instrumented_get(transport, url):
+    response = transport.get(url)
+    metrics = get_metrics()
+    if metrics.enabled:
+        endpoint = endpoint_of(url)
+        metrics.increment("requests", endpoint=endpoint)
+        metrics.increment("response_bytes", response_size(response), endpoint=endpoint)
+    return response
+
+def fetch_spot_quote(option_underlying, currency='usd', base_url="https://www.deribit.com/api/v2/", transport=None,
+                     coingecko_url="https://api.coingecko.com/api/v3/"):
+    # Same lookup as fetch_spot_price but also returns which source answered
+    transport = transport if transport is not None else get_default_transport()
     coin_id = COIN_GECKO_IDS.get(option_underlying)
 
     if coin_id:
-        url = f"https://api.coingecko.com/api/v3/simple/price?ids={coin_id}&vs_currencies={currency}"
-        response = requests.get(url)
+        url = f"{coingecko_url}simple/price?ids={coin_id}&vs_currencies={currency}"
+        response = _instrumented_get(transport, url)
 
         if response.status_code == 200:
             data = response.json()
             spot_price = data.get(coin_id, {}).get(currency)
             if spot_price:
-                return spot_price
+                return spot_price, 'coingecko'
 
     # Fallback to Deribit API if CoinGecko fails or asset not found
     url = f"{base_url}public/get_index?currency={option_underlying}_USDC"
-    response = requests.get(url)
+    response = _instrumented_get(transport, url)
 
     if response.status_code == 200:
         data = response.json()
         index_price = data.get("result", {}).get("last_price")
         if index_price:
-            return index_price
+            return index_price, 'deribit_index'
 
     # Raise error if both attempts fail
     raise ValueError(f"Failed to fetch spot price for {option_underlying}")
+
+@lru_cache(maxsize=None)
+def parse_expiry(expiry_str):
+    # Deribit expiry codes like '29MAY23' or '5JUN23', parsed once per distinct code
+    return datetime.strptime(expiry_str.upper(), "%d%b%y")
+
+@lru_cache(maxsize=None)
+def expiry_timestamp(expiry_str):
+    # POSIX time of the 08:00 UTC expiry, computed once per distinct code
+    expiry_time = parse_expiry(expiry_str) + timedelta(hours=DERIBIT_EXPIRY_HOUR)
+    return expiry_time.replace(tzinfo=timezone.utc).timestamp()
+
+def posix_time(valuation_time=None):
+    # valuation_time is naive UTC, None means now
+    return time.time() if valuation_time is None else valuation_time.replace(tzinfo=timezone.utc).timestamp()
+
+def year_fraction(expiry_str, valuation_time=None):
+    # Deribit options expire at 08:00 UTC; ACT/365 year fraction from valuation_time (naive UTC)
+    return (expiry_timestamp(expiry_str) - posix_time(valuation_time)) / SECONDS_PER_YEAR
+
+def year_fractions(expiry_strs, valuation_time=None):
+    # Vectorized year_fraction, each distinct expiry code is looked up once
+    codes, position = np.unique(np.asarray(expiry_strs, dtype=str), return_inverse=True)
+    timestamps = np.array([expiry_timestamp(code) for code in codes.tolist()], dtype=float)
+    return ((timestamps - posix_time(valuation_time)) / SECONDS_PER_YEAR)[position.reshape(-1)]
+
+@lru_cache(maxsize=None)
+def parse_contract(option_string):
+    # (underlying, expiry code, strike, is_call) of a Deribit option name, memoized per string
+    match = OPTION_PATTERN.match(option_string)
+    if not match:
+        raise ValueError(f"Invalid option string format: {option_string}")
+    asset, date_str, strike_str, option_kind = match.groups()
+    return asset.upper(), date_str.upper(), float(strike_str), option_kind == "C"
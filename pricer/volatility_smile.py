@@ -0,0 +1,90 @@
+import numpy as np
+from scipy.interpolate import CubicSpline
+
+from .implied_volatility import black76, implied_volatility
+from .utils import parse_contract, year_fraction
+
+# Book summary price column behind each side of the smile
+SMILE_SIDES = {"bid": "bid_price", "ask": "ask_price", "mark": "mark_price"}
+
+
+class VarianceSmile:
+    """Natural cubic splines of total implied variance against log-moneyness for one expiry.
+
+    One spline is fitted per side ('bid', 'ask', 'mark'); sides with fewer than two quotes
+    have no spline. Outside the quoted strikes the total variance is held flat.
+    """
+
+    def __init__(self, expiry, time_to_expiry, forward, log_moneyness, total_variance):
+        self.expiry = expiry
+        self.time_to_expiry = time_to_expiry
+        self.forward = forward
+        self.splines = {}
+        self.bounds = {}
+        for side, variance in total_variance.items():
+            quoted = np.isfinite(variance)
+            if quoted.sum() < 2:
+                self.splines[side] = None
+                continue
+            self.splines[side] = CubicSpline(log_moneyness[quoted], variance[quoted], bc_type="natural")
+            self.bounds[side] = (log_moneyness[quoted][0], log_moneyness[quoted][-1])
+
+    def total_variance(self, side, strikes):
+        spline = self.splines.get(side)
+        strikes = np.asarray(strikes, dtype=float)
+        if spline is None:
+            return np.full(strikes.shape, np.nan)
+        low, high = self.bounds[side]
+        k = np.clip(np.log(strikes / self.forward), low, high)
+        return np.maximum(spline(k), 0.0)
+
+    def price(self, side, strikes, is_call):
+        """Black-76 prices in units of the underlying (like Deribit quotes), NaN when the side has no spline."""
+        volatility = np.sqrt(self.total_variance(side, strikes) / self.time_to_expiry)
+        return black76(self.forward, strikes, self.time_to_expiry, volatility, is_call) / self.forward
+
+
+def fit_variance_smiles(summary, valuation_time=None):
+    """
+    Fit a VarianceSmile for every live expiry of a BookSummaryTable in one pass.
+
+    Quotes are converted to implied vols with the vectorized solver; calls and puts sharing a
+    strike are averaged into one point of the smile.
+
+    Returns
+    -------
+    smiles : dict
+        {expiry code: VarianceSmile}
+    """
+    contracts = [parse_contract(name) for name in summary.names]
+    expiries = np.array([contract[1] for contract in contracts])
+    strikes = np.array([contract[2] for contract in contracts], dtype=float)
+    is_call = np.array([contract[3] for contract in contracts], dtype=bool)
+    forwards = summary["underlying_price"]
+
+    fractions = {expiry: year_fraction(expiry, valuation_time) for expiry in set(expiries.tolist())}
+    time_to_expiry = np.array([fractions[expiry] for expiry in expiries], dtype=float)
+    total_variance = {
+        side: implied_volatility(summary[column] * forwards, forwards, strikes, time_to_expiry, is_call) ** 2 * time_to_expiry
+        for side, column in SMILE_SIDES.items()
+    }
+
+    smiles = {}
+    for expiry, t in fractions.items():
+        rows = (expiries == expiry) & np.isfinite(forwards)
+        if t <= 0 or not rows.any():
+            continue
+        forward = float(np.median(forwards[rows]))
+        unique_strikes, position = np.unique(strikes[rows], return_inverse=True)
+
+        slice_variance = {}
+        for side, variance in total_variance.items():
+            values = variance[rows]
+            quoted = np.isfinite(values)
+            counts = np.bincount(position[quoted], minlength=len(unique_strikes))
+            sums = np.bincount(position[quoted], weights=values[quoted], minlength=len(unique_strikes))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                slice_variance[side] = np.where(counts > 0, sums / counts, np.nan)
+
+        smiles[expiry] = VarianceSmile(expiry, t, forward, np.log(unique_strikes / forward), slice_variance)
+    return smiles
@@ -0,0 +1,85 @@
+import unittest
+from benchmarks.fixtures import FixtureTransport, synthetic_fixtures
+from benchmarks.load_test import load_test
+import numpy as np
+from benchmarks.run_benchmarks import bench_compute_price, interpolated_portfolio, run
+from benchmarks.stub_server import StubServer
+from pricer.market_pricing import MarketPricer
+from pricer.transport import HttpTransport
+from pricer.utils import fetch_spot_quote
+
+class TestBenchmarks(unittest.TestCase):
+
+    def setUp(self):
+        self.fixtures = synthetic_fixtures(spots={"BTC": 30000.0}, expiry_days=(30, 90), levels=3)
+
+    def tearDown(self):
+        MarketPricer.instruments_cache.clear()
+        MarketPricer.book_cache.clear()
+        MarketPricer.spot_cache.clear()
+
+    def test_fixture_transport_serves_recorded_endpoints(self):
+        transport = FixtureTransport(self.fixtures)
+        name = next(iter(self.fixtures["BTC"]["order_books"]))
+
+        book = transport.get(f"https://www.deribit.com/api/v2/public/get_order_book?depth=1000&instrument_name={name}").json()
+        self.assertEqual(book["result"]["instrument_name"], name)
+        self.assertEqual(fetch_spot_quote("BTC", transport=transport), (30000.0, 'coingecko'))
+        self.assertEqual(transport.get("https://www.deribit.com/api/v2/public/get_order_book?instrument_name=BTC-1JAN20-1-C").status_code, 404)
+
+    def test_capped_recording_prices_interpolated_portfolios(self):
+        # As recorded with --max-books: only a third of the listed books are kept
+        fixture = self.fixtures["BTC"]
+        fixture["order_books"] = {name: book for index, (name, book) in enumerate(sorted(fixture["order_books"].items())) if index % 3 == 0}
+        transport = FixtureTransport(self.fixtures)
+        portfolio = interpolated_portfolio(transport, 20, np.random.default_rng(0))
+
+        result = bench_compute_price(transport, portfolio, repeats=1, interpolation_method='linear')
+        self.assertEqual(result["size"], 20)
+
+    def test_run_reports_every_benchmark(self):
+        report = run(sizes=(1, 5), repeats=1, fixtures=self.fixtures)
+
+        self.assertEqual(report["metadata"]["fixtures"], "recorded")
+        compute = [result for result in report["results"] if result["benchmark"] == "compute_price"]
+        self.assertEqual(len(compute), 8)
+        self.assertTrue(all(result["latency_ms"]["p99"] >= result["latency_ms"]["p50"] for result in compute))
+        self.assertEqual(len([result for result in report["results"] if result["benchmark"] == "depth_walk"]), 3)
+
+    def test_stub_server_serves_the_pricer_over_http(self):
+        name = sorted(self.fixtures["BTC"]["order_books"])[0]
+        transport = HttpTransport(max_retries=0)
+        with StubServer(self.fixtures) as server:
+            pricer = server.pricer_class()(transport=transport)
+            prices = pricer.compute_price([(name, 1.0)], verbose=False)
+            spot = fetch_spot_quote("BTC", base_url=server.deribit_url, transport=transport, coingecko_url=server.coingecko_url)
+            statistics = server.statistics()
+        transport.close()
+
+        self.assertEqual(len(prices[name]), 2)
+        self.assertEqual(spot, (30000.0, 'coingecko'))
+        self.assertEqual(statistics["requests"], {"get_book_summary_by_currency": 1, "get_order_book": 1, "price": 1})
+
+    def test_stub_server_throttles_and_fails_on_demand(self):
+        with StubServer(self.fixtures, requests_per_second=1.0, burst=1) as server:
+            self.assertEqual(server.respond("/api/v2/public/get_index?currency=BTC_USDC")[0], 200)
+            status, _, headers = server.respond("/api/v2/public/get_index?currency=BTC_USDC")
+        self.assertEqual(status, 429)
+        self.assertGreater(float(headers["Retry-After"]), 0.0)
+
+        with StubServer(self.fixtures, error_rate=1.0) as server:
+            self.assertEqual(server.respond("/api/v2/public/get_index?currency=BTC_USDC")[0], 503)
+            self.assertEqual(server.statistics()["errors"], {"get_index": 1})
+
+    def test_load_test_reports_throughput_and_amplification(self):
+        report = load_test(self.fixtures, qps=20.0, duration=0.5, size=3, concurrency=4)
+
+        self.assertEqual(report["calls"], 10)
+        self.assertEqual(report["failed_calls"], 0)
+        self.assertEqual(report["options_priced"], 30)
+        self.assertGreater(report["request_amplification"], 0.0)
+        self.assertGreaterEqual(report["latency_ms"]["p99"], report["latency_ms"]["p50"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from datetime import datetime
+import numpy as np
+from pricer.contracts import ContractBatch
+from pricer.black_scholes import BlackScholesPricer, black_scholes
+
+class TestBlackScholesKernel(unittest.TestCase):
+
+    def test_reference_values(self):
+        result = black_scholes(100, 100, 1.0, 0.2, 0.05, is_call=[True, False])
+
+        np.testing.assert_allclose(result["price"], [10.450584, 5.573526], atol=1e-6)
+        np.testing.assert_allclose(result["delta"], [0.636831, -0.363169], atol=1e-6)
+
+    def test_put_call_parity(self):
+        strikes = np.linspace(50, 150, 11)
+        call = black_scholes(100, strikes, 0.5, 0.6, 0.03, is_call=True, greeks=False)["price"]
+        put = black_scholes(100, strikes, 0.5, 0.6, 0.03, is_call=False, greeks=False)["price"]
+
+        np.testing.assert_allclose(call - put, 100 - strikes * np.exp(-0.03 * 0.5), atol=1e-9)
+
+    def test_greeks_match_finite_differences(self):
+        args = dict(spot=30000.0, strike=32000.0, time_to_expiry=0.25, volatility=0.55, interest_rate=0.02, is_call=True)
+        result = black_scholes(**args)
+        price = lambda **changes: black_scholes(**{**args, **changes}, greeks=False)["price"]
+
+        h = 1.0
+        self.assertAlmostEqual(result["delta"], (price(spot=30001.0) - price(spot=29999.0)) / 2, places=5)
+        self.assertAlmostEqual(result["gamma"], (price(spot=30001.0) - 2 * price() + price(spot=29999.0)) / h ** 2, places=6)
+        self.assertAlmostEqual(result["vega"], (price(volatility=0.5501) - price(volatility=0.5499)) / 0.0002, delta=1e-2)
+        self.assertAlmostEqual(result["rho"], (price(interest_rate=0.0201) - price(interest_rate=0.0199)) / 0.0002, delta=1e-2)
+        self.assertAlmostEqual(result["theta"], -(price(time_to_expiry=0.2501) - price(time_to_expiry=0.2499)) / 0.0002, delta=1e-1)
+
+    def test_expired_options_are_intrinsic(self):
+        result = black_scholes(100, [90, 110], 0.0, 0.5, is_call=True)
+
+        np.testing.assert_allclose(result["price"], [10, 0])
+        np.testing.assert_allclose(result["delta"], [1, 0])
+        np.testing.assert_allclose(result["gamma"], [0, 0])
+
+
+class TestBlackScholesPricer(unittest.TestCase):
+
+    def test_compute_price(self):
+        pricer = BlackScholesPricer()
+        option_data = [("BTC-29DEC23-30000-C", 1), ("BTC-29DEC23-30000-P", 2), ("ETH-29DEC23-2000-C", 3)]
+        valuation_time = datetime(2023, 6, 29, 8)
+
+        result = pricer.compute_price(option_data, spot={"BTC": 30000, "ETH": 2000}, volatility=0.5, valuation_time=valuation_time)
+
+        t = (datetime(2023, 12, 29, 8) - valuation_time).days / 365
+        np.testing.assert_allclose(result["time_to_expiry"], [t, t, t])
+        expected = black_scholes([30000, 30000, 2000], [30000, 30000, 2000], t, 0.5, is_call=[True, False, True])["price"]
+        np.testing.assert_allclose(result["price"], expected)
+        np.testing.assert_allclose(result["quantity"], [1, 2, 3])
+        self.assertIn("theta", result)
+
+        batch = pricer.compute_price(ContractBatch.parse(option_data), spot={"BTC": 30000, "ETH": 2000}, volatility=0.5, valuation_time=valuation_time)
+        np.testing.assert_allclose(batch["price"], result["price"])
+
+    def test_invalid_inputs(self):
+        pricer = BlackScholesPricer()
+
+        with self.assertRaises(ValueError):
+            pricer.compute_price([("BTC-INVALID-30000-C", 1)], spot=30000, volatility=0.5)
+        with self.assertRaises(ValueError):
+            pricer.compute_price([("BTC-29DEC23-30000-C", 1)], spot={"ETH": 2000}, volatility=0.5)
+        with self.assertRaises(ValueError):
+            pricer.compute_price([("BTC-29DEC23-30000-C", 1)], spot=30000, volatility=0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
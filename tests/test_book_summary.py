@@ -0,0 +1,100 @@
+import math
+import unittest
+import warnings
+from datetime import datetime
+from unittest.mock import patch
+from pricer.book_summary import MARK_BOOK_SIZE, BookSummaryTable
+from pricer.instrument_index import InstrumentIndex
+from pricer.market_pricing import MarketPricer
+from pricer.order_book import ArrayOrderBook
+
+SUMMARY = [
+    {"instrument_name": "BTC-29DEC45-20000-C", "bid_price": 0.1, "ask_price": 0.12, "mark_price": 0.11, "mark_iv": 55.0, "underlying_price": 30000, "open_interest": 12.5},
+    {"instrument_name": "BTC-29DEC45-30000-C", "bid_price": None, "ask_price": 0.06, "mark_price": 0.055, "mark_iv": 52.0, "underlying_price": 30000, "open_interest": 3.0},
+    {"instrument_name": "BTC-29DEC45-40000-C", "bid_price": 0.02, "ask_price": 0.03, "best_bid_amount": 2.0, "best_ask_amount": 0.5, "mark_price": 0.025, "underlying_price": 30000},
+]
+
+class TestBookSummaryTable(unittest.TestCase):
+
+    def setUp(self):
+        self.table = BookSummaryTable(SUMMARY)
+
+    def test_columns(self):
+        self.assertEqual(len(self.table), 3)
+        self.assertEqual(list(self.table["ask_price"]), [0.12, 0.06, 0.03])
+        self.assertTrue(math.isnan(self.table["bid_price"][1]))
+        self.assertEqual(self.table.quote("BTC-29DEC45-30000-C")["bid_price"], None)
+        self.assertIsNone(self.table.quote("BTC-29DEC45-50000-C"))
+
+    def test_plain_names_carry_no_prices(self):
+        self.assertEqual(len(BookSummaryTable(["BTC-29DEC45-20000-C"])), 0)
+
+    def test_top_of_book(self):
+        book = self.table.top_of_book("BTC-29DEC45-20000-C", 1, default_size=1.0)
+        self.assertEqual(book["bids"], [[0.1, 1.0]])
+        self.assertEqual(book["underlying_price"], 30000)
+        self.assertIsNone(self.table.top_of_book("BTC-29DEC45-20000-C", 2, default_size=1.0))
+
+        # Missing side is left empty, reported sizes override the default
+        self.assertEqual(self.table.top_of_book("BTC-29DEC45-30000-C", 1, default_size=1.0)["bids"], [])
+        self.assertIsNone(self.table.top_of_book("BTC-29DEC45-40000-C", 1, default_size=10.0))
+
+    def test_mark_order_book(self):
+        book = self.table.mark_order_book("BTC-29DEC45-20000-C")
+        self.assertEqual(book["bids"], [[0.11, MARK_BOOK_SIZE]])
+        self.assertEqual(book["asks"], [[0.11, MARK_BOOK_SIZE]])
+
+    def test_mark_order_book_prices_any_quantity_at_the_mark(self):
+        book = ArrayOrderBook.from_order_book(self.table.mark_order_book("BTC-29DEC45-20000-C"))
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            bid, ask = book.weighted_prices([1.0, 1e6])
+            curve = book.fill_curve()
+        self.assertEqual(bid.tolist(), [0.11, 0.11])
+        self.assertEqual(ask.tolist(), [0.11, 0.11])
+        self.assertAlmostEqual(curve["ask"]["vwap"][0], 0.11)
+
+
+class TestMarketPricerBookSummaryPricing(unittest.TestCase):
+
+    def tearDown(self):
+        MarketPricer.instruments_cache.clear()
+        MarketPricer.book_cache.clear()
+
+    def test_top_of_book_prices_from_one_summary(self):
+        pricer = MarketPricer()
+        option_data = [("BTC-29DEC45-20000-C", 1), ("BTC-29DEC45-30000-C", 0.5)]
+
+        with patch.object(MarketPricer, "_fetch_options_instruments", return_value=SUMMARY) as mock_summary, \
+                patch.object(MarketPricer, "_http_get") as mock_get:
+            result = pricer.compute_price(option_data, verbose=False, price_source='top_of_book')
+            mark = pricer.compute_price(option_data, verbose=False, price_source='mark')
+
+        mock_summary.assert_called_once()
+        mock_get.assert_not_called()
+        self.assertAlmostEqual(result["BTC-29DEC45-20000-C"][0], 0.1 * 30000)
+        self.assertAlmostEqual(result["BTC-29DEC45-30000-C"][0], 0.06 * 30000 * 0.95)
+        self.assertAlmostEqual(mark["BTC-29DEC45-20000-C"][1], 0.11 * 30000)
+
+    def test_top_of_book_falls_back_to_depth(self):
+        pricer = MarketPricer()
+        MarketPricer.instruments_cache["BTC"] = {"timestamp": datetime.now(), "instruments": InstrumentIndex(SUMMARY), "summary": BookSummaryTable(SUMMARY)}
+        depth_book = {"bids": [[0.1, 1], [0.09, 4]], "asks": [[0.12, 5]], "underlying_price": 30000}
+
+        with patch.object(MarketPricer, "_fetch_options_instruments") as mock_summary, \
+                patch.object(MarketPricer, "_http_get") as mock_get:
+            mock_get.return_value.status_code = 200
+            mock_get.return_value.json.return_value = {"result": depth_book}
+            result = pricer.compute_price([("BTC-29DEC45-20000-C", 5)], verbose=False, price_source='top_of_book')
+
+        mock_summary.assert_not_called()
+        mock_get.assert_called_once()
+        self.assertAlmostEqual(result["BTC-29DEC45-20000-C"][0], (0.1 + 0.09 * 4) / 5 * 30000)
+
+    def test_invalid_price_source(self):
+        with self.assertRaises(ValueError):
+            MarketPricer().compute_price([("BTC-29DEC45-20000-C", 1)], price_source='last')
+
+
+if __name__ == "__main__":
+    unittest.main()
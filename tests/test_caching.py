@@ -0,0 +1,110 @@
+import threading
+import unittest
+from unittest.mock import patch
+from pricer.caching import SpotPriceCache, OrderBookCache
+
+class TestSpotPriceCache(unittest.TestCase):
+
+    def test_get_caches_within_ttl(self):
+        cache = SpotPriceCache(ttl=60)
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return 27000.0, 'coingecko'
+
+        first = cache.get("BTC", "usd", fetch)
+        second = cache.get("BTC", "usd", fetch)
+
+        self.assertIs(first, second)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(first.source, 'coingecko')
+        self.assertGreaterEqual(first.age, 0)
+
+        # Different currency is a different key, a zero ttl forces a refetch
+        cache.get("BTC", "eur", fetch)
+        cache.get("BTC", "usd", fetch, ttl=0)
+        self.assertEqual(len(calls), 3)
+
+    def test_get_refetches_stale_quotes(self):
+        cache = SpotPriceCache(ttl=5)
+        quote = cache.get("ETH", "usd", lambda: (1800.0, 'deribit_index'))
+
+        with patch("pricer.caching.time.time", return_value=quote.fetched_at + 10):
+            refreshed = cache.get("ETH", "usd", lambda: (1810.0, 'coingecko'))
+        self.assertEqual(refreshed.price, 1810.0)
+
+    def test_concurrent_requests_are_coalesced(self):
+        cache = SpotPriceCache(ttl=60)
+        release = threading.Event()
+        calls = []
+
+        def slow_fetch():
+            calls.append(1)
+            release.wait(5)
+            return 27000.0, 'coingecko'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get("BTC", "usd", slow_fetch))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([quote.price for quote in results], [27000.0] * 8)
+
+    def test_fetch_errors_are_not_cached(self):
+        cache = SpotPriceCache(ttl=60)
+
+        def failing_fetch():
+            raise ValueError("Failed to fetch spot price for BTC")
+
+        with self.assertRaises(ValueError):
+            cache.get("BTC", "usd", failing_fetch)
+        self.assertEqual(cache.get("BTC", "usd", lambda: (27000.0, 'coingecko')).price, 27000.0)
+
+
+class TestOrderBookCache(unittest.TestCase):
+
+    def test_get_respects_max_age_and_cycle(self):
+        cache = OrderBookCache()
+        self.assertIsNone(cache.get("BTC-29DEC45-20000-C"))
+
+        snapshot = cache.put("BTC-29DEC45-20000-C", {"bids": [[0.1, 1]], "asks": []})
+        self.assertIs(cache.get("BTC-29DEC45-20000-C", max_age=60).book, snapshot.book)
+        self.assertIs(cache.get("BTC-29DEC45-20000-C", fetched_since=snapshot.fetched_at).book, snapshot.book)
+        self.assertIsNone(cache.get("BTC-29DEC45-20000-C", fetched_since=snapshot.fetched_at + 1))
+        self.assertIsNone(cache.get("BTC-29DEC45-20000-C"))
+
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 3))
+
+    def test_lru_eviction_by_entries(self):
+        cache = OrderBookCache(max_entries=2)
+        cache.put("A", {"bids": [], "asks": []})
+        cache.put("B", {"bids": [], "asks": []})
+        cache.get("A", max_age=60)
+        cache.put("C", {"bids": [], "asks": []})
+
+        self.assertIn("A", cache)
+        self.assertNotIn("B", cache)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_lru_eviction_by_bytes(self):
+        book = {"bids": [[0.1, 1]] * 10, "asks": [[0.2, 1]] * 10}
+        cache = OrderBookCache(max_bytes=cache_size_for(book) * 2)
+        for name in ["A", "B", "C"]:
+            cache.put(name, book)
+
+        self.assertEqual(len(cache), 2)
+        self.assertLessEqual(cache.stats()["bytes"], cache.max_bytes)
+
+
+def cache_size_for(book):
+    return OrderBookCache().put("probe", book).size
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import pickle
+from datetime import datetime
+import numpy as np
+from pricer.contracts import ContractBatch, OptionContract
+from pricer.utils import year_fraction
+
+class TestOptionContract(unittest.TestCase):
+
+    def test_from_string(self):
+        contract = OptionContract.from_string("BTC-5JAN24-30000-P")
+
+        self.assertEqual((contract.underlying, contract.expiry, contract.strike, contract.is_call), ("BTC", "5JAN24", 30000.0, False))
+        self.assertEqual(contract.name, "BTC-5JAN24-30000-P")
+        self.assertEqual(contract.expiry_date, datetime(2024, 1, 5))
+        with self.assertRaises(ValueError):
+            OptionContract.from_string("BTC-INVALID-30000-C")
+
+    def test_immutable_hashable_and_picklable(self):
+        contract = OptionContract.from_string("ETH-29DEC23-2500.5-C")
+
+        with self.assertRaises(AttributeError):
+            contract.strike = 2600.0
+        with self.assertRaises(AttributeError):
+            contract.extra = 1
+        self.assertEqual(pickle.loads(pickle.dumps(contract)), contract)
+        self.assertEqual(len({contract, OptionContract("ETH", "29DEC23", 2500.5, True)}), 1)
+        self.assertEqual(contract.name, "ETH-29DEC23-2500.5-C")
+
+
+class TestContractBatch(unittest.TestCase):
+
+    def test_parse_builds_columns(self):
+        batch = ContractBatch.parse([("BTC-29DEC23-30000-C", 2), ("ETH-29DEC23-2000-P", 5), ("BTC-26JAN24-35000-P", 1)])
+
+        self.assertEqual(batch.underlyings, ("BTC", "ETH"))
+        self.assertEqual(batch.underlying.tolist(), [0, 1, 0])
+        self.assertEqual(batch.underlying_names.tolist(), ["BTC", "ETH", "BTC"])
+        self.assertEqual(batch.expiry.tolist(), [datetime(2023, 12, 29).toordinal()] * 2 + [datetime(2024, 1, 26).toordinal()])
+        self.assertEqual(batch.strike.tolist(), [30000.0, 2000.0, 35000.0])
+        self.assertEqual(batch.is_call.tolist(), [True, False, False])
+        self.assertEqual(batch.quantity.tolist(), [2.0, 5.0, 1.0])
+        self.assertEqual(batch[1], OptionContract.from_string("ETH-29DEC23-2000-P"))
+        self.assertEqual(batch.option_data()[0], ("BTC-29DEC23-30000-C", 2.0))
+        self.assertIs(ContractBatch.parse(batch), batch)
+
+    def test_time_to_expiry_matches_year_fraction(self):
+        valuation_time = datetime(2023, 12, 1, 12)
+        batch = ContractBatch.parse(["BTC-29DEC23-30000-C", "BTC-26JAN24-35000-P"])
+
+        np.testing.assert_allclose(batch.time_to_expiry(valuation_time),
+                                   [year_fraction("29DEC23", valuation_time), year_fraction("26JAN24", valuation_time)])
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            ContractBatch.parse("BTC-29DEC23-30000-C")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import time
+import unittest
+from datetime import datetime
+import numpy as np
+from pricer.book_summary import BookSummaryTable
+from pricer.implied_volatility import black76, chain_implied_volatility, implied_volatility
+
+class TestImpliedVolatility(unittest.TestCase):
+
+    def test_round_trip_across_moneyness(self):
+        rng = np.random.default_rng(7)
+        n = 1000
+        forward = 30000.0
+        strike = forward * np.exp(rng.uniform(-1.5, 1.5, n))
+        t = rng.uniform(1 / 365, 2.0, n)
+        vol = rng.uniform(0.2, 2.0, n)
+        is_call = rng.random(n) < 0.5
+
+        price = black76(forward, strike, t, vol, is_call)
+        solved = implied_volatility(price, forward, strike, t, is_call)
+
+        # Quotes worth less than a rounding error of the price carry no volatility information
+        informative = (price - black76(forward, strike, t, 0.0001, is_call)) > 1e-8 * forward
+        np.testing.assert_allclose(solved[informative], vol[informative], rtol=1e-6)
+
+    def test_deep_itm_and_otm(self):
+        forward, t, vol = 30000.0, 0.5, 0.8
+        strikes = np.array([1000.0, 5000.0, 200000.0])
+        for is_call in (True, False):
+            price = black76(forward, strikes, t, vol, is_call)
+            np.testing.assert_allclose(implied_volatility(price, forward, strikes, t, is_call), vol, rtol=1e-5)
+
+    def test_arbitrage_violations_return_nan(self):
+        forward = 30000.0
+        prices = [
+            9000.0,   # call below intrinsic (F - K = 10000)
+            31000.0,  # call above the forward
+            -1.0,     # negative price
+            25000.0,  # put above its strike
+        ]
+        strikes = [20000.0, 20000.0, 30000.0, 20000.0]
+        is_call = [True, True, True, False]
+
+        self.assertTrue(np.isnan(implied_volatility(prices, forward, strikes, 0.5, is_call)).all())
+        self.assertTrue(np.isnan(implied_volatility(100.0, forward, 30000.0, 0.0)))
+
+    def test_discounting_and_shape(self):
+        price = black76(30000.0, [[25000.0, 35000.0]], 1.0, 0.6, discount_factor=0.97)
+        solved = implied_volatility(price, 30000.0, [[25000.0, 35000.0]], 1.0, discount_factor=0.97)
+
+        self.assertEqual(solved.shape, (1, 2))
+        np.testing.assert_allclose(solved, 0.6, rtol=1e-8)
+
+    def test_chain_from_book_summary(self):
+        valuation_time = datetime(2023, 6, 1, 8)
+        t = (datetime(2023, 12, 29, 8) - valuation_time).total_seconds() / (365 * 24 * 3600)
+        names = ["BTC-29DEC23-25000-P", "BTC-29DEC23-30000-C", "BTC-29DEC23-40000-C"]
+        strikes = np.array([25000.0, 30000.0, 40000.0])
+        marks = black76(28000.0, strikes, t, 0.55, [False, True, True]) / 28000.0
+        summary = BookSummaryTable([
+            {"instrument_name": name, "mark_price": mark, "underlying_price": 28000.0} for name, mark in zip(names, marks)
+        ] + [{"instrument_name": "BTC-29DEC23-50000-C", "mark_price": None, "underlying_price": 28000.0}])
+
+        solved = chain_implied_volatility(summary, valuation_time=valuation_time)
+        np.testing.assert_allclose(solved[:3], 0.55, rtol=1e-8)
+        self.assertTrue(np.isnan(solved[3]))
+
+    def test_full_chain_speed(self):
+        n = 1000
+        strike = np.linspace(5000, 150000, n)
+        t = np.repeat(np.linspace(0.01, 1.5, 10), n // 10)
+        price = black76(30000.0, strike, t, 0.7)
+
+        start = time.perf_counter()
+        implied_volatility(price, 30000.0, strike, t)
+        self.assertLess(time.perf_counter() - start, 0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
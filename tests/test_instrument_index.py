@@ -0,0 +1,50 @@
+import unittest
+from datetime import datetime
+import numpy as np
+from pricer.instrument_index import InstrumentIndex, bracket_strikes
+
+INSTRUMENTS = [
+    "BTC-29DEC23-30000-C", "BTC-29DEC23-20000-C", "BTC-29DEC23-25000-C", "BTC-29DEC23-25000-P",
+    "BTC-5JAN24-30000-C", "BTC-26JAN24-30000-C", "BTC-27SEP24-40000-C",
+]
+
+class TestInstrumentIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = InstrumentIndex(INSTRUMENTS)
+
+    def test_membership(self):
+        self.assertIn("BTC-29DEC23-25000-P", self.index)
+        self.assertNotIn("BTC-29DEC23-26000-P", self.index)
+        self.assertEqual(len(self.index), len(INSTRUMENTS))
+
+    def test_accepts_book_summary_entries(self):
+        index = InstrumentIndex([{"instrument_name": name} for name in INSTRUMENTS])
+        self.assertIn("BTC-5JAN24-30000-C", index)
+
+    def test_expiries_are_sorted_dates(self):
+        self.assertEqual(self.index.expiries, ["29DEC23", "5JAN24", "26JAN24", "27SEP24"])
+        self.assertEqual(self.index.expiry_dates["5JAN24"], datetime(2024, 1, 5))
+
+    def test_strikes_split_by_kind(self):
+        self.assertEqual(list(self.index.strikes_for("29DEC23", "C")), [20000, 25000, 30000])
+        self.assertEqual(list(self.index.strikes_for("29DEC23", "P")), [25000])
+        self.assertEqual(len(self.index.strikes_for("5JAN24", "P")), 0)
+
+    def test_bracket_expiries(self):
+        lower, upper, weight = self.index.bracket_expiries(["1JAN24", "5JAN24", "1DEC23", "1JAN25"])
+        self.assertEqual(lower.tolist(), [0, 1, 0, 3])
+        self.assertEqual(upper.tolist(), [1, 1, 0, 3])
+        np.testing.assert_allclose(weight, [3 / 7, 0.0, 0.0, 0.0])
+        times = self.index.expiry_times(datetime(2023, 12, 29, 8))
+        np.testing.assert_allclose(times[:2], [0.0, 7 / 365])
+
+    def test_bracket_strikes_vectorized(self):
+        lower, upper, weight = bracket_strikes([20000.0, 25000.0, 30000.0], [10000, 22000, 25000, 35000])
+        self.assertEqual(lower.tolist(), [0, 0, 1, 2])
+        self.assertEqual(upper.tolist(), [0, 1, 1, 2])
+        np.testing.assert_allclose(weight, [0.0, 0.4, 0.0, 0.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
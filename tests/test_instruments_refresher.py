@@ -0,0 +1,92 @@
+import threading
+import time
+import unittest
+from datetime import timedelta
+from benchmarks.fixtures import FixtureTransport, synthetic_fixtures
+from pricer.market_pricing import MarketPricer
+
+class BlockingTransport(FixtureTransport):
+    """Holds book summary downloads until released."""
+
+    def __init__(self, fixtures):
+        super().__init__(fixtures)
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def get(self, url, params=None):
+        if "get_book_summary_by_currency" in url:
+            self.started.set()
+            self.release.wait(5.0)
+        return super().get(url, params)
+
+
+class TestInstrumentsRefresher(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = BlockingTransport(synthetic_fixtures(spots={"BTC": 30000.0, "ETH": 2000.0}, expiry_days=(30,), levels=1))
+
+    def tearDown(self):
+        MarketPricer.use_instruments_refresher(None)
+        MarketPricer.instruments_cache.clear()
+
+    def age(self, underlying, days=2):
+        MarketPricer.instruments_cache[underlying]["timestamp"] -= timedelta(days=days)
+        return MarketPricer.instruments_cache[underlying]["timestamp"]
+
+    def test_refresh_loads_every_underlying(self):
+        refresher = MarketPricer.use_instruments_refresher(["btc", "ETH"], transport=self.transport)
+        # The first refresh runs as soon as the refresher starts
+        refresher.refresh()
+
+        for underlying in ("BTC", "ETH"):
+            self.assertGreater(len(MarketPricer.instruments_cache[underlying]["instruments"]), 0)
+        self.assertEqual(refresher.errors, {})
+
+    def test_stale_catalogue_is_served_during_a_refresh(self):
+        MarketPricer.update_instruments_cache("BTC", transport=self.transport)
+        stale = self.age("BTC")
+
+        self.transport.release.clear()
+        self.transport.started.clear()
+        downloader = threading.Thread(target=MarketPricer.update_instruments_cache, args=("BTC",), kwargs={"transport": self.transport})
+        downloader.start()
+        self.transport.started.wait(5.0)
+
+        # A second caller does not queue behind the download
+        start = time.monotonic()
+        MarketPricer.update_instruments_cache("BTC", transport=self.transport)
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual(MarketPricer.instruments_cache["BTC"]["timestamp"], stale)
+
+        self.transport.release.set()
+        downloader.join()
+        self.assertGreater(MarketPricer.instruments_cache["BTC"]["timestamp"], stale)
+
+    def test_stale_quote_requests_a_background_refresh(self):
+        MarketPricer.use_instruments_refresher(["BTC"], interval=3600.0, transport=self.transport)
+        deadline = time.monotonic() + 5.0
+        while "BTC" not in MarketPricer.instruments_cache and time.monotonic() < deadline:
+            time.sleep(0.01)
+        stale = self.age("BTC")
+
+        requests = self.transport.requests
+        MarketPricer.update_instruments_cache("BTC", transport=self.transport)
+        self.assertEqual(MarketPricer.instruments_cache["BTC"]["timestamp"], stale)
+
+        while MarketPricer.instruments_cache["BTC"]["timestamp"] == stale and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertGreater(MarketPricer.instruments_cache["BTC"]["timestamp"], stale)
+        self.assertEqual(self.transport.requests, requests + 1)
+
+    def test_failed_refresh_keeps_the_previous_catalogue(self):
+        refresher = MarketPricer.use_instruments_refresher(["BTC", "SOL"], interval=3600.0, transport=self.transport)
+        refresher.refresh()
+
+        self.assertIn("SOL", refresher.errors)
+        self.assertIn("BTC", MarketPricer.instruments_cache)
+        self.assertNotIn("BTC", refresher.errors)
+
+
+if __name__ == "__main__":
+    unittest.main()
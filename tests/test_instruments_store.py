@@ -0,0 +1,62 @@
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from pricer.instruments_store import InstrumentsStore
+from pricer.market_pricing import MarketPricer
+
+INSTRUMENTS = ["BTC-29DEC45-20000-C", "BTC-29DEC45-20000-P"]
+
+class TestInstrumentsStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = InstrumentsStore(self.directory.name)
+
+    def tearDown(self):
+        MarketPricer.instruments_store = None
+        MarketPricer.instruments_cache.clear()
+        self.directory.cleanup()
+
+    def test_save_and_load(self):
+        self.assertIsNone(self.store.load("BTC"))
+
+        timestamp = datetime(2023, 5, 1, 12, 0, 0)
+        self.store.save("BTC", INSTRUMENTS, timestamp)
+        self.assertEqual(self.store.load("BTC"), (timestamp, INSTRUMENTS))
+
+        # Another store on the same directory (eg. another worker) sees the same data
+        self.assertEqual(InstrumentsStore(self.directory.name).load("BTC"), (timestamp, INSTRUMENTS))
+        self.assertEqual(self.store.timestamps(), {"BTC": timestamp})
+
+    def test_save_never_replaces_newer_catalogue(self):
+        newer = datetime(2023, 5, 2)
+        self.store.save("BTC", INSTRUMENTS, newer)
+        self.store.save("BTC", INSTRUMENTS[:1], newer - timedelta(hours=1))
+
+        self.assertEqual(self.store.load("BTC"), (newer, INSTRUMENTS))
+
+    def test_update_instruments_cache_warm_start(self):
+        MarketPricer.use_instruments_store(self.directory.name)
+        self.store.save("BTC", INSTRUMENTS, datetime.now())
+
+        with patch.object(MarketPricer, "_fetch_options_instruments") as mock_fetch:
+            MarketPricer.update_instruments_cache("BTC-29DEC45-20000-C")
+        mock_fetch.assert_not_called()
+        self.assertIn("BTC-29DEC45-20000-P", MarketPricer.instruments_cache["BTC"]["instruments"])
+
+    def test_update_instruments_cache_refreshes_stale_store(self):
+        MarketPricer.use_instruments_store(self.directory.name)
+        self.store.save("BTC", INSTRUMENTS[:1], datetime.now() - timedelta(days=2))
+
+        with patch.object(MarketPricer, "_fetch_options_instruments", return_value=INSTRUMENTS) as mock_fetch:
+            MarketPricer.update_instruments_cache("BTC-29DEC45-20000-C")
+        mock_fetch.assert_called_once()
+
+        timestamp, instruments = self.store.load("BTC")
+        self.assertEqual(instruments, INSTRUMENTS)
+        self.assertEqual(timestamp, MarketPricer.instruments_cache["BTC"]["timestamp"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+from datetime import datetime
+import numpy as np
+from unittest.mock import patch
+from pricer.book_summary import BookSummaryTable
+from pricer.implied_volatility import black76
+from pricer.local_volatility import LocalVolatilityPricer, LocalVolatilitySurface
+from pricer.market_pricing import MarketPricer
+
+VALUATION_TIME = datetime(2023, 6, 1, 8)
+EXPIRIES = ["30JUN23", "29SEP23", "29DEC23"]
+
+def flat_summary(iv_percent=60.0, forward=30000.0):
+    return BookSummaryTable([
+        {"instrument_name": f"BTC-{expiry}-{strike}-{kind}", "mark_iv": iv_percent, "underlying_price": forward}
+        for expiry in EXPIRIES for strike in range(10000, 70001, 5000) for kind in "CP"
+    ])
+
+class TestLocalVolatilitySurface(unittest.TestCase):
+
+    def test_flat_implied_gives_flat_local_vol(self):
+        k = np.linspace(-1, 1, 21)
+        surface = LocalVolatilitySurface.from_implied([0.25, 0.5, 1.0], [(k, np.full(21, 0.6))] * 3, [30000.0] * 3)
+
+        np.testing.assert_allclose(surface.local_vol, 0.6, rtol=1e-6)
+        self.assertTrue(surface.local_vol.flags["C_CONTIGUOUS"])
+
+    def test_lookup_is_bilinear_and_clamped(self):
+        surface = LocalVolatilitySurface([0.0, 1.0], [-1.0, 1.0], [[0.2, 0.4], [0.6, 0.8]], [1.0], [30000.0])
+
+        np.testing.assert_allclose(surface.lookup([0.0, -5.0, 5.0], [0.5, 0.5, 2.0]), [0.5, 0.4, 0.8])
+
+    def test_skew_raises_local_vol_on_the_downside(self):
+        k = np.linspace(-1, 1, 41)
+        skew = 0.6 - 0.1 * k
+        surface = LocalVolatilitySurface.from_implied([0.25, 0.5, 1.0], [(k, skew)] * 3, [30000.0] * 3)
+
+        self.assertGreater(surface.lookup(-0.5, 0.5), surface.lookup(0.5, 0.5))
+
+
+class TestLocalVolatilityPricer(unittest.TestCase):
+
+    def setUp(self):
+        MarketPricer.instruments_cache["BTC"] = {"timestamp": datetime.now(), "summary": flat_summary()}
+        LocalVolatilityPricer.surface_cache.clear()
+
+    def tearDown(self):
+        MarketPricer.instruments_cache.clear()
+        LocalVolatilityPricer.surface_cache.clear()
+
+    def test_surface_is_cached_until_market_data_changes(self):
+        first = LocalVolatilityPricer.calibrate("BTC", update_cache=False, valuation_time=VALUATION_TIME)
+        self.assertIs(LocalVolatilityPricer.calibrate("BTC", update_cache=False, valuation_time=VALUATION_TIME), first)
+
+        MarketPricer.instruments_cache["BTC"] = {"timestamp": datetime.now(), "summary": flat_summary(iv_percent=70.0)}
+        second = LocalVolatilityPricer.calibrate("BTC", update_cache=False, valuation_time=VALUATION_TIME)
+        self.assertIsNot(second, first)
+        np.testing.assert_allclose(second.local_vol, 0.7, rtol=1e-6)
+
+    def test_surface_is_rebuilt_for_another_valuation_time(self):
+        first = LocalVolatilityPricer.calibrate("BTC", update_cache=False, valuation_time=VALUATION_TIME)
+        later = LocalVolatilityPricer.calibrate("BTC", update_cache=False, valuation_time=datetime(2023, 7, 1, 8))
+
+        self.assertIsNot(later, first)
+        # 30JUN23 has expired by then, the time axis starts from the new valuation time
+        self.assertEqual(len(later.forward_times), 2)
+        np.testing.assert_allclose(later.forward_times[0], (datetime(2023, 9, 29, 8) - datetime(2023, 7, 1, 8)).days / 365)
+        self.assertEqual(later.elapsed(datetime(2023, 7, 1, 8)), 0.0)
+        self.assertAlmostEqual(first.elapsed(datetime(2023, 7, 1, 8)), 30 / 365)
+
+    def test_compute_price_matches_black_under_flat_vol(self):
+        pricer = LocalVolatilityPricer(n_paths=40000, steps_per_year=52, seed=1)
+        option_data = [("BTC-29SEP23-30000-C", 1), ("BTC-29SEP23-25000-P", 2), ("BTC-29DEC23-40000-C", 1)]
+
+        result = pricer.compute_price(option_data, update_cache=False, valuation_time=VALUATION_TIME)
+
+        t = np.array([(datetime(2023, 9, 29, 8) - VALUATION_TIME).days, (datetime(2023, 9, 29, 8) - VALUATION_TIME).days,
+                      (datetime(2023, 12, 29, 8) - VALUATION_TIME).days]) / 365
+        expected = black76(30000.0, [30000.0, 25000.0, 40000.0], t, 0.6, [True, False, True])
+        self.assertTrue(np.all(np.abs(result["price"] - expected) < 4 * result["standard_error"]))
+        np.testing.assert_allclose(result["quantity"], [1, 2, 1])
+
+    def test_compute_volatility(self):
+        pricer = LocalVolatilityPricer()
+        with patch("pricer.local_volatility.year_fraction", side_effect=lambda expiry, valuation_time=None: {"30JUN23": 29 / 365, "29SEP23": 120 / 365, "29DEC23": 211 / 365}[expiry]):
+            vol = pricer.compute_volatility("BTC", [20000, 30000], 0.3, update_cache=False)
+        np.testing.assert_allclose(vol, 0.6, rtol=1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
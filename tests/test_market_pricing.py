@@ -1,7 +1,11 @@
 import unittest
 from pricer.market_pricing import MarketPricer
-from unittest.mock import patch
+from pricer.instrument_index import InstrumentIndex
+from unittest.mock import patch, Mock
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+import time
+from pricer.contracts import ContractBatch
 
 class TestMarketPricerClass(MarketPricer):
     def __init__(self):
@@ -9,6 +13,12 @@ class TestMarketPricerClass(MarketPricer):
 
 class TestMarketPricer(unittest.TestCase):
 
+    def tearDown(self):
+        # The caches are class-level, keep tests independent of each other
+        TestMarketPricerClass.instruments_cache.clear()
+        TestMarketPricerClass.spot_cache.clear()
+        TestMarketPricerClass.book_cache.clear()
+
     def test_compute_price(self):
         pricer = TestMarketPricerClass()
 
@@ -123,6 +133,92 @@ class TestMarketPricer(unittest.TestCase):
             with self.assertRaises(ValueError):
                 pricer._validate_inputs(**inputs)
 
+    def test_compute_price_concurrent(self):
+        pricer = TestMarketPricerClass()
+        TestMarketPricerClass.instruments_cache["BTC"] = {
+            "timestamp": datetime.now(),
+            "instruments": InstrumentIndex(["BTC-29DEC45-20000-C", "BTC-29DEC45-30000-C"]),
+        }
+        books = {
+            "BTC-29DEC45-20000-C": {"bids": [[0.1, 5]], "asks": [[0.12, 5]], "underlying_price": 30000},
+            "BTC-29DEC45-30000-C": {"bids": [[0.05, 5]], "asks": [[0.06, 5]], "underlying_price": 30000},
+        }
+        option_data = [("BTC-29DEC45-20000-C", 1), ("BTC-29DEC45-30000-C", 2), ("BTC-29DEC45-20000-C", 3)]
+
+        with patch.object(TestMarketPricerClass, "_http_get") as mock_get:
+            mock_get.side_effect = lambda url: Mock(
+                status_code=200, json=lambda: {"result": books[url.split("instrument_name=")[1]]})
+            sequential = pricer.compute_price(option_data, update_cache=False, verbose=False)
+            self.assertEqual(mock_get.call_count, 2)
+
+            mock_get.reset_mock()
+            concurrent = pricer.compute_price(option_data, update_cache=False, verbose=False, concurrent=True)
+            # Each distinct instrument is fetched once
+            self.assertEqual(mock_get.call_count, 2)
+
+        self.assertEqual(sequential, concurrent)
+        self.assertAlmostEqual(concurrent["BTC-29DEC45-30000-C"][0], 0.05 * 30000)
+
+    def test_compute_price_spot_lookups_are_cached(self):
+        pricer = TestMarketPricerClass()
+        TestMarketPricerClass.instruments_cache["BTC"] = {
+            "timestamp": datetime.now(),
+            "instruments": InstrumentIndex(["BTC-29DEC45-20000-C", "BTC-29DEC45-30000-C"]),
+        }
+        book = {"bids": [[0.1, 5]], "asks": [[0.12, 5]], "underlying_price": 30000}
+        option_data = [("BTC-29DEC45-20000-C", 1), ("BTC-29DEC45-30000-C", 2)]
+
+        with patch.object(TestMarketPricerClass, "_fetch_option_book", return_value=book), \
+                patch("pricer.market_pricing.fetch_spot_quote", return_value=(28000.0, 'coingecko')) as mock_spot:
+            result = pricer.compute_price(option_data, future_spot='spot', update_cache=False, verbose=False)
+
+        mock_spot.assert_called_once()
+        self.assertAlmostEqual(result["BTC-29DEC45-20000-C"][0], 0.1 * 28000)
+        quote = result.spot_quotes[("BTC", "usd")]
+        self.assertEqual(quote.source, 'coingecko')
+        self.assertGreaterEqual(quote.age, 0)
+
+    def test_fetch_option_book_uses_book_cache(self):
+        pricer = TestMarketPricerClass()
+        TestMarketPricerClass.instruments_cache["BTC"] = {"timestamp": datetime.now(), "instruments": InstrumentIndex(["BTC-29DEC45-20000-C"])}
+        book = {"bids": [[0.1, 5]], "asks": [[0.12, 5]], "underlying_price": 30000}
+        option_data = [("BTC-29DEC45-20000-C", 1), ("BTC-29DEC45-20000-C", 2)]
+
+        with patch.object(TestMarketPricerClass, "_http_get", return_value=Mock(status_code=200, json=lambda: {"result": book})) as mock_get:
+            pricer.compute_price(option_data, update_cache=False, verbose=False)
+            self.assertEqual(mock_get.call_count, 1)
+
+            # A new call refetches unless the snapshot fits within the staleness budget
+            pricer.compute_price(option_data, update_cache=False, verbose=False)
+            self.assertEqual(mock_get.call_count, 2)
+            pricer.compute_price(option_data, update_cache=False, verbose=False, book_max_age=60.0)
+            self.assertEqual(mock_get.call_count, 2)
+
+        stats = TestMarketPricerClass.book_cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (4, 2))
+
+    def test_compute_price_from_several_threads(self):
+        pricer = TestMarketPricerClass()
+        names = [f"BTC-29DEC45-{strike}-C" for strike in (20000, 30000, 40000, 50000)]
+        TestMarketPricerClass.instruments_cache["BTC"] = {"timestamp": datetime.now(), "instruments": InstrumentIndex(names)}
+        books = {name: {"bids": [[0.01 * (i + 1), 5]], "asks": [[0.02 * (i + 1), 5]], "underlying_price": 30000} for i, name in enumerate(names)}
+
+        def fetch(url):
+            # Yield to the other threads in the middle of each pricing
+            time.sleep(0.001)
+            return Mock(status_code=200, json=lambda: {"result": books[url.split("instrument_name=")[1]]})
+
+        def price(name):
+            return pricer.compute_price(ContractBatch.parse([(name, 1)]), update_cache=False, verbose=False)[name]
+
+        with patch.object(TestMarketPricerClass, "_http_get", side_effect=fetch):
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                prices = list(executor.map(price, names * 5))
+
+        for name, (bid, ask) in zip(names * 5, prices):
+            self.assertAlmostEqual(bid, books[name]["bids"][0][0] * 30000)
+            self.assertAlmostEqual(ask, books[name]["asks"][0][0] * 30000)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+from datetime import datetime
+from unittest.mock import Mock, patch
+from pricer.instrument_index import InstrumentIndex
+from pricer.market_pricing import MarketPricer
+from pricer.metrics import InMemoryMetrics, NullMetrics, get_metrics, set_metrics
+
+class TestInMemoryMetrics(unittest.TestCase):
+
+    def test_counters_and_timers(self):
+        metrics = InMemoryMetrics()
+        metrics.increment("requests", endpoint="get_order_book")
+        metrics.increment("requests", 2, endpoint="get_order_book")
+        with metrics.timer("book_fetch"):
+            pass
+        metrics.increment("cache_requests", cache="book", result="hit")
+        metrics.increment("cache_requests", 3, cache="book", result="miss")
+
+        self.assertEqual(metrics.counter("requests", endpoint="get_order_book"), 3)
+        count, total, maximum = metrics.stage("book_fetch")
+        self.assertEqual(count, 1)
+        self.assertGreaterEqual(total, maximum)
+        self.assertEqual(metrics.cache_hit_ratio("book"), 0.25)
+        self.assertIsNone(metrics.cache_hit_ratio("spot"))
+
+    def test_stage_sums_labelled_timers(self):
+        metrics = InMemoryMetrics()
+        metrics.observe("stage_seconds", 0.5, stage="instruments_refresh", underlying="BTC")
+        metrics.observe("stage_seconds", 1.5, stage="instruments_refresh", underlying="ETH")
+
+        self.assertEqual(metrics.stage("instruments_refresh"), (2, 2.0, 1.5))
+        self.assertEqual(metrics.stage("instruments_refresh", underlying="ETH"), (1, 1.5, 1.5))
+        self.assertEqual(metrics.stage("book_fetch"), (0, 0.0, 0.0))
+
+    def test_prometheus_text(self):
+        metrics = InMemoryMetrics()
+        metrics.increment("requests", endpoint='get_"index"')
+        metrics.observe("stage_seconds", 0.5, stage="depth_walk")
+
+        text = metrics.to_prometheus()
+        self.assertIn("# TYPE pricer_requests_total counter\n", text)
+        self.assertIn('pricer_requests_total{endpoint="get_\\"index\\""} 1\n', text)
+        self.assertIn('pricer_stage_seconds_count{stage="depth_walk"} 1\n', text)
+        self.assertIn('pricer_stage_seconds_sum{stage="depth_walk"} 0.5\n', text)
+
+    def test_disabled_by_default(self):
+        self.assertIsInstance(get_metrics(), NullMetrics)
+        self.assertFalse(get_metrics().enabled)
+
+
+class TestPricerInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        self.metrics = set_metrics(InMemoryMetrics())
+
+    def tearDown(self):
+        set_metrics(None)
+        MarketPricer.instruments_cache.clear()
+        MarketPricer.book_cache.clear()
+        MarketPricer.spot_cache.clear()
+
+    def test_compute_price_reports_stages_requests_and_cache_hits(self):
+        pricer = MarketPricer()
+        MarketPricer.instruments_cache["BTC"] = {"timestamp": datetime.now(), "instruments": InstrumentIndex(["BTC-29DEC45-20000-C"])}
+        body = b'{"result": {"bids": [[0.1, 5]], "asks": [[0.12, 5]], "underlying_price": 30000}}'
+        response = Mock(status_code=200, content=body, json=lambda: {"result": {"bids": [[0.1, 5]], "asks": [[0.12, 5]], "underlying_price": 30000}})
+        option_data = [("BTC-29DEC45-20000-C", 1), ("BTC-29DEC45-20000-C", 2)]
+
+        with patch.object(pricer.transport, "get", return_value=response):
+            pricer.compute_price(option_data, update_cache=False, verbose=False)
+
+        self.assertEqual(self.metrics.counter("requests", endpoint="get_order_book"), 1)
+        self.assertEqual(self.metrics.counter("response_bytes", endpoint="get_order_book"), len(body))
+        self.assertEqual(self.metrics.cache_hit_ratio("book"), 0.5)
+        self.assertEqual(self.metrics.counter("options_priced"), 2)
+        self.assertEqual(self.metrics.stage("compute_price")[0], 1)
+        self.assertEqual(self.metrics.stage("depth_walk")[0], 2)
+
+    def test_instruments_cache_is_checked_once_per_option(self):
+        pricer = MarketPricer()
+        MarketPricer.instruments_cache["BTC"] = {"timestamp": datetime.now(), "instruments": InstrumentIndex(["BTC-29DEC45-20000-C"])}
+        book = {"bids": [[0.1, 5]], "asks": [[0.12, 5]], "underlying_price": 30000}
+
+        with patch.object(MarketPricer, "_fetch_option_book", return_value=book):
+            pricer.compute_price([("BTC-29DEC45-20000-C", 1)], concurrent=False, verbose=False)
+
+        self.assertEqual(self.metrics.counter("cache_requests", cache="instruments", result="hit"), 1)
+
+    def test_thin_books_are_counted(self):
+        pricer = MarketPricer()
+        pricer._weighted_price([[0.1, 5]], 2)
+        pricer._weighted_price([[0.1, 5]], 8)
+
+        self.assertEqual(self.metrics.counter("insufficient_depth"), 1)
+
+    def test_verbose_progress_goes_to_the_log(self):
+        pricer = MarketPricer()
+        MarketPricer.instruments_cache["BTC"] = {"timestamp": datetime.now(), "instruments": InstrumentIndex(["BTC-29DEC45-20000-C"])}
+        book = {"bids": [[0.1, 5]], "asks": [[0.12, 5]], "underlying_price": 30000}
+
+        with patch.object(MarketPricer, "_fetch_option_book", return_value=book), \
+                self.assertLogs("pricer.market_pricing", level="INFO") as logs:
+            pricer.compute_price([("BTC-29DEC45-20000-C", 1)], update_cache=False)
+        self.assertIn("INFO:pricer.market_pricing:Fetching order book for BTC-29DEC45-20000-C...", logs.output)
+
+
+if __name__ == "__main__":
+    unittest.main()
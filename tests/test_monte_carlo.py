@@ -0,0 +1,72 @@
+import unittest
+import numpy as np
+from pricer.black_scholes import black_scholes
+from pricer.monte_carlo import (
+    AsianPayoff, BarrierPayoff, EuropeanPayoff, GeometricBrownianMotion, MonteCarloPricer, VolatilityFunctionDynamics,
+)
+
+def flat_volatility(spot, t):
+    return np.full(spot.shape, 0.6)
+
+class TestMonteCarloPricer(unittest.TestCase):
+
+    def test_european_matches_black_scholes(self):
+        pricer = MonteCarloPricer(n_paths=40000, steps_per_year=4, chunk_size=10000, n_workers=1, seed=7)
+        expected = black_scholes(30000.0, 32000.0, 0.5, 0.6, 0.03, greeks=False)["price"]
+
+        result = pricer.compute_price(EuropeanPayoff(32000.0), 30000.0, 0.5, GeometricBrownianMotion(0.6), interest_rate=0.03)
+        self.assertEqual(result["n_paths"], 40000)
+        self.assertLess(abs(result["price"] - expected), 4 * result["standard_error"])
+
+    def test_simulates_the_requested_number_of_paths(self):
+        arguments = (EuropeanPayoff(32000.0), 30000.0, 0.5, GeometricBrownianMotion(0.6))
+        for n_paths, simulated in ((100, 100), (25001, 25002), (1, 4)):
+            pricer = MonteCarloPricer(n_paths=n_paths, steps_per_year=4, chunk_size=10000, n_workers=1, seed=7)
+            self.assertEqual(pricer.compute_price(*arguments)["n_paths"], simulated)
+
+    def test_control_variate_reduces_standard_error(self):
+        pricer = MonteCarloPricer(n_paths=20000, steps_per_year=4, n_workers=1, seed=1)
+        payoff, dynamics = EuropeanPayoff(25000.0), GeometricBrownianMotion(0.6)
+
+        plain = pricer.compute_price(payoff, 30000.0, 0.5, dynamics, control_variate=False)
+        controlled = pricer.compute_price(payoff, 30000.0, 0.5, dynamics)
+        self.assertLess(controlled["standard_error"], plain["standard_error"] / 2)
+
+    def test_volatility_function_dynamics_matches_gbm(self):
+        pricer = MonteCarloPricer(n_paths=20000, steps_per_year=12, n_workers=1, seed=3)
+        expected = black_scholes(30000.0, 30000.0, 0.5, 0.6, greeks=False)["price"]
+
+        result = pricer.compute_price(EuropeanPayoff(30000.0, is_call=False), 30000.0, 0.5, VolatilityFunctionDynamics(flat_volatility))
+        self.assertLess(abs(result["price"] - expected), 4 * result["standard_error"])
+
+    def test_path_dependent_payoffs_are_cheaper_than_european(self):
+        pricer = MonteCarloPricer(n_paths=10000, steps_per_year=52, n_workers=1, seed=5)
+        dynamics = GeometricBrownianMotion(0.6)
+        european = pricer.compute_price(EuropeanPayoff(30000.0), 30000.0, 0.5, dynamics)["price"]
+
+        self.assertLess(pricer.compute_price(AsianPayoff(30000.0), 30000.0, 0.5, dynamics)["price"], european)
+        self.assertLess(pricer.compute_price(BarrierPayoff(30000.0, 40000.0), 30000.0, 0.5, dynamics)["price"], european)
+
+    def test_same_seed_same_price_for_any_worker_count(self):
+        arguments = (EuropeanPayoff(30000.0), 30000.0, 0.25, GeometricBrownianMotion(0.6))
+        single = MonteCarloPricer(n_paths=4000, steps_per_year=4, chunk_size=1000, n_workers=1, seed=11).compute_price(*arguments)
+        with MonteCarloPricer(n_paths=4000, steps_per_year=4, chunk_size=1000, n_workers=2, seed=11) as pricer:
+            pooled = pricer.compute_price(*arguments)
+            # The pool outlives the call and serves the next one
+            executor = pricer._executor
+            self.assertEqual(pricer.compute_price(*arguments), pooled)
+            self.assertIs(pricer._executor, executor)
+        self.assertIsNone(pricer._executor)
+
+        self.assertEqual(single, pooled)
+
+    def test_invalid_inputs(self):
+        pricer = MonteCarloPricer(n_workers=1)
+        with self.assertRaises(ValueError):
+            pricer.compute_price(EuropeanPayoff(30000.0), 30000.0, 0.0, GeometricBrownianMotion(0.6))
+        with self.assertRaises(ValueError):
+            GeometricBrownianMotion(0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+import unittest
+from datetime import datetime, timedelta
+import numpy as np
+from unittest.mock import patch
+from pricer.book_summary import BookSummaryTable
+from pricer.implied_volatility import black76
+from pricer.instrument_index import InstrumentIndex
+from pricer.market_pricing import MarketPricer
+from pricer.metrics import InMemoryMetrics, set_metrics
+from pricer.option_interpolation import OptionInterpolator
+from pricer.utils import year_fraction
+from pricer.volatility_smile import fit_variance_smiles
+
+INSTRUMENTS = ["BTC-29DEC23-20000-C", "BTC-29DEC23-30000-C", "BTC-29DEC23-25000-P", "BTC-26JAN24-30000-C"]
+FORWARD = 30000.0
+# Live expiries, so that the smiles are fitted on positive times to expiry
+NEAR, FAR, MIDDLE = ((datetime.utcnow() + timedelta(days=days)).strftime("%d%b%y").upper() for days in (30, 120, 75))
+
+def flat_summary(bid_vol=0.6, ask_vol=0.65, expiries=(NEAR, FAR)):
+    entries = []
+    for expiry in expiries:
+        t = year_fraction(expiry)
+        for strike in range(20000, 40001, 5000):
+            for kind in "CP":
+                entry = {"instrument_name": f"BTC-{expiry}-{strike}-{kind}", "underlying_price": FORWARD}
+                for column, vol in (("bid_price", bid_vol), ("ask_price", ask_vol)):
+                    if vol is not None:
+                        entry[column] = float(black76(FORWARD, strike, t, vol, kind == "C")) / FORWARD
+                entries.append(entry)
+    return BookSummaryTable(entries)
+
+class TestOptionInterpolator(unittest.TestCase):
+
+    def test_accepts_instrument_list_or_index(self):
+        index = InstrumentIndex(INSTRUMENTS)
+        self.assertIs(OptionInterpolator(index, None).data_source, index)
+        self.assertIn("BTC-26JAN24-30000-C", OptionInterpolator(INSTRUMENTS, None).data_source)
+
+
+class TestCubicSplineInterpolation(unittest.TestCase):
+
+    def setUp(self):
+        OptionInterpolator.smile_cache.clear()
+        self.pricer = MarketPricer()
+        self.pricer.option_underlying = "BTC"
+        self.pricer.option_type = "call"
+
+    def tearDown(self):
+        MarketPricer.instruments_cache.clear()
+        OptionInterpolator.smile_cache.clear()
+
+    def interpolator(self, summary):
+        MarketPricer.instruments_cache["BTC"] = {"timestamp": datetime.now(), "summary": summary,
+                                                 "instruments": InstrumentIndex(summary.names)}
+        return OptionInterpolator(MarketPricer.instruments_cache["BTC"]["instruments"], self.pricer)
+
+    def test_flat_smile_reprices_black(self):
+        interpolator = self.interpolator(flat_summary())
+        strikes = np.array([22500.0, 27500.0, 32500.0])
+
+        price = interpolator.cubic_spline_interpolation(strikes, NEAR)
+        t = year_fraction(NEAR)
+        np.testing.assert_allclose(price["bid"], black76(FORWARD, strikes, t, 0.6), rtol=1e-6)
+        np.testing.assert_allclose(price["ask"], black76(FORWARD, strikes, t, 0.65), rtol=1e-6)
+
+    def test_non_listed_expiry_interpolates_total_variance(self):
+        interpolator = self.interpolator(flat_summary())
+
+        price = interpolator.cubic_spline_interpolation(27500.0, MIDDLE, option_kind="P")
+        expected = black76(FORWARD, 27500.0, year_fraction(MIDDLE), 0.6, is_call=False)
+        self.assertAlmostEqual(price["bid"] / expected, 1.0, places=6)
+        self.assertIsInstance(price["bid"], float)
+
+    def test_smiles_are_fitted_once_per_summary(self):
+        interpolator = self.interpolator(flat_summary())
+
+        with patch("pricer.option_interpolation.fit_variance_smiles", wraps=fit_variance_smiles) as fit:
+            interpolator.cubic_spline_interpolation(27500.0, NEAR)
+            interpolator.cubic_spline_interpolation([22500.0, 37500.0], FAR)
+            self.assertEqual(fit.call_count, 1)
+
+            self.interpolator(flat_summary(bid_vol=0.7))
+            interpolator.cubic_spline_interpolation(27500.0, NEAR)
+            self.assertEqual(fit.call_count, 2)
+
+    def test_missing_side_uses_spread(self):
+        interpolator = self.interpolator(flat_summary(bid_vol=None))
+
+        price = interpolator.cubic_spline_interpolation(27500.0, NEAR, bid_spread=0.1)
+        self.assertAlmostEqual(price["bid"], price["ask"] * 0.9)
+
+    def test_no_order_book_is_fetched(self):
+        self.interpolator(flat_summary())
+
+        with patch.object(MarketPricer, "_fetch_option_book") as fetch:
+            price = self.pricer.compute_price([(f"BTC-{NEAR}-27500-C", 1.0)], interpolation_method="cubic_spline",
+                                              update_cache=False, verbose=False)
+        fetch.assert_not_called()
+        self.assertAlmostEqual(price[f"BTC-{NEAR}-27500-C"][0] / float(black76(FORWARD, 27500.0, year_fraction(NEAR), 0.6)), 1.0, places=6)
+
+
+def one_level_book(bid, ask, underlying_price=FORWARD):
+    return {"bids": [[bid, 100.0]] if bid else [], "asks": [[ask, 100.0]] if ask else [], "underlying_price": underlying_price}
+
+
+class TestBatchInterpolation(unittest.TestCase):
+
+    def setUp(self):
+        names = [f"BTC-{NEAR}-20000-C", f"BTC-{NEAR}-30000-C", f"BTC-{NEAR}-30000-P", f"BTC-{FAR}-20000-C", f"BTC-{FAR}-30000-C"]
+        MarketPricer.instruments_cache["BTC"] = {"timestamp": datetime.now(), "instruments": InstrumentIndex(names),
+                                                 "summary": BookSummaryTable(names)}
+        self.books = {
+            f"BTC-{NEAR}-20000-C": one_level_book(0.40, 0.42),
+            f"BTC-{NEAR}-30000-C": one_level_book(0.10, 0.12),
+            f"BTC-{NEAR}-30000-P": one_level_book(None, 0.05),
+            f"BTC-{FAR}-20000-C": one_level_book(0.50, 0.52),
+            f"BTC-{FAR}-30000-C": one_level_book(0.20, 0.22),
+        }
+        self.fetched = []
+
+    def tearDown(self):
+        MarketPricer.instruments_cache.clear()
+
+    def fetch(self, instrument_name=None):
+        self.fetched.append(instrument_name)
+        return self.books[instrument_name]
+
+    def test_neighbour_books_are_fetched_once_for_the_batch(self):
+        pricer = MarketPricer()
+        option_data = [(f"BTC-{NEAR}-{strike}-C", 1.0) for strike in (21000, 25000, 27500, 29000)]
+
+        with patch.object(MarketPricer, "_fetch_option_book", side_effect=self.fetch):
+            prices = pricer.compute_price(option_data, verbose=False, update_cache=False)
+
+        self.assertEqual(sorted(self.fetched), [f"BTC-{NEAR}-20000-C", f"BTC-{NEAR}-30000-C"])
+        self.assertEqual(list(prices), [name for name, _ in option_data])
+        bid, ask = prices[f"BTC-{NEAR}-25000-C"]
+        self.assertAlmostEqual(bid, 0.25 * FORWARD)
+        self.assertAlmostEqual(ask, 0.27 * FORWARD)
+
+    def test_interpolation_stage_is_timed(self):
+        metrics = set_metrics(InMemoryMetrics())
+        try:
+            with patch.object(MarketPricer, "_fetch_option_book", side_effect=self.fetch):
+                MarketPricer().compute_price([(f"BTC-{NEAR}-25000-C", 1.0)], verbose=False, update_cache=False)
+        finally:
+            set_metrics(None)
+
+        self.assertEqual(metrics.stage("interpolation")[0], 1)
+        self.assertEqual(metrics.stage("interpolation", method="linear")[0], 1)
+        self.assertEqual(metrics.stage("interpolation", method="cubic_spline")[0], 0)
+
+    def test_non_listed_expiry_interpolates_total_variance(self):
+        pricer = MarketPricer()
+        pricer.option_underlying = "BTC"
+        interpolator = OptionInterpolator(MarketPricer.instruments_cache["BTC"]["instruments"], pricer)
+        # Books quoted at 60% / 65% vol on both listed expiries
+        for expiry in (NEAR, FAR):
+            t = year_fraction(expiry)
+            self.books[f"BTC-{expiry}-20000-C"] = one_level_book(*(float(black76(FORWARD, 20000.0, t, vol)) / FORWARD for vol in (0.6, 0.65)))
+
+        with patch.object(MarketPricer, "_fetch_option_book", side_effect=self.fetch):
+            prices = interpolator.interpolate_batch([(f"BTC-{MIDDLE}-20000-C", 1.0), (f"BTC-{NEAR}-30000-P", 1.0)])
+
+        t = year_fraction(MIDDLE)
+        self.assertAlmostEqual(prices["bid"][0] / float(black76(FORWARD, 20000.0, t, 0.6)), 1.0, places=6)
+        self.assertAlmostEqual(prices["ask"][0] / float(black76(FORWARD, 20000.0, t, 0.65)), 1.0, places=6)
+        # One-sided put book: bid from the ask and the default spread
+        self.assertAlmostEqual(prices["bid"][1], 0.05 * 0.95 * FORWARD)
+
+    def test_target_beyond_listed_expiries_keeps_implied_vol(self):
+        pricer = MarketPricer()
+        pricer.option_underlying = "BTC"
+        interpolator = OptionInterpolator(MarketPricer.instruments_cache["BTC"]["instruments"], pricer)
+        later = (datetime.utcnow() + timedelta(days=200)).strftime("%d%b%y").upper()
+        t = year_fraction(FAR)
+        self.books[f"BTC-{FAR}-30000-C"] = one_level_book(float(black76(FORWARD, 30000.0, t, 0.5)) / FORWARD, None)
+
+        with patch.object(MarketPricer, "_fetch_option_book", side_effect=self.fetch):
+            prices = interpolator.interpolate_batch([(f"BTC-{later}-30000-C", 1.0)])
+
+        self.assertAlmostEqual(prices["bid"][0] / float(black76(FORWARD, 30000.0, year_fraction(later), 0.5)), 1.0, places=6)
+
+if __name__ == "__main__":
+    unittest.main()
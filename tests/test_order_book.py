@@ -0,0 +1,128 @@
+import unittest
+import numpy as np
+from pricer.market_pricing import MarketPricer
+from pricer.order_book import ArrayOrderBook, BookSide
+
+BOOK = {
+    "bids": [[0.1, 2], [0.095, 3], [0.09, 5]],
+    "asks": [[0.12, 1], [0.125, 4]],
+    "underlying_price": 30000,
+}
+
+class TestArrayOrderBook(unittest.TestCase):
+
+    def test_vwap_matches_weighted_price(self):
+        pricer = MarketPricer()
+        book = ArrayOrderBook.from_order_book(BOOK)
+        quantities = [0.5, 1, 2, 2.5, 5, 9.99, 10, 12, 40]
+
+        bid, ask = book.weighted_prices(quantities)
+
+        for i, quantity in enumerate(quantities):
+            self.assertAlmostEqual(bid[i], pricer._weighted_price(BOOK["bids"], quantity))
+            self.assertAlmostEqual(ask[i], pricer._weighted_price(BOOK["asks"], quantity))
+
+    def test_thin_book_extends_last_level(self):
+        side = BookSide([[0.1, 1]])
+        np.testing.assert_allclose(side.vwap([1, 4]), [0.1, 0.1])
+
+        side = BookSide([[0.1, 1], [0.2, 1]])
+        np.testing.assert_allclose(side.vwap([4]), [(0.1 + 0.2 * 3) / 4])
+        self.assertEqual(side.depth, 2)
+
+    def test_empty_side_and_invalid_quantities(self):
+        book = ArrayOrderBook.from_order_book({"bids": [], "asks": [[0.12, 1]]})
+        bid, ask = book.weighted_prices([1, 2])
+
+        self.assertTrue(np.isnan(bid).all())
+        np.testing.assert_allclose(ask, [0.12, 0.12])
+        with self.assertRaises(ValueError):
+            book.weighted_prices([1, 0])
+
+    def test_fill_curve_per_level(self):
+        curve = ArrayOrderBook.from_order_book(BOOK).fill_curve()
+        mid = 0.5 * (0.1 + 0.12)
+
+        np.testing.assert_allclose(curve['bid']['available'], [2, 5, 10])
+        np.testing.assert_allclose(curve['bid']['vwap'], [0.1, (0.2 + 0.285) / 5, (0.2 + 0.285 + 0.45) / 10])
+        np.testing.assert_allclose(curve['ask']['price'], [0.12, 0.125])
+        np.testing.assert_allclose(curve['ask']['slippage'], (curve['ask']['vwap'] - mid) / mid)
+        self.assertTrue((curve['bid']['slippage'] > 0).all())
+
+    def test_fill_flags_insufficient_depth(self):
+        fills = ArrayOrderBook.from_order_book(BOOK).fill([1, 5, 12])
+
+        np.testing.assert_allclose(fills['ask']['marginal_price'], [0.12, 0.125, 0.125])
+        np.testing.assert_allclose(fills['ask']['available'], [1, 5, 5])
+        np.testing.assert_array_equal(fills['ask']['insufficient'], [False, False, True])
+        np.testing.assert_array_equal(fills['bid']['insufficient'], [False, False, True])
+        np.testing.assert_allclose(fills['bid']['marginal_price'], [0.1, 0.095, 0.09])
+
+
+class TestComputePriceLadder(unittest.TestCase):
+
+    def tearDown(self):
+        MarketPricer.book_cache.clear()
+
+    def test_compute_price_ladder(self):
+        pricer = MarketPricer()
+        pricer._fetch_option_book = lambda input_string=None: BOOK
+
+        prices = pricer.compute_price_ladder("BTC-29DEC45-20000-C", [1, 5])
+        expected_bid = [0.1 * 30000, (0.1 * 2 + 0.095 * 3) / 5 * 30000]
+        expected_ask = [0.12 * 30000, (0.12 * 1 + 0.125 * 4) / 5 * 30000]
+        np.testing.assert_allclose(prices['bid'], expected_bid)
+        np.testing.assert_allclose(prices['ask'], expected_ask)
+
+    def test_compute_price_ladder_one_sided_book(self):
+        pricer = MarketPricer()
+        pricer._fetch_option_book = lambda input_string=None: {"bids": [], "asks": [[0.12, 1]], "underlying_price": 30000}
+
+        prices = pricer.compute_price_ladder("BTC-29DEC45-20000-C", [1, 2], bid_spread=0.1)
+        np.testing.assert_allclose(prices['bid'], [0.12 * 30000 * 0.9] * 2)
+        np.testing.assert_array_equal(prices['bid_insufficient'], [True, True])
+        np.testing.assert_array_equal(prices['ask_insufficient'], [False, True])
+
+    def test_ladder_reports_depth_and_reuses_the_cached_walk(self):
+        pricer = MarketPricer()
+        snapshot = MarketPricer.book_cache.put("BTC-29DEC45-20000-C", BOOK)
+        pricer._fetch_option_book = lambda input_string=None: snapshot.book
+
+        prices = pricer.compute_price_ladder("BTC-29DEC45-20000-C", [2, 20])
+        array_book = snapshot.array_book
+        pricer.compute_price_ladder("BTC-29DEC45-20000-C", [3])
+
+        self.assertIs(snapshot.array_book, array_book)
+        np.testing.assert_allclose(prices['bid_marginal'], [0.1 * 30000, 0.09 * 30000])
+        np.testing.assert_allclose(prices['bid_available'], [2, 10])
+        np.testing.assert_array_equal(prices['ask_insufficient'], [False, True])
+
+    def test_compute_fill_curve_in_usd(self):
+        pricer = MarketPricer()
+        pricer._fetch_option_book = lambda input_string=None: BOOK
+
+        curve = pricer.compute_fill_curve("BTC-29DEC45-20000-C")
+        self.assertAlmostEqual(curve['mid'], 0.11 * 30000)
+        np.testing.assert_allclose(curve['ask']['price'], [0.12 * 30000, 0.125 * 30000])
+        np.testing.assert_allclose(curve['ask']['available'], [1, 5])
+
+    def test_compute_fill_curve_does_not_expose_the_cached_book(self):
+        pricer = MarketPricer()
+        snapshot = MarketPricer.book_cache.put("BTC-29DEC45-20000-C", BOOK)
+        pricer._fetch_option_book = lambda input_string=None: snapshot.book
+        try:
+            curve = pricer.compute_fill_curve("BTC-29DEC45-20000-C")
+            curve['ask']['available'][:] = 0
+            curve['ask']['slippage'][:] = 0
+
+            cached = snapshot.array_book.fill_curve()
+            np.testing.assert_allclose(cached['ask']['available'], [1, 5])
+            self.assertTrue((cached['ask']['slippage'] > 0).all())
+            with self.assertRaises(ValueError):
+                cached['ask']['size'][0] = 0
+        finally:
+            MarketPricer.book_cache.clear()
+
+
+if __name__ == "__main__":
+    unittest.main()
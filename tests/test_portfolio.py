@@ -0,0 +1,117 @@
+import unittest
+import numpy as np
+from benchmarks.fixtures import FixtureTransport, synthetic_fixtures
+from pricer.market_pricing import MarketPricer
+from pricer.option_interpolation import OptionInterpolator
+from pricer.portfolio import Portfolio
+from pricer.utils import parse_contract
+
+class TestPortfolio(unittest.TestCase):
+
+    def setUp(self):
+        self.fixtures = synthetic_fixtures(spots={"BTC": 30000.0}, expiry_days=(30, 90), levels=3)
+        self.transport = FixtureTransport(self.fixtures)
+        self.pricer = MarketPricer(transport=self.transport)
+        names = sorted(self.transport.order_books)
+        self.listed = [name for name in names if name.endswith("-30000-C")]
+        underlying, expiry, strike, _ = parse_contract(self.listed[0])
+        self.interpolated = f"{underlying}-{expiry}-{int(strike) + 700}-C"
+        self.option_data = [(self.listed[0], 2.0), (self.listed[1], 1.0), (self.interpolated, 3.0)]
+
+    def tearDown(self):
+        MarketPricer.instruments_cache.clear()
+        MarketPricer.book_cache.clear()
+        MarketPricer.spot_cache.clear()
+        OptionInterpolator.smile_cache.clear()
+
+    def move_book(self, name, bid_shift, ask_shift):
+        # A fresh book, as a new REST response would be
+        book = dict(self.transport.order_books[name])
+        book["bids"] = [[price + bid_shift, size] for price, size in book["bids"]]
+        book["asks"] = [[price + ask_shift, size] for price, size in book["asks"]]
+        self.transport.order_books[name] = book
+
+    def expected_totals(self):
+        prices = self.pricer.compute_price(self.option_data, verbose=False)
+        quantities = np.array([quantity for _, quantity in self.option_data])
+        bid, ask = np.array([prices[name] for name, _ in self.option_data]).T
+        return quantities @ bid, quantities @ ask
+
+    def test_first_revaluation_prices_every_leg(self):
+        portfolio = Portfolio(self.pricer, self.option_data)
+        totals = portfolio.revalue()
+
+        bid, ask = self.expected_totals()
+        self.assertEqual(totals['repriced'], 3)
+        self.assertAlmostEqual(totals['bid'], bid)
+        self.assertAlmostEqual(totals['ask'], ask)
+        self.assertAlmostEqual(totals['pnl'], 0.0)
+
+    def test_only_legs_with_changed_inputs_are_repriced(self):
+        portfolio = Portfolio(self.pricer, self.option_data)
+        portfolio.revalue()
+        self.assertEqual(portfolio.revalue()['repriced'], 0)
+
+        # The second expiry's book moves: its own leg reprices, the interpolated leg on the first expiry does not
+        self.move_book(self.listed[1], 0.001, 0.001)
+        totals = portfolio.revalue()
+
+        bid, ask = self.expected_totals()
+        self.assertEqual(totals['repriced'], 1)
+        self.assertAlmostEqual(totals['bid'], bid)
+        self.assertAlmostEqual(totals['ask'], ask)
+        self.assertGreater(totals['pnl'], 0.0)
+
+    def test_interpolated_leg_follows_its_neighbours(self):
+        portfolio = Portfolio(self.pricer, self.option_data)
+        portfolio.revalue()
+
+        self.move_book(self.listed[0], 0.0, 0.002)
+        totals = portfolio.revalue(changed=[self.listed[0]])
+
+        self.assertEqual(totals['repriced'], 2)
+        self.assertAlmostEqual(totals['ask'], self.expected_totals()[1])
+
+    def test_underlying_ticks_alone_reprice_on_spot_moves_only(self):
+        portfolio = Portfolio(self.pricer, self.option_data)
+        portfolio.revalue()
+
+        # Same levels, new underlying price: the book counts as unchanged
+        book = dict(self.transport.order_books[self.listed[1]], underlying_price=30010.0)
+        self.transport.order_books[self.listed[1]] = book
+        self.assertEqual(portfolio.revalue()['repriced'], 0)
+
+        # A move of the spot reprices every leg of the underlying
+        self.fixtures["BTC"]["index_price"] = 30100.0
+        MarketPricer.spot_cache.clear()
+        totals = portfolio.revalue()
+        self.assertEqual(totals['repriced'], 3)
+        self.assertAlmostEqual(totals['bid'], self.expected_totals()[0])
+
+    def test_catalogue_refresh_relists_legs(self):
+        portfolio = Portfolio(self.pricer, self.option_data)
+        portfolio.revalue()
+
+        # The interpolated strike gets listed with its own book
+        book = dict(self.transport.order_books[self.listed[0]], instrument_name=self.interpolated)
+        book["bids"] = [[price * 0.9, size] for price, size in book["bids"]]
+        self.transport.order_books[self.interpolated] = book
+        self.transport.book_summaries["BTC"].append({"instrument_name": self.interpolated, "underlying_price": 30000.0})
+        MarketPricer.update_instruments_cache("BTC", force_update=True, transport=self.transport)
+
+        totals = portfolio.revalue()
+        self.assertTrue(portfolio._listed[2])
+        self.assertEqual(totals['repriced'], 3)
+        bid, ask = self.expected_totals()
+        self.assertAlmostEqual(totals['bid'], bid)
+        self.assertAlmostEqual(totals['ask'], ask)
+
+    def test_entry_prices_set_the_pnl(self):
+        portfolio = Portfolio(self.pricer, self.option_data[:1], entry_prices={self.listed[0]: 0.0})
+        totals = portfolio.revalue()
+
+        self.assertAlmostEqual(totals['pnl'], 2.0 * 0.5 * (portfolio.bid[0] + portfolio.ask[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
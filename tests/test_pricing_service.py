@@ -0,0 +1,111 @@
+import threading
+import time
+import unittest
+from functools import partial
+from benchmarks.fixtures import FixtureTransport, synthetic_fixtures
+from pricer.market_pricing import MarketPricer
+from pricer.pricing_service import PricingService, _picklable_error
+from pricer.shared_market import SharedBookTable
+
+class TestPricingService(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.fixtures = synthetic_fixtures(spots={"BTC": 30000.0}, expiry_days=(30, 90), levels=3)
+        names = sorted(cls.fixtures["BTC"]["order_books"])
+        cls.published = names[:4]
+        cls.unpublished = names[10]
+        # A generous max_book_age: a busy machine delaying a refresh must not count as a fallback
+        cls.service = PricingService(["BTC"], n_workers=2, instruments=cls.published, book_interval=0.2, max_book_age=60.0,
+                                     transport_factory=partial(FixtureTransport, cls.fixtures)).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.service.stop()
+        MarketPricer.instruments_cache.clear()
+        MarketPricer.book_cache.clear()
+
+    def test_workers_price_from_shared_market_data(self):
+        option_data = [(name, 1.5) for name in self.published]
+        expected = MarketPricer(transport=FixtureTransport(self.fixtures)).compute_price(option_data, verbose=False)
+
+        with self.service.client() as client:
+            before = client.stats()
+            for _ in range(4):
+                self.assertEqual(client.compute_price(option_data), dict(expected))
+            after = client.stats()
+
+        self.assertEqual(sum(worker["requests"] for worker in after) - sum(worker["requests"] for worker in before), 4)
+        self.assertEqual([worker["fallback_books"] for worker in after], [worker["fallback_books"] for worker in before])
+        # Round-robin over both workers
+        self.assertTrue(all(worker["requests"] > 0 for worker in after))
+
+    def test_unpublished_books_are_fetched_once_then_published(self):
+        with self.service.client() as client:
+            prices = client.compute_price([(self.unpublished, 1.0)])
+            self.assertEqual(len(prices[self.unpublished]), 2)
+
+        for _ in range(100):
+            if self.unpublished in self.service.books:
+                break
+            self.service._stop.wait(0.05)
+        self.assertIn(self.unpublished, self.service.books)
+
+    def test_errors_are_raised_on_the_client(self):
+        with self.service.client() as client:
+            with self.assertRaises(ValueError):
+                client.compute_price([(self.published[0], 1.0)], future_spot="forward")
+
+
+class TestPricingServiceWriters(unittest.TestCase):
+
+    def test_book_and_demand_refreshes_publish_one_at_a_time(self):
+        fixtures = synthetic_fixtures(spots={"BTC": 30000.0}, expiry_days=(30, 90), levels=3)
+        names = sorted(fixtures["BTC"]["order_books"])
+        service = PricingService(["BTC"], n_workers=1, instruments=names[:2],
+                                 transport_factory=partial(FixtureTransport, fixtures))
+        service.books = SharedBookTable(capacity=len(names), max_depth=10)
+        writers, overlaps, errors = [0], [], []
+        put = service.books.put
+
+        def counted_put(name, order_book):
+            writers[0] += 1
+            overlaps.append(writers[0])
+            # Widen the write so that overlapping writers show up
+            time.sleep(0.001)
+            put(name, order_book)
+            writers[0] -= 1
+
+        def run(function, *args):
+            try:
+                function(*args)
+            except Exception as error:
+                errors.append(error)
+
+        service.books.put = counted_put
+        try:
+            # The books loop re-publishes the instrument set while the demand loop keeps growing it
+            threads = [threading.Thread(target=run, args=(lambda: [service.refresh_books() for _ in range(20)],))]
+            threads += [threading.Thread(target=run, args=(service.publish, [name])) for name in names[2:]]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            service.books.close()
+            MarketPricer.book_cache.clear()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(max(overlaps), 1)
+        self.assertEqual(service.instruments, set(names))
+
+    def test_unpicklable_errors_are_sent_as_runtime_errors(self):
+        error = _picklable_error(ValueError(threading.Lock()))
+        self.assertIsInstance(error, RuntimeError)
+        self.assertIn("ValueError", str(error))
+        plain = ValueError("bad input")
+        self.assertIs(_picklable_error(plain), plain)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from datetime import datetime
+import numpy as np
+from pricer.black_scholes import BlackScholesPricer
+from pricer.scenarios import ScenarioPricer
+
+VALUATION_TIME = datetime(2045, 1, 1)
+OPTION_DATA = [("BTC-29DEC45-30000-C", 2.0), ("BTC-29DEC45-25000-P", -1.0), ("BTC-27JUN46-40000-C", 1.5), ("ETH-29DEC45-2000-C", 10.0)]
+SPOT = {"BTC": 30000.0, "ETH": 2000.0}
+VOLATILITY = {"BTC": 0.6, "ETH": 0.7}
+
+class TestScenarioPricer(unittest.TestCase):
+
+    def setUp(self):
+        self.spot_shocks = np.linspace(-0.2, 0.2, 5)
+        self.vol_shocks = np.array([-0.1, 0.0, 0.1])
+
+    def compute(self, **kwargs):
+        return ScenarioPricer(**kwargs).compute_price(OPTION_DATA, SPOT, VOLATILITY, self.spot_shocks, self.vol_shocks, valuation_time=VALUATION_TIME)
+
+    def test_cube_matches_repricing_each_scenario(self):
+        cube = self.compute()
+        pricer = BlackScholesPricer()
+        quantities = np.array([quantity for _, quantity in OPTION_DATA])
+
+        self.assertEqual(cube["pv"].shape, (4, 5, 3))
+        for i, spot_shock in enumerate(self.spot_shocks):
+            for j, vol_shock in enumerate(self.vol_shocks):
+                spot = {underlying: price * (1 + spot_shock) for underlying, price in SPOT.items()}
+                volatility = {underlying: vol + vol_shock for underlying, vol in VOLATILITY.items()}
+                expected = pricer.compute_price(OPTION_DATA, spot, volatility, valuation_time=VALUATION_TIME)
+                np.testing.assert_allclose(cube["pv"][:, i, j], quantities * expected["price"])
+                np.testing.assert_allclose(cube["delta"][:, i, j], quantities * expected["delta"])
+
+    def test_chunking_does_not_change_the_result(self):
+        cube = self.compute()
+        chunked = self.compute(chunk_size=1)
+
+        for measure in cube.values:
+            np.testing.assert_allclose(chunked[measure], cube[measure])
+
+    def test_pnl_is_zero_without_shocks(self):
+        cube = self.compute()
+
+        np.testing.assert_allclose(cube.pnl[:, 2, 1], 0.0, atol=1e-9)
+
+    def test_aggregation_by_underlying_and_expiry(self):
+        cube = self.compute()
+        grouped = cube.aggregate(("underlying", "expiry"))
+
+        self.assertEqual(grouped.keys, [("BTC", "29DEC45"), ("BTC", "27JUN46"), ("ETH", "29DEC45")])
+        np.testing.assert_allclose(grouped["pv"][0], cube["pv"][0] + cube["pv"][1])
+        np.testing.assert_allclose(grouped.total("vega"), cube.total("vega"))
+
+        streamed = ScenarioPricer(chunk_size=1).compute_price(OPTION_DATA, SPOT, VOLATILITY, self.spot_shocks, self.vol_shocks,
+                                                             valuation_time=VALUATION_TIME, by="underlying")
+        self.assertEqual(streamed.keys, ["BTC", "ETH"])
+        np.testing.assert_allclose(streamed["pv"][1], cube["pv"][3])
+        np.testing.assert_allclose(streamed.base_pv, [cube.base_pv[:3].sum(), cube.base_pv[3]])
+
+    def test_invalid_inputs(self):
+        with self.assertRaises(ValueError):
+            ScenarioPricer(chunk_size=0)
+        with self.assertRaises(ValueError):
+            ScenarioPricer().compute_price(OPTION_DATA, SPOT, VOLATILITY, spot_shocks=[-1.0])
+        with self.assertRaises(ValueError):
+            ScenarioPricer().compute_price(OPTION_DATA, SPOT, VOLATILITY, by="strike")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import pickle
+import unittest
+from datetime import datetime
+from pricer.book_summary import BookSummaryTable
+from pricer.instrument_index import InstrumentIndex
+from pricer.market_pricing import MarketPricer
+from pricer.shared_market import SharedBookTable, SharedCatalogue
+
+BOOK = {"instrument_name": "BTC-29DEC45-20000-C", "bids": [[0.05, 2.0], [0.04, 5.0]], "asks": [[0.06, 1.0]], "underlying_price": 30100.0}
+
+class TestSharedBookTable(unittest.TestCase):
+
+    def setUp(self):
+        self.table = SharedBookTable(capacity=8, max_depth=4)
+
+    def tearDown(self):
+        self.table.close()
+
+    def test_books_round_trip_through_a_reader(self):
+        self.table.put(BOOK["instrument_name"], BOOK)
+        reader = pickle.loads(pickle.dumps(self.table))
+        try:
+            book = reader.get_order_book(BOOK["instrument_name"])
+            self.assertEqual(book["bids"], BOOK["bids"])
+            self.assertEqual(book["asks"], BOOK["asks"])
+            self.assertEqual(book["underlying_price"], 30100.0)
+            self.assertIsNone(reader.get_order_book("BTC-29DEC45-25000-C"))
+
+            # Updates bump the version seen by readers
+            self.table.put(BOOK["instrument_name"], {**BOOK, "asks": [[0.07, 3.0]]})
+            updated = reader.get_order_book(BOOK["instrument_name"])
+            self.assertEqual(updated["asks"], [[0.07, 3.0]])
+            self.assertGreater(updated["change_id"], book["change_id"])
+        finally:
+            reader.close()
+
+    def test_deep_books_are_truncated_and_capacity_is_bounded(self):
+        self.table.put("BTC-29DEC45-20000-C", {"bids": [[0.1 - i * 0.001, 1.0] for i in range(10)], "asks": []})
+        self.assertEqual(len(self.table.get_order_book("BTC-29DEC45-20000-C")["bids"]), 4)
+
+        for strike in range(7):
+            self.table.put(f"BTC-29DEC45-{21000 + strike * 1000}-C", BOOK)
+        with self.assertRaises(MemoryError):
+            self.table.put("BTC-29DEC45-90000-C", BOOK)
+
+    def test_misses_and_stale_books_are_reported(self):
+        missed = []
+        self.table.on_miss = missed.append
+        self.table.max_age = -1.0
+        self.table.put(BOOK["instrument_name"], BOOK)
+
+        self.assertIsNone(self.table.get_order_book(BOOK["instrument_name"]))
+        self.assertIsNone(self.table.get_order_book("BTC-29DEC45-25000-C"))
+        self.assertEqual(missed, [BOOK["instrument_name"], "BTC-29DEC45-25000-C"])
+
+
+class TestSharedCatalogue(unittest.TestCase):
+
+    def tearDown(self):
+        MarketPricer.instruments_cache.clear()
+
+    def test_catalogue_is_installed_once_per_version(self):
+        summary = [{"instrument_name": "BTC-29DEC45-20000-C", "mark_price": 0.05}]
+        timestamp = datetime(2045, 1, 1, 12, 0)
+        catalogue = SharedCatalogue(size=1024 * 1024)
+        reader = pickle.loads(pickle.dumps(catalogue))
+        try:
+            catalogue.publish({"BTC": {"timestamp": timestamp, "instruments": InstrumentIndex(summary), "summary": BookSummaryTable(summary)}})
+
+            self.assertTrue(reader.install(MarketPricer))
+            self.assertFalse(reader.install(MarketPricer))
+            entry = MarketPricer.instruments_cache["BTC"]
+            self.assertEqual(entry["timestamp"], timestamp)
+            self.assertIn("BTC-29DEC45-20000-C", entry["instruments"])
+            self.assertEqual(entry["summary"].quote("BTC-29DEC45-20000-C")["mark_price"], 0.05)
+        finally:
+            reader.close()
+            catalogue.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
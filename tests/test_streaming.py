@@ -0,0 +1,163 @@
+import threading
+import time
+import unittest
+from datetime import datetime
+from pricer.market_pricing import MarketPricer
+from pricer.instrument_index import InstrumentIndex
+from pricer.streaming import MarketDataEngine, ReplayTransport
+
+INSTRUMENT = "BTC-29DEC45-20000-C"
+
+def book_message(data):
+    return {"jsonrpc": "2.0", "method": "subscription", "params": {"channel": f"book.{INSTRUMENT}.100ms", "data": data}}
+
+def ticker_message(underlying_price):
+    return {"jsonrpc": "2.0", "method": "subscription", "params": {"channel": f"ticker.{INSTRUMENT}.100ms", "data": {"underlying_price": underlying_price}}}
+
+SNAPSHOT = book_message({"type": "snapshot", "change_id": 10, "timestamp": 1, "bids": [["new", 0.1, 5], ["new", 0.095, 10]], "asks": [["new", 0.12, 4]]})
+CHANGE = book_message({"type": "change", "change_id": 11, "prev_change_id": 10, "timestamp": 2, "bids": [["delete", 0.1, 0], ["new", 0.105, 2]], "asks": [["change", 0.12, 7]]})
+
+class TestMarketDataEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = ReplayTransport()
+        self.engine = MarketDataEngine(self.transport)
+        self.engine.subscribe([INSTRUMENT])
+
+    def test_subscribe_sends_book_and_ticker_channels(self):
+        channels = self.transport.sent[0]["params"]["channels"]
+        self.assertEqual(channels, [f"book.{INSTRUMENT}.100ms", f"ticker.{INSTRUMENT}.100ms"])
+        self.assertIsNone(self.engine.get_order_book(INSTRUMENT))
+
+    def test_snapshot_and_deltas(self):
+        for message in [SNAPSHOT, ticker_message(30000), CHANGE]:
+            self.engine.process_message(message)
+
+        book = self.engine.get_order_book(INSTRUMENT)
+        self.assertEqual(book["bids"], [[0.105, 2], [0.095, 10]])
+        self.assertEqual(book["asks"], [[0.12, 7]])
+        self.assertEqual(book["underlying_price"], 30000)
+        self.assertEqual(book["change_id"], 11)
+
+    def test_sequence_gap_triggers_resync(self):
+        self.engine.process_message(SNAPSHOT)
+        gap = book_message({"type": "change", "change_id": 13, "prev_change_id": 12, "bids": [], "asks": []})
+        self.engine.process_message(gap)
+
+        self.assertIsNone(self.engine.get_order_book(INSTRUMENT))
+        self.assertEqual(self.engine.resyncs, 1)
+        self.assertEqual([message["method"] for message in self.transport.sent[1:]], ["public/unsubscribe", "public/subscribe"])
+
+        # Deltas before the new snapshot are dropped, the snapshot restores the book
+        self.engine.process_message(CHANGE)
+        self.engine.process_message(SNAPSHOT)
+        self.assertEqual(self.engine.get_order_book(INSTRUMENT)["bids"][0], [0.1, 5])
+        self.assertEqual(self.engine.resyncs, 1)
+
+    def wait_for(self, condition, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            self.assertLess(time.monotonic(), deadline, "Condition not met in time")
+            time.sleep(0.01)
+
+    def test_run_replays_feed_on_background_thread(self):
+        self.engine.start()
+        for message in [SNAPSHOT, CHANGE]:
+            self.transport.feed(message)
+        self.wait_for(lambda: self.engine.messages == 2)
+        self.assertEqual(self.engine.get_order_book(INSTRUMENT)["change_id"], 11)
+
+        # Books stop being served once nothing keeps them current
+        self.engine.stop()
+        self.assertIsNone(self.engine.get_order_book(INSTRUMENT))
+
+    def test_start_requests_heartbeats_and_answers_test_requests(self):
+        self.engine.start()
+        self.transport.feed({"jsonrpc": "2.0", "method": "heartbeat", "params": {"type": "test_request"}})
+        self.wait_for(lambda: self.transport.sent[-1]["method"] == "public/test")
+        self.engine.stop()
+
+        heartbeat = next(message for message in self.transport.sent if message["method"] == "public/set_heartbeat")
+        self.assertEqual(heartbeat["params"], {"interval": 10})
+
+    def test_dropped_feed_reconnects_and_resubscribes(self):
+        engine = MarketDataEngine(self.transport, reconnect_delay=0.01)
+        engine.start([INSTRUMENT])
+        self.transport.feed(SNAPSHOT)
+        self.wait_for(lambda: engine.get_order_book(INSTRUMENT) is not None)
+
+        sent = len(self.transport.sent)
+        self.transport.close()
+        self.wait_for(lambda: engine.reconnects == 1)
+        self.assertIsNone(engine.get_order_book(INSTRUMENT))
+        channels = [channel for message in self.transport.sent[sent:] if message["method"] == "public/subscribe"
+                    for channel in message["params"]["channels"]]
+        self.assertIn(f"book.{INSTRUMENT}.100ms", channels)
+
+        # The snapshot sent for the new subscription restores the book
+        self.transport.feed(SNAPSHOT)
+        self.wait_for(lambda: engine.get_order_book(INSTRUMENT) is not None)
+        engine.stop()
+
+    def test_read_timeouts_keep_reading_until_the_feed_goes_silent(self):
+        transport = ReplayTransport(timeout=0.01)
+        engine = MarketDataEngine(transport, max_age=0.2, reconnect_delay=0.01)
+        engine.start([INSTRUMENT])
+        transport.feed(SNAPSHOT)
+        self.wait_for(lambda: engine.messages == 1)
+        self.assertEqual(engine.reconnects, 0)
+        self.assertIsNotNone(engine.get_order_book(INSTRUMENT))
+
+        # Nothing for longer than max_age: books are stale and the feed is reopened
+        self.wait_for(lambda: engine.reconnects >= 1)
+        self.assertIsNone(engine.get_order_book(INSTRUMENT))
+        engine.stop()
+
+    def test_sends_never_overlap(self):
+        transport = ReplayTransport()
+        active, overlaps = [0], []
+        send = transport.send
+
+        def slow_send(message):
+            active[0] += 1
+            overlaps.append(active[0])
+            time.sleep(0.001)
+            send(message)
+            active[0] -= 1
+
+        transport.send = slow_send
+        engine = MarketDataEngine(transport)
+        threads = [threading.Thread(target=engine.subscribe, args=([f"BTC-29DEC45-{strike}-C"],)) for strike in range(10000, 30000, 1000)]
+        threads += [threading.Thread(target=engine.resync, args=(INSTRUMENT,)) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(transport.sent), 20 + 2 * 10)
+        self.assertEqual(max(overlaps), 1)
+
+    def test_stale_books_are_not_served(self):
+        engine = MarketDataEngine(self.transport, max_age=0.05)
+        engine.subscribe([INSTRUMENT])
+        engine.process_message(SNAPSHOT)
+        self.assertIsNotNone(engine.get_order_book(INSTRUMENT))
+        time.sleep(0.1)
+        self.assertIsNone(engine.get_order_book(INSTRUMENT))
+
+    def test_market_pricer_prices_from_engine(self):
+        for message in [SNAPSHOT, ticker_message(30000)]:
+            self.engine.process_message(message)
+        pricer = MarketPricer(market_data=self.engine)
+        MarketPricer.instruments_cache["BTC"] = {"timestamp": datetime.now(), "instruments": InstrumentIndex([INSTRUMENT])}
+        try:
+            result = pricer.compute_price([(INSTRUMENT, 1)], update_cache=False, verbose=False)
+        finally:
+            MarketPricer.instruments_cache.clear()
+
+        self.assertAlmostEqual(result[INSTRUMENT][0], 0.1 * 30000)
+        self.assertAlmostEqual(result[INSTRUMENT][1], 0.12 * 30000)
+
+
+if __name__ == "__main__":
+    unittest.main()
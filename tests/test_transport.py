@@ -0,0 +1,61 @@
+import unittest
+from unittest.mock import patch, Mock
+import requests
+from pricer.transport import HttpTransport, get_default_transport
+from pricer.utils import fetch_spot_price
+
+class TestHttpTransport(unittest.TestCase):
+
+    def test_session_per_host_is_reused(self):
+        transport = HttpTransport(pool_size=4)
+        first = transport.session_for("https://www.deribit.com/api/v2/public/get_index")
+        second = transport.session_for("https://www.deribit.com/api/v2/public/get_order_book")
+        other = transport.session_for("https://api.coingecko.com/api/v3/simple/price")
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertIn("gzip", first.headers["Accept-Encoding"])
+        transport.close()
+
+    def test_get_retries_on_throttling_and_server_errors(self):
+        transport = HttpTransport(max_retries=3, timeout=2.5)
+        responses = [Mock(status_code=429, headers={"Retry-After": "0.5"}), Mock(status_code=503, headers={}), Mock(status_code=200, headers={})]
+
+        with patch.object(requests.Session, "get", side_effect=responses) as mock_get, patch("pricer.transport.time.sleep") as mock_sleep:
+            response = transport.get("https://www.deribit.com/api/v2/public/get_index")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(mock_get.call_args.kwargs["timeout"], 2.5)
+        self.assertEqual(mock_sleep.call_args_list[0][0][0], 0.5)
+
+    def test_get_returns_last_response_when_retries_exhausted(self):
+        transport = HttpTransport(max_retries=1)
+
+        with patch.object(requests.Session, "get", return_value=Mock(status_code=502, headers={})) as mock_get, patch("pricer.transport.time.sleep"):
+            response = transport.get("https://www.deribit.com/api/v2/public/get_index")
+
+        self.assertEqual(response.status_code, 502)
+        self.assertEqual(mock_get.call_count, 2)
+
+    def test_get_reraises_connection_errors(self):
+        transport = HttpTransport(max_retries=2)
+
+        with patch.object(requests.Session, "get", side_effect=requests.exceptions.ConnectionError) as mock_get, patch("pricer.transport.time.sleep"):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                transport.get("https://www.deribit.com/api/v2/public/get_index")
+        self.assertEqual(mock_get.call_count, 3)
+
+    def test_default_transport_is_shared(self):
+        self.assertIs(get_default_transport(), get_default_transport())
+
+    def test_fetch_spot_price_uses_injected_transport(self):
+        stub = Mock()
+        stub.get.return_value = Mock(status_code=200, json=lambda: {"bitcoin": {"usd": 27000.0}})
+
+        self.assertEqual(fetch_spot_price("BTC", transport=stub), 27000.0)
+        self.assertIn("coingecko", stub.get.call_args[0][0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+from unittest.mock import patch
+from datetime import datetime
+import numpy as np
+from pricer.utils import HostRateLimiter, year_fraction, year_fractions
+
+class TestHostRateLimiter(unittest.TestCase):
+
+    def test_acquire_spaces_requests_per_host(self):
+        limiter = HostRateLimiter(requests_per_second=10)
+
+        with patch("pricer.utils.time.sleep") as mock_sleep, patch("pricer.utils.time.monotonic", return_value=100.0):
+            limiter.acquire("https://www.deribit.com/api/v2/public/get_order_book")
+            limiter.acquire("https://www.deribit.com/api/v2/public/get_index")
+            limiter.acquire("https://api.coingecko.com/api/v3/simple/price")
+
+        # Only the second Deribit request has to wait; CoinGecko has its own budget
+        mock_sleep.assert_called_once()
+        self.assertAlmostEqual(mock_sleep.call_args[0][0], 0.1)
+
+    def test_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            HostRateLimiter(0)
+
+    def test_year_fractions_match_year_fraction(self):
+        valuation_time = datetime(2023, 6, 1, 8)
+        expiries = ["30JUN23", "29SEP23", "30JUN23", "1JUN23"]
+
+        expected = [year_fraction(expiry, valuation_time) for expiry in expiries]
+        np.testing.assert_allclose(year_fractions(expiries, valuation_time), expected)
+        self.assertAlmostEqual(year_fraction("30JUN23", valuation_time), 29 / 365)
+        self.assertEqual(year_fraction("1JUN23", valuation_time), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+from datetime import datetime
+import numpy as np
+from pricer.book_summary import BookSummaryTable
+from pricer.implied_volatility import black76
+from pricer.utils import year_fraction
+from pricer.volatility_smile import VarianceSmile, fit_variance_smiles
+
+VALUATION_TIME = datetime(2023, 6, 1, 8)
+FORWARD = 30000.0
+
+def skew_summary():
+    t = year_fraction("29SEP23", VALUATION_TIME)
+    entries = []
+    for strike in range(20000, 40001, 5000):
+        vol = 0.6 - 0.2 * np.log(strike / FORWARD)
+        for kind in "CP":
+            entries.append({
+                "instrument_name": f"BTC-29SEP23-{strike}-{kind}", "underlying_price": FORWARD,
+                "mark_price": float(black76(FORWARD, strike, t, vol, kind == "C")) / FORWARD,
+            })
+    entries.append({"instrument_name": "BTC-26MAY23-30000-C", "underlying_price": FORWARD, "mark_price": 0.01})
+    return BookSummaryTable(entries)
+
+class TestVarianceSmile(unittest.TestCase):
+
+    def test_fit_skips_expired_slices_and_reprices_quotes(self):
+        smiles = fit_variance_smiles(skew_summary(), VALUATION_TIME)
+
+        self.assertEqual(list(smiles), ["29SEP23"])
+        smile = smiles["29SEP23"]
+        self.assertIsNone(smile.splines["bid"])
+        strikes = np.arange(20000.0, 40001.0, 5000.0)
+        expected = black76(FORWARD, strikes, smile.time_to_expiry, 0.6 - 0.2 * np.log(strikes / FORWARD)) / FORWARD
+        np.testing.assert_allclose(smile.price("mark", strikes, True), expected, rtol=1e-8)
+        self.assertTrue(np.isnan(smile.price("bid", strikes, True)).all())
+
+    def test_total_variance_is_flat_outside_quoted_strikes(self):
+        smile = VarianceSmile("29SEP23", 0.5, FORWARD, np.log([0.8, 1.0, 1.2]), {"mark": np.array([0.2, 0.18, 0.19])})
+
+        np.testing.assert_allclose(smile.total_variance("mark", [FORWARD * 0.5, FORWARD * 2]), [0.2, 0.19])
+
+
+if __name__ == "__main__":
+    unittest.main()